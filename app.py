@@ -1,21 +1,39 @@
+import json
 import os
+import time
 import uuid
 from threading import Thread
-from flask import Flask, request, jsonify, render_template
+from flask import Flask, Response, g, request, jsonify, render_template, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
-from werkzeug.utils import secure_filename
 
 # --- Import des extracteurs ---
-from cv_extractor import extract_cv_data
-from github_extractor.api_client import get_profile_from_github_url
+from cv_extractor import extract_cv_data, extract_cv_data_stream, warm_up_models, models_ready
+from cv_extractor.registry import registry as model_registry
+from cv_extractor.config import UPLOAD_MAX_BYTES, UPLOAD_PERSIST
+from cv_extractor.parsers.factory import sniff_format
+from cv_extractor.uploads import UploadTooLargeError, discard_upload, persist_upload, read_upload, stage_upload
+from github_extractor.api_client import get_profile_from_github_url, get_profile_stream_from_github_url
 from linkedin_extractor.scraper import collect_profile_from_linkedin_url
 from get_github_user import collect_profile_from_github_url as simple_github
 from get_linkedin_user import collect_linkedin_profile as simple_linkedin
 
 # --- Services internes ---
 from unification_service.unifier import ProfileUnifier
+from unification_service.collector import collect_sources
+from unification_service.config import PROCESS_DEADLINE_SECONDS, SEARCH_DEFAULT_LIMIT, SEARCH_MAX_LIMIT
+from unification_service.embeddings import embedder_stats
+from unification_service.search import get_search_index, loaded_search_index
 from enhancement_service.enhancer import ProfileEnhancer
+from enhancement_service.cache import get_enhancement_cache
+from job_service.queue import JobQueue, QueueFullError
+
+# --- Observabilité ---
+from cv_extractor.cache import get_cache
+from cv_extractor.extractors.prompt_builder import prompt_stats
+from github_extractor.http_client import shared_cache_stats
+from observability import metrics
+from observability.tracing import current_trace, end_trace, start_trace
 
 # ======================================================================
 # --- CONFIGURATION DE L’APPLICATION ---
@@ -28,19 +46,111 @@ app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite:///users.db"
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db = SQLAlchemy(app)
 
-# Uploads
-UPLOAD_FOLDER = "uploads"
-ALLOWED_EXTENSIONS = {"pdf", "docx"}
-app.config["UPLOAD_FOLDER"] = UPLOAD_FOLDER
-os.makedirs(UPLOAD_FOLDER, exist_ok=True)
-
-# Jobs en mémoire
-JOBS = {}
+# Uploads : les CV sont lus en mémoire, sans passer par le disque. Werkzeug
+# coupe la lecture des requêtes trop grosses (marge pour les autres champs).
+app.config["MAX_CONTENT_LENGTH"] = UPLOAD_MAX_BYTES + 64 * 1024
 
 # Services
 unifier = ProfileUnifier()
 enhancer = ProfileEnhancer()
 
+# Modèles NLP/LLM partagés : chargés une seule fois par processus.
+# Le préchargement tourne en arrière-plan pour ne pas bloquer le démarrage ;
+# /ready indique quand les modèles sont disponibles.
+if os.getenv("WARM_UP_MODELS", "1") == "1":
+    Thread(target=warm_up_models, name="model-warm-up", daemon=True).start()
+
+# Jobs asynchrones : pool de workers borné, état persisté dans SQLite
+# (partagé entre tous les processus de l'application).
+# Le fichier déposé par /extract n'est supprimé qu'une fois le job terminé
+# pour de bon : un job relancé après un crash le retrouve.
+job_queue = JobQueue(handlers={
+    "cv": extract_cv_data,
+    "linkedin": collect_profile_from_linkedin_url,
+    "github": get_profile_from_github_url,
+}, cleanup={"cv": lambda source: discard_upload(source)})
+job_queue.start()
+
+# Métriques lues au moment du scrape de /metrics.
+def _queue_depth():
+    return [({"status": status}, count) for status, count in job_queue.depth().items()]
+
+# Les stats des caches font une requête SQLite : une seule par scrape.
+@metrics.per_scrape
+def _extraction_cache_stats():
+    cache = get_cache()
+    return None if cache is None else cache.stats()
+
+@metrics.per_scrape
+def _enhancement_cache_stats():
+    cache = get_enhancement_cache()
+    return None if cache is None else cache.stats()
+
+def _extraction_cache(key):
+    stats = _extraction_cache_stats()
+    if stats is None:
+        return []
+    return [({"tier": tier}, tier_stats[key]) for tier, tier_stats in stats["tiers"].items()]
+
+def _github_cache(keys):
+    stats = shared_cache_stats()
+    if stats is None:
+        return []
+    return [({"outcome": key}, stats[key]) for key in keys]
+
+def _enhancement_cache(key):
+    stats = _enhancement_cache_stats()
+    if stats is None:
+        return []
+    return [({"kind": kind}, kind_stats[key]) for kind, kind_stats in stats["lookups"].items()]
+
+def _enhancement_cache_size():
+    stats = _enhancement_cache_stats()
+    return [] if stats is None else [({}, stats["size_bytes"])]
+
+def _embedding_cache(key):
+    stats = embedder_stats()
+    return [] if stats is None else [({}, stats[key])]
+
+def _search_index():
+    index = loaded_search_index()
+    return [] if index is None else [({"kind": kind}, count) for kind, count in index.stats().items()]
+
+def _prompt_tokens(key):
+    return [({"prompt": name}, entry[key]) for name, entry in prompt_stats.snapshot().items()]
+
+metrics.gauge("job_queue_depth", "Jobs waiting or running in the queue.", ("status",), callback=_queue_depth)
+metrics.counter("extraction_cache_hits_total", "CV extraction cache hits per tier.", ("tier",),
+                callback=lambda: _extraction_cache("hits"))
+metrics.counter("extraction_cache_misses_total", "CV extraction cache misses per tier.", ("tier",),
+                callback=lambda: _extraction_cache("misses"))
+metrics.gauge("extraction_cache_hit_ratio", "CV extraction cache hit rate per tier.", ("tier",),
+              callback=lambda: _extraction_cache("hit_rate"))
+metrics.counter("github_http_cache_requests_total", "GitHub requests by HTTP cache outcome.", ("outcome",),
+                callback=lambda: _github_cache(("fresh", "not_modified", "ok", "uncacheable")))
+metrics.gauge("github_http_cache_ratio", "Share of GitHub requests served without using quota.", ("outcome",),
+              callback=lambda: _github_cache(("revalidation_304_ratio", "quota_saved_ratio")))
+metrics.counter("enhancement_cache_hits_total",
+                "Enhancements served from the cache (no LLM call), per lookup kind (profile or field).",
+                ("kind",), callback=lambda: _enhancement_cache("hits"))
+metrics.counter("enhancement_cache_misses_total", "Enhancement cache misses per lookup kind (profile or field).",
+                ("kind",), callback=lambda: _enhancement_cache("misses"))
+metrics.gauge("enhancement_cache_hit_ratio", "Enhancement cache hit rate per lookup kind (profile or field).",
+              ("kind",), callback=lambda: _enhancement_cache("hit_rate"))
+metrics.gauge("enhancement_cache_bytes", "Size of the stored enhancements.", callback=_enhancement_cache_size)
+metrics.counter("embedding_cache_hits_total", "Texts whose embedding was read from the cache.",
+                callback=lambda: _embedding_cache("hits"))
+metrics.counter("embedding_cache_misses_total", "Texts encoded by the embedding model.",
+                callback=lambda: _embedding_cache("misses"))
+metrics.gauge("search_index_entries", "Profiles, vectors, skills and locations in the search index.",
+              ("kind",), callback=_search_index)
+metrics.counter("llm_prompt_tokens_total", "Tokens sent per prompt.", ("prompt",),
+                callback=lambda: _prompt_tokens("prompt_tokens"))
+metrics.counter("llm_prompt_tokens_saved_total", "Tokens saved by prompt compaction (PROMPT_SAVINGS_STATS=1).",
+                ("prompt",), callback=lambda: _prompt_tokens("tokens_saved"))
+metrics.counter("llm_prompt_split_inputs_total", "Inputs over the prompt budget, sent in several chunks.",
+                ("prompt",), callback=lambda: _prompt_tokens("split_inputs"))
+
 # ======================================================================
 # --- MODÈLE DE BASE DE DONNÉES ---
 # ======================================================================
@@ -57,21 +167,66 @@ with app.app_context():
 # ======================================================================
 # --- UTILITAIRES ---
 # ======================================================================
-def allowed_file(filename):
-    return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
+def read_cv_upload(file):
+    """
+    Lit le CV envoyé directement depuis la requête (en mémoire, ou dans le
+    fichier temporaire de Werkzeug), avec une taille bornée. Le format est
+    détecté sur le contenu. Lève ValueError (UploadTooLargeError si trop gros).
+    """
+    if not file or not file.filename:
+        raise ValueError("Invalid or missing file")
+    data = read_upload(file.stream)
+    if sniff_format(data) is None:
+        raise ValueError("Unsupported file type: expected a PDF or DOCX document")
+    if UPLOAD_PERSIST:
+        persist_upload(data)
+    return data
+
+def upload_error(e):
+    """Réponse d'erreur pour un upload refusé."""
+    return jsonify({"error": str(e)}), 413 if isinstance(e, UploadTooLargeError) else 400
+
+def sse(event, data):
+    """Formate un message Server-Sent Events."""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
 
 
-def run_extraction_task(job_id, extractor_func, **kwargs):
-    """Exécute une tâche d’extraction en arrière-plan"""
-    print(f"[INFO] Démarrage du job {job_id}")
-    try:
-        result_pydantic = extractor_func(**kwargs)
-        result_dict = result_pydantic.model_dump()
-        JOBS[job_id] = {"status": "completed", "result": result_dict}
-        print(f"[INFO] Job {job_id} terminé avec succès")
-    except Exception as e:
-        print(f"[ERREUR] Job {job_id}: {e}")
-        JOBS[job_id] = {"status": "error", "message": str(e)}
+# ======================================================================
+# --- MÉTRIQUES ET TRACES ---
+# ======================================================================
+@app.before_request
+def start_request_timing():
+    g.request_started = time.perf_counter()
+    # Détail des temps par étape dans la réponse JSON : ?timings=1 (ou champ de formulaire).
+    if request.values.get("timings") == "1":
+        g.trace_token = start_trace()
+
+@app.after_request
+def record_request_timing(response):
+    endpoint = request.url_rule.rule if request.url_rule else "unmatched"
+    metrics.HTTP_SERVER_SECONDS.observe(time.perf_counter() - g.request_started, endpoint=endpoint,
+                                        method=request.method, status=response.status_code)
+    trace = current_trace()
+    if trace is not None and response.is_json:
+        payload = response.get_json()
+        if isinstance(payload, dict):
+            payload["timings"] = trace.breakdown()
+            response.set_data(app.json.dumps(payload))
+    return response
+
+@app.teardown_request
+def end_request_timing(exc=None):
+    token = g.pop("trace_token", None)
+    if token is not None:
+        end_trace(token)
+
+@app.route("/metrics", methods=["GET"])
+def metrics_endpoint():
+    return Response(metrics.registry.render(), mimetype="text/plain; version=0.0.4")
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({"error": str(UploadTooLargeError(UPLOAD_MAX_BYTES))}), 413
 
 # ======================================================================
 # --- ROUTES FRONTEND ---
@@ -85,6 +240,20 @@ def index():
 def profiles():
     return render_template("profiles.html")
 
+# ======================================================================
+# --- ROUTES DE SANTÉ ---
+# ======================================================================
+@app.route("/health", methods=["GET"])
+def health():
+    return jsonify({"status": "ok"})
+
+@app.route("/ready", methods=["GET"])
+def ready():
+    status = model_registry.status()
+    if models_ready():
+        return jsonify({"status": "ready", "models": status})
+    return jsonify({"status": "loading", "models": status}), 503
+
 # ======================================================================
 # --- ROUTES UTILISATEUR ---
 # ======================================================================
@@ -169,16 +338,13 @@ def cv_endpoint():
     if "file" not in request.files:
         return jsonify({"error": "No file part in request"}), 400
 
-    file = request.files["file"]
-    if file.filename == "" or not allowed_file(file.filename):
-        return jsonify({"error": "Invalid or missing file"}), 400
-
-    filename = secure_filename(file.filename)
-    filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-    file.save(filepath)
+    try:
+        data = read_cv_upload(request.files["file"])
+    except ValueError as e:
+        return upload_error(e)
 
     try:
-        result_pydantic = extract_cv_data(file_path=filepath)
+        result_pydantic = extract_cv_data(data)
         result_dict = result_pydantic.model_dump()
         return jsonify(result_dict)
     except Exception as e:
@@ -193,51 +359,75 @@ def start_extraction():
     if not source_type:
         return jsonify({"error": "Missing 'source_type'"}), 400
 
-    job_id = str(uuid.uuid4())
-    extractor_func = None
     kwargs = {}
 
     if source_type == "cv":
         if "file" not in request.files:
             return jsonify({"error": "No file provided"}), 400
-        file = request.files["file"]
-        if file.filename == "" or not allowed_file(file.filename):
-            return jsonify({"error": "Invalid or missing file"}), 400
-        filename = secure_filename(file.filename)
-        filepath = os.path.join(app.config["UPLOAD_FOLDER"], filename)
-        file.save(filepath)
-        extractor_func = extract_cv_data
-        kwargs = {"file_path": filepath}
-
-    elif source_type == "linkedin":
-        url = request.form.get("url")
-        if not url:
-            return jsonify({"error": "Missing 'url'"}), 400
-        extractor_func = collect_profile_from_linkedin_url
-        kwargs = {"url": url}
-
-    elif source_type == "github":
+        try:
+            data = read_cv_upload(request.files["file"])
+        except ValueError as e:
+            return upload_error(e)
+        # Le job peut tourner dans un autre processus : le fichier est déposé
+        # sur disque (un fichier par job), puis supprimé à la fin du job.
+        kwargs = {"source": stage_upload(data)}
+
+    elif source_type in ("linkedin", "github"):
         url = request.form.get("url")
         if not url:
             return jsonify({"error": "Missing 'url'"}), 400
-        extractor_func = get_profile_from_github_url
         kwargs = {"url": url}
     else:
         return jsonify({"error": f"Invalid source_type: '{source_type}'"}), 400
 
-    JOBS[job_id] = {"status": "pending"}
-    thread = Thread(target=run_extraction_task, args=(job_id, extractor_func), kwargs=kwargs)
-    thread.start()
+    try:
+        job_id = job_queue.submit(source_type, **kwargs)
+    except QueueFullError as e:
+        if source_type == "cv":
+            discard_upload(kwargs["source"])
+        response = jsonify({"error": str(e), "retry_after": e.retry_after})
+        response.headers["Retry-After"] = str(e.retry_after)
+        return response, 429
 
     return jsonify({"message": f"{source_type.capitalize()} processing started.", "job_id": job_id}), 202
 
 @app.route("/status/<string:job_id>", methods=["GET"])
 def get_job_status(job_id):
-    job = JOBS.get(job_id)
+    job = job_queue.get_status(job_id)
     if not job:
         return jsonify({"error": "Job ID not found"}), 404
     return jsonify(job)
 
+# ======================================================================
+# --- ROUTE DE RECHERCHE ---
+# ======================================================================
+@app.route("/search", methods=["GET"])
+def search_profiles():
+    """
+    Recherche de candidats parmi les profils unifiés.
+    Paramètres (répétables ou séparés par des virgules) :
+      skills      toutes requises
+      any_skills  au moins une
+      location    tous les mots (ex. "Casablanca")
+      q           texte libre : classement sémantique (résumé, expériences)
+      limit       nombre de résultats
+    """
+    def values(name):
+        return [v.strip() for item in request.args.getlist(name) for v in item.split(",") if v.strip()]
+
+    skills, any_skills = values("skills"), values("any_skills")
+    location = request.args.get("location", "").strip() or None
+    query = request.args.get("q", "").strip() or None
+    if not (skills or any_skills or location or query):
+        return jsonify({"error": "Provide at least one of 'skills', 'any_skills', 'location' or 'q'"}), 400
+    try:
+        limit = max(1, min(int(request.args.get("limit", SEARCH_DEFAULT_LIMIT)), SEARCH_MAX_LIMIT))
+    except ValueError:
+        return jsonify({"error": "'limit' must be an integer"}), 400
+
+    hits, total = get_search_index().search(skills, any_skills, location, query, limit)
+    return jsonify({"total": total, "results": [hit._asdict() for hit in hits]})
+
 # ======================================================================
 # --- ROUTE PIPELINE COMPLET (Extract → Unify → Enhance) ---
 # ======================================================================
@@ -246,21 +436,21 @@ def process_profile_source():
     source_type = request.form.get('source_type')
     if not source_type:
         return jsonify({"error": "Missing 'source_type'"}), 400
+    if source_type == 'multi':
+        return process_multi_source()
 
     new_data = None
+    github_repos = None
 
     try:
         if source_type == 'cv':
             if 'file' not in request.files:
                 return jsonify({"error": "No file part for 'cv'"}), 400
-            file = request.files['file']
-            if file.filename and allowed_file(file.filename):
-                filename = secure_filename(file.filename)
-                filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-                file.save(filepath)
-                new_data = extract_cv_data(filepath)
-            else:
-                return jsonify({"error": "Invalid or missing file for 'cv'"}), 400
+            try:
+                data = read_cv_upload(request.files['file'])
+            except ValueError as e:
+                return upload_error(e)
+            new_data = extract_cv_data(data)
 
         elif source_type == 'linkedin':
             url = request.form.get('url')
@@ -270,7 +460,8 @@ def process_profile_source():
         elif source_type == 'github':
             url = request.form.get('url')
             if not url: return jsonify({"error": "Missing 'url' for 'github'"}), 400
-            new_data = get_profile_from_github_url(url)
+            # Repositories are streamed page by page into the unifier.
+            new_data, github_repos = get_profile_stream_from_github_url(url)
 
         else:
             return jsonify({"error": f"Invalid source_type: '{source_type}'"}), 400
@@ -278,16 +469,161 @@ def process_profile_source():
     except Exception as e:
         return jsonify({"error": f"Extraction failed: {str(e)}"}), 500
 
-    # Unify & Enhance
-    profile_id = str(uuid.uuid4())
-    unified_profile = unifier.unify(profile_id, new_data)
-    enhanced_profile = enhancer.enhance(unified_profile)
+    # Unify (fusion incrémentale dans le profil existant) & Enhance
+    profile_id = request.form.get('profile_id') or str(uuid.uuid4())
+    try:
+        merged = unifier.merge(profile_id, new_data, github_repos=github_repos)
+    except Exception as e:
+        # Les dépôts GitHub sont paginés pendant la fusion : une page en
+        # erreur remonte ici, et rien n'est enregistré.
+        stage = "Extraction" if github_repos is not None else "Unification"
+        return jsonify({"error": f"{stage} failed: {str(e)}"}), 500
+    enhanced_profile, enhanced = enhance_if_changed(merged)
 
     return jsonify({
         "message": f"Source '{source_type}' processed successfully.",
+        "profile_id": profile_id,
+        "changed": merged.changed,
+        "enhanced": enhanced,
+        "source_versions": merged.versions,
+        "enhanced_profile": enhanced_profile.model_dump()
+    }), 200
+
+def enhance_if_changed(merged):
+    """
+    Relance l'enhancer LLM seulement si la fusion a modifié le profil ;
+    sinon on renvoie la version améliorée déjà stockée.
+    """
+    if not merged.changed:
+        stored = unifier.store.get_enhanced(merged.profile.profile_id)
+        if stored is not None:
+            return stored, False
+    enhanced_profile = enhancer.enhance(merged.profile)
+    unifier.store.save_enhanced(enhanced_profile)
+    return enhanced_profile, True
+
+def process_multi_source():
+    """
+    CV + LinkedIn + GitHub en une seule requête : les extracteurs tournent en
+    parallèle, la latence totale est celle du plus lent. Passé le délai
+    ('deadline', en secondes), on unifie les sources déjà terminées.
+    """
+    tasks = {}
+
+    file = request.files.get('file')
+    if file and file.filename:
+        try:
+            data = read_cv_upload(file)
+        except ValueError as e:
+            return upload_error(e)
+        tasks['cv'] = lambda: extract_cv_data(data)
+
+    linkedin_url = request.form.get('linkedin_url')
+    if linkedin_url:
+        tasks['linkedin'] = lambda: collect_profile_from_linkedin_url(linkedin_url)
+
+    github_url = request.form.get('github_url')
+    if github_url:
+        tasks['github'] = lambda: get_profile_from_github_url(github_url)
+
+    if not tasks:
+        return jsonify({"error": "Provide at least one of 'file', 'linkedin_url', 'github_url'"}), 400
+
+    try:
+        deadline = float(request.form.get('deadline', PROCESS_DEADLINE_SECONDS))
+    except ValueError:
+        return jsonify({"error": "Invalid 'deadline'"}), 400
+
+    results, errors = collect_sources(tasks, deadline=deadline)
+    if not results:
+        return jsonify({"error": "Extraction failed for every source", "sources": errors}), 500
+
+    # Unify & Enhance
+    profile_id = request.form.get('profile_id') or str(uuid.uuid4())
+    try:
+        merged = unifier.merge(profile_id, *results.values())
+    except Exception as e:
+        return jsonify({"error": f"Unification failed: {str(e)}"}), 500
+    enhanced_profile, enhanced = enhance_if_changed(merged)
+
+    sources = {name: "ok" for name in results}
+    sources.update({name: f"error: {message}" for name, message in errors.items()})
+    return jsonify({
+        "message": f"Sources {', '.join(sorted(results))} processed successfully.",
+        "profile_id": profile_id,
+        "partial": bool(errors),
+        "sources": sources,
+        "changed": merged.changed,
+        "enhanced": enhanced,
+        "source_versions": merged.versions,
         "enhanced_profile": enhanced_profile.model_dump()
     }), 200
 
+@app.route('/process/stream', methods=['POST'])
+def process_profile_stream():
+    """
+    Même pipeline que /process (une source), mais les résultats sont envoyés
+    en Server-Sent Events au fur et à mesure : chaque expérience, projet ou
+    compétence est transmis dès que le LLM a fini de l'écrire.
+
+    Événements : stage, nlp_skills, item ({stage, field, value}),
+    unified, enhanced_profile, error.
+    """
+    source_type = request.form.get('source_type')
+    if source_type == 'cv':
+        try:
+            data = read_cv_upload(request.files.get('file'))
+        except ValueError as e:
+            return upload_error(e)
+    elif source_type in ('linkedin', 'github'):
+        url = request.form.get('url')
+        if not url:
+            return jsonify({"error": f"Missing 'url' for '{source_type}'"}), 400
+    else:
+        return jsonify({"error": f"Invalid source_type: '{source_type}'"}), 400
+
+    profile_id = request.form.get('profile_id') or str(uuid.uuid4())
+
+    def generate():
+        try:
+            github_repos = None
+            if source_type == 'cv':
+                for event, payload in extract_cv_data_stream(data):
+                    if event == 'cv':
+                        new_data = payload
+                    elif event in ('stage', 'nlp_skills'):
+                        yield sse(event, payload)
+                    else:
+                        yield sse('item', {"stage": "extraction", "field": event, "value": payload})
+            elif source_type == 'linkedin':
+                yield sse('stage', 'extraction')
+                new_data = collect_profile_from_linkedin_url(url)
+            else:
+                yield sse('stage', 'extraction')
+                new_data, github_repos = get_profile_stream_from_github_url(url)
+
+            yield sse('stage', 'unification')
+            merged = unifier.merge(profile_id, new_data, github_repos=github_repos)
+            yield sse('unified', {"profile_id": profile_id, "changed": merged.changed,
+                                  "source_versions": merged.versions})
+
+            enhanced_profile = None if merged.changed else unifier.store.get_enhanced(profile_id)
+            if enhanced_profile is None:
+                yield sse('stage', 'enhancement')
+                for event, payload in enhancer.enhance_stream(merged.profile):
+                    if event == 'profile':
+                        enhanced_profile = payload
+                    else:
+                        yield sse('item', {"stage": "enhancement", "field": event, "value": payload})
+                unifier.store.save_enhanced(enhanced_profile)
+
+            yield sse('enhanced_profile', enhanced_profile.model_dump())
+        except Exception as e:
+            yield sse('error', {"error": str(e)})
+
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 # ======================================================================
 # --- MAIN ---
 # ======================================================================
@@ -0,0 +1,109 @@
+# benchmarks/cold_start.py
+"""
+Cold-start time and memory of the SkillNer stage, measured in fresh
+processes, with the matchers compiled at startup and with the precompiled
+artifacts of cv_extractor/extractors/skillner_artifacts.py:
+
+    python -m benchmarks.cold_start --build --runs 3
+
+For each mode it reports the import time, the time to build
+NlpSkillExtractor, the first extraction on a bundled CV, and the RSS
+after loading and at peak, and writes them to a JSON file.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List
+
+from cv_extractor.config import SKILLNER_ARTIFACT_DIR
+from cv_extractor.parsers.factory import get_parser
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+SAMPLE_CV = os.path.join(ROOT_DIR, "Gaurav_Kumar.pdf")
+
+MODES = ("compiled_at_startup", "precompiled")
+
+# Runs in the child process; prints one JSON line last.
+_CHILD = """
+import json, resource, sys, time
+started = time.perf_counter()
+from cv_extractor.extractors.nlp_skill_extractor import NlpSkillExtractor
+imported = time.perf_counter()
+extractor = NlpSkillExtractor()
+loaded = time.perf_counter()
+with open("/proc/self/statm") as f:
+    rss_loaded = int(f.read().split()[1]) * resource.getpagesize()
+skills = extractor.extract(open(sys.argv[1], encoding="utf-8").read())
+done = time.perf_counter()
+print(json.dumps({
+    "import_s": imported - started,
+    "load_s": loaded - imported,
+    "first_extract_s": done - loaded,
+    "total_s": done - started,
+    "rss_loaded_mb": rss_loaded / (1024 * 1024),
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "skills": len(skills),
+}))
+"""
+
+
+def run_once(mode: str, text_path: str, artifact_dir: str) -> Dict[str, Any]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT_DIR, os.environ.get("PYTHONPATH")])))
+    # A directory without a manifest makes the extractor compile at startup.
+    env["SKILLNER_ARTIFACT_DIR"] = artifact_dir if mode == "precompiled" else os.path.join(artifact_dir, "absent")
+    proc = subprocess.run([sys.executable, "-c", _CHILD, text_path], env=env,
+                          capture_output=True, text=True, check=True)
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    return {key: statistics.median(run[key] for run in runs) for key in runs[0]}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="Fresh processes per mode (median reported).")
+    parser.add_argument("--artifacts", default=SKILLNER_ARTIFACT_DIR, help="Precompiled artifact directory.")
+    parser.add_argument("--build", action="store_true", help="(Re)build the artifacts first.")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/cold-start-<timestamp>.json).")
+    args = parser.parse_args()
+
+    if args.build:
+        from cv_extractor.extractors.skillner_artifacts import build
+        print(f"Building artifacts in {args.artifacts}...")
+        build(args.artifacts)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write(get_parser(SAMPLE_CV).get_text(SAMPLE_CV))
+        text_path = f.name
+
+    report = {"timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"), "runs": args.runs, "modes": {}}
+    try:
+        for mode in MODES:
+            result = summarize([run_once(mode, text_path, args.artifacts) for _ in range(args.runs)])
+            report["modes"][mode] = result
+            print(f"{mode:<20} import={result['import_s']:.2f}s  load={result['load_s']:.2f}s  "
+                  f"first extract={result['first_extract_s']:.2f}s  rss={result['rss_loaded_mb']:.0f}MB  "
+                  f"peak={result['peak_rss_mb']:.0f}MB")
+    finally:
+        os.unlink(text_path)
+
+    before, after = report["modes"]["compiled_at_startup"], report["modes"]["precompiled"]
+    print(f"\ncold start: {before['total_s']:.2f}s -> {after['total_s']:.2f}s, "
+          f"RSS after load: {before['rss_loaded_mb']:.0f}MB -> {after['rss_loaded_mb']:.0f}MB")
+
+    output = args.output or os.path.join(RESULTS_DIR, f"cold-start-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
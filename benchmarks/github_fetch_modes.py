@@ -0,0 +1,188 @@
+# benchmarks/github_fetch_modes.py
+"""
+Compares the REST and GraphQL GitHub fetch modes on a recorded profile.
+
+Responses are replayed from the bundled `github_profile.json` through a fake
+HTTP session that adds a fixed per-request latency, so the benchmark needs
+no network and no token. It reports, per mode, the number of HTTP requests
+and the wall time to build a GitHubProfile.
+
+    python -m benchmarks.github_fetch_modes --latency 0.08 --commit-repos 3
+"""
+import argparse
+import base64
+import json
+import os
+import statistics
+import threading
+import time
+from typing import Any, Dict, List
+
+from github_extractor.api_client import GitHubApiClient
+from github_extractor.http_client import GitHubHttpClient
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_FIXTURE = os.path.join(ROOT_DIR, "github_profile.json")
+
+
+class _FakeResponse:
+    def __init__(self, status_code: int, payload: Any, headers: Dict[str, str] = None):
+        self.status_code = status_code
+        self.headers = {"Content-Type": "application/json", **(headers or {})}
+        self.content = json.dumps(payload).encode("utf-8")
+        self._payload = payload
+
+    def json(self):
+        return self._payload
+
+
+class ReplaySession:
+    """
+    A stand-in for `requests.Session` that answers GitHub REST and GraphQL
+    calls from a recorded profile, sleeping `latency` seconds per request.
+    """
+
+    def __init__(self, profile: Dict[str, Any], latency: float, extra_repos: int = 0):
+        self.headers = {}
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        repos = list(profile.get("repos", []))
+        repos += [{"repo_name": f"generated-repo-{i}", "repo_description": ""} for i in range(extra_repos)]
+        self.username = profile["username"]
+        self.user = {
+            "id": int(profile["user_id"]), "login": profile["username"], "name": profile.get("name"),
+            "bio": profile.get("bio"), "location": profile.get("location"),
+            "email": profile.get("email") or None, "company": profile.get("company") or None,
+            "blog": profile.get("website") or "",
+        }
+        self.repos = [
+            {"name": r["repo_name"], "description": r.get("repo_description") or None,
+             "fork": False, "pushed_at": f"2025-01-{(i % 28) + 1:02d}T00:00:00Z"}
+            for i, r in enumerate(repos)
+        ]
+        self.readme = profile.get("user_named_repo_readme") or ""
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def close(self):
+        pass
+
+    def _commits(self, repo_name: str, count: int) -> List[Dict[str, Any]]:
+        return [{"commit": {"message": f"{repo_name}: change {i}"}} for i in range(count)]
+
+    def request(self, method, url, params=None, headers=None, json=None, timeout=None):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        if method == "POST":
+            return _FakeResponse(200, self._graphql(json))
+        return self._rest(url, params or {})
+
+    def _rest(self, url: str, params: Dict[str, Any]) -> _FakeResponse:
+        path, _, query = url.split("api.github.com", 1)[-1].partition("?")
+        if query:
+            params = {**params, **{k: int(v) for k, v in (p.split("=") for p in query.split("&"))}}
+        user = self.username
+        if path == f"/users/{user}":
+            return _FakeResponse(200, self.user)
+        if path == f"/users/{user}/repos":
+            per_page, page = params.get("per_page", 30), params.get("page", 1)
+            headers = {}
+            if page * per_page < len(self.repos):
+                next_url = f"https://api.github.com/users/{user}/repos?per_page={per_page}&page={page + 1}"
+                headers["Link"] = f'<{next_url}>; rel="next"'
+            return _FakeResponse(200, self.repos[(page - 1) * per_page:page * per_page], headers)
+        if path == f"/repos/{user}/{user}/readme":
+            return _FakeResponse(200, {"content": base64.b64encode(self.readme.encode()).decode()})
+        if path.endswith("/commits"):
+            repo_name = path.split("/")[3]
+            return _FakeResponse(200, self._commits(repo_name, params.get("per_page", 30)))
+        return _FakeResponse(404, {"message": "Not Found"})
+
+    def _graphql(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        variables = body["variables"]
+        start = 0
+        if "cursor" in variables:
+            start = int(variables["cursor"])
+        page = self.repos[start:start + 100]
+        has_next = start + 100 < len(self.repos)
+        repositories = {
+            "pageInfo": {"hasNextPage": has_next, "endCursor": str(start + 100)},
+            "nodes": [{"name": r["name"], "description": r["description"]} for r in page],
+        }
+        if "cursor" in variables:
+            return {"data": {"user": {"repositories": repositories}}}
+
+        user = {
+            "databaseId": self.user["id"], "login": self.user["login"], "name": self.user["name"],
+            "bio": self.user["bio"], "location": self.user["location"], "email": self.user["email"] or "",
+            "company": self.user["company"], "websiteUrl": self.user["blog"],
+            "profileRepo": {"readmeUpper": {"text": self.readme}, "readmeLower": None},
+            "repositories": repositories,
+        }
+        if variables.get("withCommits"):
+            top = sorted(self.repos, key=lambda r: r["pushed_at"], reverse=True)[:variables["commitRepos"]]
+            user["topRepos"] = {"nodes": [
+                {"name": r["name"], "defaultBranchRef": {"target": {"history": {"nodes": [
+                    c["commit"] for c in self._commits(r["name"], variables["commitsPerRepo"])
+                ]}}}}
+                for r in top
+            ]}
+        return {"data": {"user": user}}
+
+
+def run_mode(profile: Dict[str, Any], mode: str, latency: float, commit_repos: int,
+             runs: int, extra_repos: int) -> Dict[str, Any]:
+    timings, requests_per_run, repo_counts = [], [], []
+    for _ in range(runs):
+        session = ReplaySession(profile, latency, extra_repos)
+        http = GitHubHttpClient(token="benchmark", session=session)
+        client = GitHubApiClient(http=http)
+
+        started = time.perf_counter()
+        result = client.get_profile_data(profile["username"], mode=mode, commit_repos=commit_repos)
+        timings.append(time.perf_counter() - started)
+        requests_per_run.append(session.requests)
+        repo_counts.append(len(result.repos))
+
+    return {
+        "mode": mode,
+        "requests": requests_per_run[0],
+        "repos": repo_counts[0],
+        "wall_time_p50_s": statistics.median(timings),
+        "wall_time_max_s": max(timings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=DEFAULT_FIXTURE, help="Recorded GitHub profile JSON.")
+    parser.add_argument("--latency", type=float, default=0.08, help="Simulated seconds per HTTP request.")
+    parser.add_argument("--commit-repos", type=int, default=3, help="Repositories to fetch commits for.")
+    parser.add_argument("--extra-repos", type=int, default=0,
+                        help="Synthetic repositories added to the fixture (to exercise pagination).")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Write the results as JSON to this file.")
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as f:
+        profile = json.load(f)
+
+    results = [run_mode(profile, mode, args.latency, args.commit_repos, args.runs, args.extra_repos)
+               for mode in ("rest", "graphql")]
+
+    print(f"{'mode':<10}{'requests':>10}{'repos':>8}{'p50 (s)':>10}{'max (s)':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['requests']:>10}{r['repos']:>8}"
+              f"{r['wall_time_p50_s']:>10.3f}{r['wall_time_max_s']:>10.3f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"latency_s": args.latency, "commit_repos": args.commit_repos, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
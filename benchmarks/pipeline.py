@@ -0,0 +1,268 @@
+# benchmarks/pipeline.py
+"""
+End-to-end benchmark of the extract -> unify -> enhance pipeline on the
+bundled fixtures, with every network call replaced:
+
+- the LLM stages use the deterministic stub backend (optionally with a
+  simulated latency per call),
+- GitHub is replayed from `github_profile.json` (see github_fetch_modes),
+- LinkedIn is answered from the raw Scrapetable data in `linkedin_profile.json`.
+
+For each concurrency level it reports per-stage timings (parsing, SkillNer,
+LLM, LinkedIn, GitHub, unify, enhance, serialization), p50/p95 document
+latency, docs/sec and the process peak RSS, and writes everything to a JSON
+file so runs can be compared over time:
+
+    python -m benchmarks.pipeline --concurrency 1,4,8 --docs 24 --llm-latency 0.5
+    python -m benchmarks.pipeline --baseline benchmarks/results/pipeline-20260101-120000.json
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext, redirect_stdout
+from typing import Any, Dict, List, Optional
+from unittest import mock
+
+from benchmarks.github_fetch_modes import ReplaySession
+from cv_extractor.extractors.hybrid_manager import HybridManager
+from cv_extractor.extractors.llm_data_extractor import LlmDataExtractor
+from cv_extractor.parsers.factory import get_parser
+from cv_extractor.registry import registry
+from enhancement_service.enhancer import ProfileEnhancer
+from github_extractor.api_client import GitHubApiClient
+from github_extractor.http_client import GitHubHttpClient
+from linkedin_extractor.scraper import LinkedInScraperClient
+from llm_backends.stub_backend import StubBackend
+from unification_service.unifier import ProfileUnifier
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_CVS = ["Gaurav_Kumar.pdf", "Gaurav_Kumar.docx", "MAIMOUNI_YOUSSEF_CV.pdf"]
+GITHUB_FIXTURE = os.path.join(ROOT_DIR, "github_profile.json")
+LINKEDIN_FIXTURE = os.path.join(ROOT_DIR, "linkedin_profile.json")
+RESULTS_DIR = os.path.join(ROOT_DIR, "benchmarks", "results")
+
+STAGES = ("parse", "skillner", "llm", "linkedin", "github", "unify", "enhance", "serialize")
+
+
+class _LinkedInResponse:
+    status_code = 200
+
+    def __init__(self, person: Dict[str, Any]):
+        self._payload = {"success": True, "person": person}
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Nearest-rank percentile (p in 0..100)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KB on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+class PipelineBench:
+    """Runs the whole pipeline for one CV plus the LinkedIn and GitHub fixtures."""
+
+    def __init__(self, llm_latency: float, skip_skillner: bool, enhancement_mode: str = "profile"):
+        self.skip_skillner = skip_skillner
+        self.llm_extractor = LlmDataExtractor(backend=StubBackend(latency=llm_latency))
+        # Every document is enhanced: the benchmark profiles share content.
+        self.enhancer = ProfileEnhancer(backend=StubBackend(latency=llm_latency), use_cache=False,
+                                        mode=enhancement_mode)
+        # Profiles are unified in memory; the store is not part of this benchmark.
+        # Without SkillNer, skills are not canonicalized either: both need SKILL_DB.
+        # Semantic de-duplication is off: it would load an embedding model and
+        # fill instance/embeddings.db, which is not what this benchmark measures.
+        self.unifier = ProfileUnifier(canonicalize_skills=not skip_skillner, dedup=False)
+
+        with open(GITHUB_FIXTURE, encoding="utf-8") as f:
+            self.github_fixture = json.load(f)
+        with open(LINKEDIN_FIXTURE, encoding="utf-8") as f:
+            self.linkedin_person = json.load(f)["raw_data"]
+        os.environ.setdefault("SCRAPETABLE_API_KEY", "benchmark")
+        # Patched once for the whole run: patching per call is not thread-safe.
+        mock.patch("linkedin_extractor.scraper.requests.get",
+                   return_value=_LinkedInResponse(self.linkedin_person)).start()
+
+    @contextmanager
+    def _timed(self, timings: Dict[str, float], stage: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings[stage] = time.perf_counter() - started
+
+    def run(self, cv_path: str) -> Dict[str, float]:
+        """Processes one document; returns the seconds spent per stage."""
+        timings: Dict[str, float] = {}
+
+        with self._timed(timings, "parse"):
+            text = get_parser(cv_path).get_text(cv_path)
+        with self._timed(timings, "skillner"):
+            nlp_skills = [] if self.skip_skillner else registry.get("nlp_skill_extractor").extract(text)
+        with self._timed(timings, "llm"):
+            cv = HybridManager.merge(text, nlp_skills, self.llm_extractor.extract(text, nlp_skills))
+
+        with self._timed(timings, "linkedin"):
+            linkedin = LinkedInScraperClient().get_profile_data(self.linkedin_person["profileUrl"])
+        with self._timed(timings, "github"):
+            session = ReplaySession(self.github_fixture, latency=0.0)
+            client = GitHubApiClient(http=GitHubHttpClient(token="benchmark", session=session))
+            github = client.get_profile_data(self.github_fixture["username"])
+
+        with self._timed(timings, "unify"):
+            unified = self.unifier.unify(str(uuid.uuid4()), cv, linkedin, github)
+        with self._timed(timings, "enhance"):
+            enhanced = self.enhancer.enhance(unified)
+        with self._timed(timings, "serialize"):
+            enhanced.model_dump_json()
+
+        timings["total"] = sum(timings[stage] for stage in STAGES)
+        return timings
+
+
+def run_level(bench: PipelineBench, cvs: List[str], concurrency: int, docs: int) -> Dict[str, Any]:
+    results: List[Dict[str, float]] = []
+    errors: List[str] = []
+    lock = threading.Lock()
+
+    def one(i: int):
+        try:
+            timings = bench.run(cvs[i % len(cvs)])
+            with lock:
+                results.append(timings)
+        except Exception as e:
+            with lock:
+                errors.append(f"{cvs[i % len(cvs)]}: {e}")
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(docs)))
+    wall = time.perf_counter() - started
+
+    totals = [r["total"] for r in results]
+    return {
+        "concurrency": concurrency,
+        "docs": docs,
+        "errors": errors,
+        "wall_s": wall,
+        "docs_per_sec": len(results) / wall if wall else 0.0,
+        "latency_s": {"p50": percentile(totals, 50), "p95": percentile(totals, 95)},
+        "stages_s": {
+            stage: {
+                "p50": percentile([r[stage] for r in results], 50),
+                "p95": percentile([r[stage] for r in results], 95),
+                "mean": sum(r[stage] for r in results) / len(results) if results else 0.0,
+            }
+            for stage in STAGES
+        },
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _print_level(level: Dict[str, Any]):
+    stages = "  ".join(f"{stage}={level['stages_s'][stage]['p50'] * 1000:.0f}ms" for stage in STAGES)
+    print(f"c={level['concurrency']:<3} {level['docs_per_sec']:7.2f} docs/s  "
+          f"p50={level['latency_s']['p50']:.3f}s  p95={level['latency_s']['p95']:.3f}s  "
+          f"rss={level['peak_rss_mb']:.0f}MB  errors={len(level['errors'])}")
+    print(f"      stage p50: {stages}")
+
+
+def _compare(report: Dict[str, Any], baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = {level["concurrency"]: level for level in json.load(f)["levels"]}
+    print(f"\nCompared with {baseline_path}:")
+    for level in report["levels"]:
+        before = baseline.get(level["concurrency"])
+        if not before:
+            continue
+        throughput = level["docs_per_sec"] / before["docs_per_sec"] - 1 if before["docs_per_sec"] else 0.0
+        p95 = level["latency_s"]["p95"] / before["latency_s"]["p95"] - 1 if before["latency_s"]["p95"] else 0.0
+        print(f"c={level['concurrency']:<3} docs/s {throughput:+.1%}  p95 {p95:+.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cv", action="append", help="CV fixture (repeatable). Defaults to the bundled CVs.")
+    parser.add_argument("--concurrency", default="1,2,4,8", help="Comma-separated worker counts.")
+    parser.add_argument("--docs", type=int, default=24, help="Documents processed per concurrency level.")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="Simulated seconds per LLM call.")
+    parser.add_argument("--skip-skillner", action="store_true",
+                        help="Do not run the SkillNer stage nor canonicalize skills (runs without SKILL_DB).")
+    parser.add_argument("--enhancement-mode", choices=("profile", "fields"), default="profile",
+                        help="ProfileEnhancer mode (see enhancement_service/config.py).")
+    parser.add_argument("--output", help="Result file (default: benchmarks/results/pipeline-<timestamp>.json).")
+    parser.add_argument("--baseline", help="Earlier result file to compare docs/sec and p95 against.")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's own log output.")
+    args = parser.parse_args()
+    quiet = nullcontext() if args.verbose else redirect_stdout(open(os.devnull, "w"))
+
+    cvs = [os.path.join(ROOT_DIR, cv) if not os.path.isabs(cv) else cv for cv in (args.cv or DEFAULT_CVS)]
+    levels = [int(c) for c in args.concurrency.split(",")]
+    bench = PipelineBench(args.llm_latency, args.skip_skillner, args.enhancement_mode)
+
+    # The first document pays for model loading; it is reported separately.
+    started = time.perf_counter()
+    with quiet:
+        bench.run(cvs[0])
+    cold_start = time.perf_counter() - started
+    print(f"cold start (first document, incl. model loading): {cold_start:.2f}s")
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {"cvs": [os.path.basename(cv) for cv in cvs], "docs": args.docs,
+                   "llm_latency_s": args.llm_latency, "skip_skillner": args.skip_skillner,
+                   "enhancement_mode": args.enhancement_mode},
+        "cold_start_s": cold_start,
+        "levels": [],
+    }
+    for concurrency in levels:
+        with quiet:
+            level = run_level(bench, cvs, concurrency, args.docs)
+        report["levels"].append(level)
+        _print_level(level)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"pipeline-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.baseline:
+        _compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+# conftest.py
+import json
+
+import pytest
+import requests
+
+
+class FakeSession(requests.Session):
+    """A requests.Session answering from a script instead of the network."""
+
+    def __init__(self, responses):
+        super().__init__()
+        self.responses = list(responses)
+        self.sent = []
+
+    def request(self, method, url, params=None, headers=None, json=None, timeout=None, **kwargs):
+        self.sent.append({"method": method, "url": url, "params": params, "headers": dict(headers or {}),
+                          "json": json})
+        answer = self.responses.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+
+def fake_response(status_code=200, body=None, headers=None):
+    response = requests.Response()
+    response.status_code = status_code
+    response._content = b"" if body is None else json.dumps(body).encode("utf-8")
+    response.headers.update(headers or {})
+    return response
+
+
+@pytest.fixture
+def fake_session():
+    """Builds a FakeSession from (status, body, headers) tuples or exceptions."""
+    def build(*answers):
+        return FakeSession([answer if isinstance(answer, Exception) else fake_response(*answer)
+                            for answer in answers])
+    return build
@@ -1,2 +1,3 @@
-from .pipeline import extract_cv_data
-
+from .pipeline import extract_cv_data, extract_cv_data_stream
+from .batch import extract_cv_batch
+from .registry import warm_up_models, models_ready
@@ -0,0 +1,213 @@
+# cv_extractor/batch.py
+import argparse
+import multiprocessing
+import os
+import sys
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from observability.tracing import span
+
+from .cache import TIER_NLP, get_cache
+from .extractors.nlp_skill_extractor import NlpSkillExtractor
+from .models.cv_models import BatchExtractionResult, Skill
+from .pipeline import _hash_file, _parse_text, _run_llm, _text_version
+from .registry import registry
+
+SUPPORTED_EXTENSIONS = (".pdf", ".docx")
+
+# (file_path, file_hash, full_text, nlp_skills as dicts, error)
+_ParsedItem = Tuple[str, Optional[str], Optional[str], Optional[List[dict]], Optional[str]]
+
+
+def _init_worker() -> None:
+    """Loads spaCy/SkillNer once per worker process, before the first task."""
+    registry.get("nlp_skill_extractor")
+
+
+def _parse_chunk(paths: List[str]) -> List[_ParsedItem]:
+    """
+    Worker task: parses a chunk of files, then runs SkillNer over their
+    texts together so spaCy processes them in batches (nlp.pipe).
+    Returns plain dicts so results pickle cheaply across processes.
+    """
+    cache = get_cache()
+    parsed, errors = {}, {}
+    for path in paths:
+        try:
+            file_hash = _hash_file(path)
+            parsed[path] = (file_hash, _parse_text(path, file_hash))
+        except Exception as e:
+            errors[path] = f"Parsing failed: {e}"
+
+    # Cached NLP results are reused; the other texts are tagged in one batch.
+    skills, pending = {}, []
+    for path, (file_hash, text) in parsed.items():
+        version = _text_version(NlpSkillExtractor.version, text)
+        cached = cache.get(file_hash, TIER_NLP, version) if cache is not None else None
+        if cached is not None:
+            skills[path] = cached
+        else:
+            pending.append((path, file_hash, text, version))
+    if pending:
+        try:
+            with span("nlp", documents=len(pending)):
+                tagged = registry.get("nlp_skill_extractor").extract_many(text for _, _, text, _ in pending)
+        except Exception as e:
+            errors.update((path, f"NLP failed: {e}") for path, _, _, _ in pending)
+        else:
+            for (path, file_hash, _, version), found in zip(pending, tagged):
+                skills[path] = [s.model_dump() for s in found]
+                if cache is not None:
+                    cache.put(file_hash, TIER_NLP, version, skills[path])
+
+    return [
+        (path, None, None, None, errors[path]) if path in errors
+        else (path, parsed[path][0], parsed[path][1], skills[path], None)
+        for path in paths
+    ]
+
+
+def _llm_task(item: _ParsedItem) -> BatchExtractionResult:
+    path, file_hash, text, skills, _ = item
+    try:
+        cv = _run_llm(text, [Skill(**s) for s in skills], file_hash)
+        return BatchExtractionResult(file_path=path, cv=cv)
+    except Exception as e:
+        return BatchExtractionResult(file_path=path, error=f"LLM extraction failed: {e}")
+
+
+def _chunks(items: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def extract_cv_batch(paths: Iterable[str],
+                     n_process: Optional[int] = None,
+                     batch_size: int = 8,
+                     llm_concurrency: int = 4) -> Iterator[BatchExtractionResult]:
+    """
+    Extracts many CVs, streaming one BatchExtractionResult per file as soon
+    as it is finished (not in input order).
+
+    Parsing and SkillNer run in `n_process` worker processes (default: one
+    per CPU), each handling `batch_size` files per task; the texts of a
+    task go through spaCy together (nlp.pipe). The LLM stage runs
+    in this process with at most `llm_concurrency` calls in flight.
+
+    Args:
+        paths: CV files (PDF or DOCX).
+        n_process: Number of parsing/NLP worker processes. 1 runs in-process.
+        batch_size: Number of files sent to a worker per task.
+        llm_concurrency: Maximum number of concurrent LLM requests.
+    """
+    paths = list(paths)
+    if not paths:
+        return
+    n_process = n_process or os.cpu_count() or 1
+    batch_size = max(1, batch_size)
+
+    if n_process == 1:
+        registry.get("nlp_skill_extractor")
+        parse_pool = ThreadPoolExecutor(max_workers=1)
+    else:
+        # Workers come from a fork server, not forked from this process:
+        # they load the models once in _init_worker instead of inheriting
+        # whatever the parent (e.g. the app) already holds.
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload([__name__])
+        parse_pool = ProcessPoolExecutor(max_workers=n_process, mp_context=context,
+                                         initializer=_init_worker)
+    llm_pool = ThreadPoolExecutor(max_workers=max(1, llm_concurrency))
+
+    try:
+        parse_futures = {
+            parse_pool.submit(_parse_chunk, chunk): chunk
+            for chunk in _chunks(paths, batch_size)
+        }
+        llm_futures = set()
+
+        while parse_futures or llm_futures:
+            done, _ = wait(set(parse_futures) | llm_futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                if future in parse_futures:
+                    chunk = parse_futures.pop(future)
+                    try:
+                        items = future.result()
+                    except Exception as e:
+                        # A crashed worker loses its whole chunk.
+                        for path in chunk:
+                            yield BatchExtractionResult(file_path=path, error=f"Worker failed: {e}")
+                        continue
+                    for item in items:
+                        if item[4]:
+                            yield BatchExtractionResult(file_path=item[0], error=item[4])
+                        else:
+                            llm_futures.add(llm_pool.submit(_llm_task, item))
+                else:
+                    llm_futures.discard(future)
+                    yield future.result()
+    finally:
+        parse_pool.shutdown(wait=False, cancel_futures=True)
+        llm_pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _collect_paths(inputs: List[str]) -> List[str]:
+    """Expands directories into the supported CV files they contain."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                paths.extend(
+                    os.path.join(root, f) for f in sorted(files)
+                    if f.lower().endswith(SUPPORTED_EXTENSIONS)
+                )
+        else:
+            paths.append(item)
+    return paths
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Command-line entry point:
+
+        python -m cv_extractor.batch cvs/ other.pdf -o results.jsonl -j 8
+    """
+    parser = argparse.ArgumentParser(description="Extract structured data from many CVs.")
+    parser.add_argument("inputs", nargs="+", help="CV files or directories containing them.")
+    parser.add_argument("-o", "--output", help="JSON Lines output file (default: stdout).")
+    parser.add_argument("-j", "--n-process", type=int, default=None,
+                        help="Parsing/NLP worker processes (default: CPU count).")
+    parser.add_argument("-b", "--batch-size", type=int, default=8,
+                        help="Files per worker task.")
+    parser.add_argument("--llm-concurrency", type=int, default=4,
+                        help="Maximum concurrent LLM requests.")
+    args = parser.parse_args(argv)
+
+    paths = _collect_paths(args.inputs)
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    failures = 0
+    try:
+        for result in extract_cv_batch(paths, n_process=args.n_process,
+                                       batch_size=args.batch_size,
+                                       llm_concurrency=args.llm_concurrency):
+            if result.error:
+                failures += 1
+                print(f"[Batch] {result.file_path}: {result.error}", file=sys.stderr)
+            out.write(result.model_dump_json() + "\n")
+            out.flush()
+    finally:
+        if out is not sys.stdout:
+            out.close()
+
+    print(f"[Batch] Processed {len(paths)} file(s), {failures} failure(s).", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+# cv_extractor/cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+from storage.sqlite import SQLiteDatabase
+
+from .config import CV_CACHE_ENABLED, CV_CACHE_MAX_BYTES, CV_CACHE_PATH
+
+# The three independent tiers. Each one is keyed by the file hash plus the
+# version of the component that produced it, so bumping e.g. the LLM model
+# only invalidates the "llm" tier and keeps parsed text and NLP skills. The
+# "nlp" and "llm" versions also carry a digest of the text they read (see
+# pipeline._text_version): a new parser version re-runs them only for the
+# files whose text actually changed.
+TIER_TEXT = "text"
+TIER_NLP = "nlp"
+TIER_LLM = "llm"
+TIERS = (TIER_TEXT, TIER_NLP, TIER_LLM)
+
+# A hit refreshes the entry's LRU position at most this often, so hot
+# entries are not rewritten on every read.
+_TOUCH_INTERVAL = 60
+
+
+def file_sha256(data: bytes) -> str:
+    """Content address of an uploaded file."""
+    return hashlib.sha256(data).hexdigest()
+
+
+class ExtractionCache:
+    """
+    A persistent, size-bounded LRU cache for CV extraction results, stored
+    in a SQLite file so it survives restarts and is shared between worker
+    processes.
+
+    Values are JSON documents. Hit/miss counters are kept per tier for the
+    current process.
+    """
+
+    def __init__(self, path: str = CV_CACHE_PATH, max_bytes: int = CV_CACHE_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._hits = {tier: 0 for tier in TIERS}
+        self._misses = {tier: 0 for tier in TIERS}
+
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS cache_entries (
+                file_hash   TEXT NOT NULL,
+                tier        TEXT NOT NULL,
+                version     TEXT NOT NULL,
+                value       TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                last_access REAL NOT NULL,
+                PRIMARY KEY (file_hash, tier, version)
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache_entries (last_access)",
+        ])
+
+    def get(self, file_hash: str, tier: str, version: str) -> Optional[Any]:
+        """Returns the cached value, or None on a miss."""
+        now = time.time()
+        with self.db.connect() as conn:
+            row = conn.execute(
+                "SELECT value, last_access FROM cache_entries WHERE file_hash = ? AND tier = ? AND version = ?",
+                (file_hash, tier, version),
+            ).fetchone()
+            if row is not None and row[1] < now - _TOUCH_INTERVAL:
+                conn.execute(
+                    "UPDATE cache_entries SET last_access = ? "
+                    "WHERE file_hash = ? AND tier = ? AND version = ?",
+                    (now, file_hash, tier, version),
+                )
+
+        with self._lock:
+            if row is None:
+                self._misses[tier] += 1
+                return None
+            self._hits[tier] += 1
+        return json.loads(row[0])
+
+    def put(self, file_hash: str, tier: str, version: str, value: Any) -> None:
+        """Stores a value, then evicts least-recently-used entries if over budget."""
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO cache_entries "
+                "(file_hash, tier, version, value, size, last_access) VALUES (?, ?, ?, ?, ?, ?)",
+                (file_hash, tier, version, payload, size, time.time()),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute(
+            "SELECT rowid, size FROM cache_entries ORDER BY last_access ASC"
+        ).fetchall()
+        to_delete = []
+        for rowid, size in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((rowid,))
+            total -= size
+        conn.executemany("DELETE FROM cache_entries WHERE rowid = ?", to_delete)
+
+    def get_or_compute(self, file_hash: str, tier: str, version: str,
+                       compute: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value, computing and storing it on a miss.
+        Empty results (e.g. an unparseable LLM response) are not stored.
+        """
+        value = self.get(file_hash, tier, version)
+        if value is None:
+            value = compute()
+            if value:
+                self.put(file_hash, tier, version, value)
+        return value
+
+    def invalidate(self, file_hash: Optional[str] = None, tier: Optional[str] = None) -> int:
+        """
+        Removes entries for one file and/or one tier (everything when both
+        are None). Returns the number of deleted entries.
+        """
+        clauses, params = [], []
+        if file_hash:
+            clauses.append("file_hash = ?")
+            params.append(file_hash)
+        if tier:
+            clauses.append("tier = ?")
+            params.append(tier)
+        where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self.db.connect() as conn:
+            return conn.execute(f"DELETE FROM cache_entries{where}", params).rowcount
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-tier hit/miss counters for this process, plus the on-disk footprint."""
+        with self.db.connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+        with self._lock:
+            tiers = {
+                tier: {
+                    "hits": self._hits[tier],
+                    "misses": self._misses[tier],
+                    "hit_rate": (self._hits[tier] / (self._hits[tier] + self._misses[tier])
+                                 if self._hits[tier] + self._misses[tier] else 0.0),
+                }
+                for tier in TIERS
+            }
+        return {"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes, "tiers": tiers}
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> Optional[ExtractionCache]:
+    """Returns the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not CV_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ExtractionCache()
+    return _cache
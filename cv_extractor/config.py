@@ -5,11 +5,69 @@ from dotenv import load_dotenv
 # Load environment variables from a .env file
 load_dotenv()
 
-# OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# LLM API keys and backend selection live in llm_backends/config.py.
 
-# if not OPENAI_API_KEY:
-#     raise ValueError("OPENAI_API_KEY not found in .env file. Please add it.")
+# --- Extraction result cache ---
+# Set CV_CACHE_ENABLED=0 to always re-run parsing, SkillNer and the LLM.
+CV_CACHE_ENABLED = os.getenv("CV_CACHE_ENABLED", "1") == "1"
+CV_CACHE_PATH = os.getenv("CV_CACHE_PATH", os.path.join("instance", "cv_cache.db"))
+CV_CACHE_MAX_BYTES = int(os.getenv("CV_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
 
-import os
+# --- Prompt budgets (tokens) ---
+# Inputs are compacted first. A CV still larger than this is extracted in
+# sections mode, each section split into chunks that fit (see
+# LlmDataExtractor.extract); the enhancer leaves the projects over its
+# budget unchanged.
+CV_PROMPT_MAX_TOKENS = int(os.getenv("CV_PROMPT_MAX_TOKENS", "12000"))
+ENHANCER_PROMPT_MAX_TOKENS = int(os.getenv("ENHANCER_PROMPT_MAX_TOKENS", "12000"))
+# Set PROMPT_SAVINGS_STATS=1 to also count the tokens of the uncompacted
+# prompt on every call, for the tokens-saved metric. Off by default: it
+# renders and tokenizes a second, larger prompt per LLM call.
+PROMPT_SAVINGS_STATS = os.getenv("PROMPT_SAVINGS_STATS", "0") == "1"
+
+# --- LLM extraction mode ---
+# "single": one prompt for the whole CV. "sections": the CV is split into
+# sections and experience, projects and skills are extracted by concurrent,
+# smaller prompts (see LlmDataExtractor.extract).
+CV_LLM_MODE = os.getenv("CV_LLM_MODE", "single")
+CV_SECTION_MODELS = {
+    "work_experience": os.getenv("CV_MODEL_EXPERIENCE", "gemini-1.5-pro"),
+    "projects": os.getenv("CV_MODEL_PROJECTS", "gemini-1.5-flash"),
+    "skills": os.getenv("CV_MODEL_SKILLS", "gemini-1.5-flash"),
+}
+# Section prompts in flight per process.
+CV_SECTION_CONCURRENCY = int(os.getenv("CV_SECTION_CONCURRENCY", "6"))
+
+# --- Parsing ---
+# PDFs with at least this many pages are split into page ranges parsed by
+# a pool of PDF_WORKERS processes; smaller ones are parsed in-process.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv("PDF_PARALLEL_MIN_PAGES", "32"))
+PDF_WORKERS = int(os.getenv("PDF_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# --- Uploads ---
+# Uploaded CVs are parsed from memory. Larger uploads are rejected while
+# they are being read.
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(10 * 1024 * 1024)))
+# Set UPLOAD_PERSIST=1 to also keep every upload in UPLOAD_DIR, named by
+# the SHA-256 of its content.
+UPLOAD_PERSIST = os.getenv("UPLOAD_PERSIST", "0") == "1"
+UPLOAD_DIR = os.getenv("UPLOAD_DIR", "uploads")
+# Asynchronous jobs may run in another process, so their CV is staged here
+# (one file per job) and deleted when the job finishes.
+UPLOAD_JOB_DIR = os.getenv("UPLOAD_JOB_DIR", os.path.join(UPLOAD_DIR, "jobs"))
+# Staged files older than this are deleted as orphans (their job was lost
+# before it could clean up). Keep it at least JOB_TTL_SECONDS, longer than
+# a job can stay queued and running.
+UPLOAD_JOB_MAX_AGE = int(os.getenv("UPLOAD_JOB_MAX_AGE", "3600"))
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+# --- SkillNer ---
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_lg")
+# Output of `python -m cv_extractor.extractors.skillner_artifacts`: the
+# trimmed spaCy pipeline, its vectors and the compiled SkillNer matchers.
+# When missing or built for another model/version, they are compiled at
+# startup instead.
+SKILLNER_ARTIFACT_DIR = os.getenv("SKILLNER_ARTIFACT_DIR", os.path.join("instance", "skillner"))
+# Local copy of SKILL_DB, written by the same build. Without it, SKILL_DB
+# comes from skillNer, which downloads it unless skill_db_relax_20.json is
+# in the working directory.
+SKILL_DB_PATH = os.getenv("SKILL_DB_PATH", os.path.join(SKILLNER_ARTIFACT_DIR, "skill_db.json"))
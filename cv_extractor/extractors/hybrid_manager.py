@@ -1,23 +1,39 @@
 # cv_extractor/extractors/hybrid_manager.py
+from typing import List
+from observability.tracing import span
 from .nlp_skill_extractor import NlpSkillExtractor
 from .llm_data_extractor import LlmDataExtractor
 from ..models.cv_models import ExtractedCV, Skill
 
 
 class HybridManager:
-    def __init__(self):
-        self.nlp_extractor = NlpSkillExtractor()
-        self.llm_extractor = LlmDataExtractor()
+    def __init__(self, nlp_extractor: NlpSkillExtractor = None, llm_extractor: LlmDataExtractor = None):
+        # Extractors are normally injected from the shared model registry
+        # (see cv_extractor/registry.py) so spaCy/SkillNer load once per process.
+        self.nlp_extractor = nlp_extractor or NlpSkillExtractor()
+        self.llm_extractor = llm_extractor or LlmDataExtractor()
 
     def extract(self, text: str) -> ExtractedCV:
         print("2a. Running NLP skill extraction...")
-        nlp_skills = self.nlp_extractor.extract(text)
+        with span("nlp"):
+            nlp_skills = self.nlp_extractor.extract(text)
+        return self.extract_with_skills(text, nlp_skills)
+
+    def extract_with_skills(self, text: str, nlp_skills: List[Skill]) -> ExtractedCV:
+        """
+        Runs the LLM stage on text whose NLP skills are already known
+        (e.g. computed in a batch worker) and merges both outputs.
+        """
+        print("2b. Running LLM for verification and contextual extraction...")
+        with span("llm_extraction"):
+            llm_output = self.llm_extractor.extract(text, nlp_skills)
+        return self.merge(text, nlp_skills, llm_output)
 
+    @staticmethod
+    def merge(text: str, nlp_skills: List[Skill], llm_output: dict) -> ExtractedCV:
+        """Combines the NLP evidence and the LLM output into an ExtractedCV."""
         nlp_evidence_map = {skill.name: skill.evidence for skill in nlp_skills}
 
-        print("2b. Running LLM for verification and contextual extraction...")
-        llm_output = self.llm_extractor.extract(text, nlp_skills)
-
         final_skills = []
         if llm_output.get("skills"):
             llm_skill_names = [s.get("name").lower() for s in llm_output["skills"] if s.get("name")]
@@ -26,12 +42,11 @@ class HybridManager:
                 evidence = nlp_evidence_map.get(skill_name, [])
                 final_skills.append(Skill(name=skill_name, evidence=evidence))
 
-        # --- UPDATE THIS BLOCK ---
         final_cv_data = ExtractedCV(
             full_text=text,
             skills=final_skills,
             work_experience=llm_output.get("work_experience", []),
-            projects=llm_output.get("projects", [])  # <-- Add this line
+            projects=llm_output.get("projects", [])
         )
 
-        return final_cv_data
\ No newline at end of file
+        return final_cv_data
@@ -0,0 +1,136 @@
+# cv_extractor/extractors/json_stream.py
+import json
+from typing import Any, Iterable, List, Optional, Tuple
+
+
+def parse_llm_json(text: str) -> Any:
+    """Parses a JSON answer, tolerating a surrounding ```json fence."""
+    text = text.strip()
+    if text.startswith("```"):
+        text = text.strip("`").strip()
+        if text.startswith("json"):
+            text = text[4:]
+    return json.loads(text)
+
+
+class IncrementalJsonParser:
+    """
+    Parses a JSON object as it streams in and emits the items of selected
+    top-level arrays as soon as each one is complete:
+
+        parser = IncrementalJsonParser(("work_experience", "projects"))
+        for chunk in stream:
+            for key, item in parser.feed(chunk):
+                ...
+        data = parser.result()
+
+    Only the nesting depth, string state and current key are tracked, so
+    each character is looked at once. Chunks are kept as a list rather than
+    concatenated, and only the text of the key or item being read is joined,
+    so a long answer costs linear time. Any text before the opening brace
+    (e.g. a ```json fence) is ignored.
+    """
+
+    def __init__(self, watch: Iterable[str]):
+        self.watch = set(watch)
+        self._chunks: List[str] = []
+        # The chunks from offset `_span_start` on that hold the key or item
+        # being read (offsets count from the start of the document).
+        self._span: List[str] = []
+        self._span_start = 0
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._string_start = 0
+        self._last_string: Optional[str] = None
+        self._key: Optional[str] = None
+        self._array: Optional[str] = None
+        self._item_start: Optional[int] = None
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Adds a chunk and returns the (array key, item) pairs it completed."""
+        self._chunks.append(chunk)
+        self._span.append(chunk)
+        emitted = []
+        offset = self._pos
+        for j, c in enumerate(chunk):
+            i = offset + j
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif c == "\\":
+                    self._escaped = True
+                elif c == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = self._slice(self._string_start + 1, i)
+                continue
+
+            if c == '"':
+                self._in_string = True
+                self._string_start = i
+                self._start_item(i)
+            elif c in "{[":
+                self._start_item(i)
+                self._depth += 1
+                if c == "[" and self._depth == 2 and self._key in self.watch:
+                    self._array = self._key
+            elif c in "}]":
+                if c == "]" and self._depth == 2:
+                    self._end_item(i, emitted)
+                    self._array = None
+                self._depth -= 1
+                if c == "}" and self._depth == 2 and self._array:
+                    self._end_item(i + 1, emitted)
+            elif c == "," and self._depth == 2:
+                self._end_item(i, emitted)
+            elif c == ":" and self._depth == 1:
+                self._key = self._last_string
+            elif not c.isspace() and self._depth >= 1:
+                self._start_item(i)
+        self._pos = offset + len(chunk)
+        self._trim_span()
+        return emitted
+
+    def _slice(self, start: int, end: int) -> str:
+        """The document text from `start` to `end`, copying only that part of the span."""
+        parts, pos = [], self._span_start
+        for piece in self._span:
+            if pos >= end:
+                break
+            if pos + len(piece) > start:
+                parts.append(piece[max(0, start - pos):end - pos])
+            pos += len(piece)
+        return "".join(parts)
+
+    def _trim_span(self) -> None:
+        """Drops the chunks that end before the earliest offset still needed."""
+        needed = [start for start in (self._item_start,
+                                      self._string_start if self._in_string and self._depth == 1 else None)
+                  if start is not None]
+        if not needed:
+            self._span, self._span_start = [], self._pos
+            return
+        first = min(needed)
+        while self._span and self._span_start + len(self._span[0]) <= first:
+            self._span_start += len(self._span.pop(0))
+
+    def _start_item(self, i: int) -> None:
+        if self._depth == 2 and self._array and self._item_start is None:
+            self._item_start = i
+
+    def _end_item(self, end: int, emitted: List[Tuple[str, Any]]) -> None:
+        if not self._array or self._item_start is None:
+            return
+        raw = self._slice(self._item_start, end).strip()
+        self._item_start = None
+        try:
+            emitted.append((self._array, json.loads(raw)))
+        except json.JSONDecodeError:
+            # Malformed item: it will surface (or not) in the final parse.
+            pass
+
+    def result(self) -> Any:
+        """The complete parsed document (raises if it is not valid JSON)."""
+        return parse_llm_json("".join(self._chunks))
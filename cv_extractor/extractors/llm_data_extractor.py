@@ -1,22 +1,112 @@
 # cv_extractor/extractors/llm_data_extractor.py
+import contextvars
 import json
-import google.generativeai as genai
-from ..config import GEMINI_API_KEY
-from ..models.cv_models import ExtractedCV
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from llm_backends.base_backend import BaseLlmBackend
+from llm_backends.config import CV_LLM_BACKEND, CV_LLM_MODEL
+from llm_backends.factory import get_backend
+from llm_backends.traced_backend import traced
+from ..config import CV_LLM_MODE, CV_PROMPT_MAX_TOKENS, CV_SECTION_CONCURRENCY, CV_SECTION_MODELS
+from ..models.cv_models import ExtractedCV, Project, WorkExperience
+from .json_stream import IncrementalJsonParser, parse_llm_json
+from .prompt_builder import (compact_json, compact_schema, compact_text, count_tokens, dedent, prompt_stats,
+                             report, split_text)
+from .section_splitter import has_section, split_sections
+
+# Arrays of the LLM answer emitted item by item by `extract_stream`.
+STREAMED_FIELDS = ("work_experience", "projects", "skills")
+
+# Output fields the model must not write: the CV text is already known and
+# skill evidence comes from SkillNer (see HybridManager.merge).
+OUTPUT_EXCLUDE = ("full_text", "evidence")
+
+MODE_SINGLE = "single"
+MODE_SECTIONS = "sections"
+
+# Sections mode: output field -> (CV section it is read from, item schema, task).
+SECTION_TASKS = {
+    "work_experience": ("experience", compact_schema(WorkExperience),
+                        "Extract the structured work history and infer the skills used in each position."),
+    "projects": ("projects", compact_schema(Project),
+                 "Extract the projects and infer the technologies used in each one."),
+    "skills": ("skills", {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]},
+               "Clean the NLP skill list (remove junk, typos, duplicates) and merge it with the skills "
+               "listed in the text."),
+}
+
+_section_pool: Optional[ThreadPoolExecutor] = None
+_section_pool_lock = threading.Lock()
+
+
+def _get_section_pool() -> ThreadPoolExecutor:
+    global _section_pool
+    if _section_pool is None:
+        with _section_pool_lock:
+            if _section_pool is None:
+                _section_pool = ThreadPoolExecutor(max_workers=CV_SECTION_CONCURRENCY,
+                                                   thread_name_prefix="cv-section")
+    return _section_pool
 
 
 class LlmDataExtractor:
-    def __init__(self):
-        genai.configure(api_key=GEMINI_API_KEY)
-        # You can choose between "gemini-1.5-flash" (faster) or "gemini-1.5-pro" (more accurate)
-        self.model_name = "gemini-1.5-pro"
+    # Bump whenever the prompt below changes, to invalidate cached LLM output.
+    prompt_version = "3"
 
-    def extract(self, cv_text: str, nlp_skills: list) -> dict:
-        nlp_skill_names = [skill.name for skill in nlp_skills]
-        output_schema = ExtractedCV.model_json_schema()
+    def __init__(self, mode: str = CV_LLM_MODE, section_models: Optional[Dict[str, str]] = None,
+                 backend: Optional[BaseLlmBackend] = None):
+        # Gemini by default; see llm_backends/config.py for offline backends.
+        self.backend = traced(backend or get_backend(CV_LLM_BACKEND))
+        # E.g. "gemini-1.5-flash" (faster) or "gemini-1.5-pro" (more accurate); see CV_LLM_MODEL.
+        self.model_name = CV_LLM_MODEL
+        self.mode = mode
+        self.section_models = section_models or CV_SECTION_MODELS
+
+    @property
+    def version(self) -> str:
+        """Identifies the LLM output (used as a cache key)."""
+        if self.mode == MODE_SECTIONS:
+            models = "+".join(self.section_models[field] for field in SECTION_TASKS)
+            return f"{self.backend.name}-sections-{models}-prompt{self.prompt_version}"
+        return f"{self.backend.name}-{self.model_name}-prompt{self.prompt_version}"
+
+    def _build_prompt(self, cv_text: str, nlp_skills: list) -> str:
+        """
+        Renders the prompt with compacted inputs: normalized CV text,
+        compact JSON, and an output schema without the fields the model
+        should not echo back. CVs over CV_PROMPT_MAX_TOKENS never get here
+        (see _use_sections).
+        """
+        nlp_skill_names = sorted({skill.name for skill in nlp_skills})
+        prompt = dedent(self._render(
+            compact_text(cv_text),
+            compact_json(nlp_skill_names),
+            compact_json(compact_schema(ExtractedCV, exclude=OUTPUT_EXCLUDE)),
+        ))
+        return report("cv_extraction", prompt, lambda: self._render(
+            cv_text,
+            str([skill.name for skill in nlp_skills]),
+            json.dumps(ExtractedCV.model_json_schema(), indent=2),
+        ))
 
+    def _use_sections(self, cv_text: str) -> bool:
+        """
+        Sections mode is used when configured, and for a CV whose compacted
+        text exceeds CV_PROMPT_MAX_TOKENS: its sections are extracted in
+        chunks that fit rather than being cut.
+        """
+        if self.mode == MODE_SECTIONS:
+            return True
+        if count_tokens(compact_text(cv_text)) <= CV_PROMPT_MAX_TOKENS:
+            return False
+        print("[GeminiExtractor] CV over the prompt budget, extracting it by sections")
+        return True
+
+    @staticmethod
+    def _render(cv_text: str, nlp_skill_names: str, output_schema: str) -> str:
         # --- Updated prompt for Gemini ---
-        prompt = f"""
+        return f"""
         You are an expert HR recruitment assistant. Your task is to analyze the following resume text and a list of skills found by an NLP tool.
         Your goal is to extract structured information, clean up the skill list, and infer new skills from work experience and projects.
 
@@ -34,21 +124,138 @@ class LlmDataExtractor:
         3. Clean NLP skill list (remove junk, typos, duplicates).
         4. Merge all skills (NLP + inferred).
         5. Return valid JSON following this schema exactly:
-        {json.dumps(output_schema, indent=2)}
+        {output_schema}
 
         Return only valid JSON. No extra text, comments, or explanations.
         """
 
-        model = genai.GenerativeModel(self.model_name)
-        response = model.generate_content(prompt)
+    def extract(self, cv_text: str, nlp_skills: list) -> dict:
+        if self._use_sections(cv_text):
+            result = {}
+            for event, payload in self._extract_sections(cv_text, nlp_skills):
+                if event == "result":
+                    result = payload
+            return result
+
+        response = self.backend.generate(self._build_prompt(cv_text, nlp_skills), self.model_name)
 
         try:
-            # Gemini response text
-            text = response.text.strip()
-            # Extract JSON object (Gemini sometimes wraps in markdown ```json)
-            if text.startswith("```"):
-                text = text.strip("```").replace("json", "", 1).strip()
-            return json.loads(text)
+            # Gemini response text (sometimes wrapped in markdown ```json)
+            return parse_llm_json(response)
         except Exception as e:
             print("[GeminiExtractor] Error parsing response:", e)
             return {}
+
+    def extract_stream(self, cv_text: str, nlp_skills: list) -> Iterator[Tuple[str, Any]]:
+        """
+        Streams the Gemini answer. Yields `(field, item)` for each
+        work_experience, projects or skills item as soon as it is complete,
+        then `("result", dict)` with the whole parsed answer ({} on error).
+        """
+        if self._use_sections(cv_text):
+            yield from self._extract_sections(cv_text, nlp_skills)
+            return
+
+        parser = IncrementalJsonParser(STREAMED_FIELDS)
+        for chunk in self.backend.stream(self._build_prompt(cv_text, nlp_skills), self.model_name):
+            yield from parser.feed(chunk)
+
+        try:
+            result = parser.result()
+        except Exception as e:
+            print("[GeminiExtractor] Error parsing response:", e)
+            result = {}
+        yield "result", result
+
+    # --- Sections mode ---
+
+    def _section_prompt(self, field: str, text: str, nlp_skill_names: List[str]) -> str:
+        _, item_schema, task = SECTION_TASKS[field]
+        schema = {"type": "object", "properties": {field: {"type": "array", "items": item_schema}},
+                  "required": [field]}
+        skills_hint = ""
+        if field == "skills":
+            skills_hint = f"""
+        **Skills found by NLP Tool:**
+        {compact_json(nlp_skill_names)}
+        """
+        prompt = f"""
+        You are an expert HR recruitment assistant. {task}
+
+        **Resume Text:**
+        ---
+        {text}
+        ---
+        {skills_hint}
+        Return only valid JSON following this schema exactly:
+        {compact_json(schema)}
+        """
+        return report(f"cv_section_{field}", dedent(prompt))
+
+    def _run_section(self, field: str, prompt: str) -> List[Any]:
+        response = self.backend.generate(prompt, self.section_models[field], json_output=True)
+        items = parse_llm_json(response).get(field)
+        return items if isinstance(items, list) else []
+
+    def _extract_sections(self, cv_text: str, nlp_skills: list) -> Iterator[Tuple[str, Any]]:
+        """
+        Splits the CV into sections and runs one small prompt per output
+        field concurrently, on the model configured for that field. A field
+        whose section was not found reads the whole text, and a section
+        over CV_PROMPT_MAX_TOKENS is sent in several chunks whose items are
+        concatenated. Yields the items of each field as soon as a prompt
+        returns them, then `("result", dict)`.
+
+        A failed prompt only loses its own items; skills inferred from the
+        experiences and projects are merged into the skill list.
+        """
+        text = compact_text(cv_text)
+        sections = split_sections(text)
+        nlp_skill_names = sorted({skill.name for skill in nlp_skills})
+
+        futures = {}
+        for field, (section, _, _) in SECTION_TASKS.items():
+            source = sections[section] if has_section(sections, section) else text
+            chunks = split_text(source, CV_PROMPT_MAX_TOKENS)
+            if len(chunks) > 1:
+                prompt_stats.record_split(f"cv_section_{field}", len(chunks))
+            for chunk in chunks:
+                prompt = self._section_prompt(field, chunk, nlp_skill_names)
+                # The copied context keeps each call under the request's trace.
+                futures[_get_section_pool().submit(contextvars.copy_context().run,
+                                                   self._run_section, field, prompt)] = field
+        print(f"[GeminiExtractor] Sections found: {sorted(sections) or 'none'}; "
+              f"{len(futures)} prompts sent concurrently")
+
+        result = {}
+        skills = {}
+        for future in as_completed(futures):
+            field = futures[future]
+            try:
+                items = future.result()
+            except Exception as e:
+                print(f"[GeminiExtractor] Section '{field}' failed: {e}")
+                continue
+            result.setdefault(field, [])
+            for item in items:
+                if field == "skills":
+                    # Several chunks may return the same skill.
+                    if not isinstance(item, dict) or not item.get("name") or item["name"].lower() in skills:
+                        continue
+                    skills[item["name"].lower()] = item
+                result[field].append(item)
+                yield field, item
+
+        if not result:
+            yield "result", {}
+            return
+
+        for field in ("work_experience", "projects"):
+            for item in result.get(field, []):
+                inferred = item.get("inferred_skills") if isinstance(item, dict) else None
+                for name in inferred or []:
+                    if isinstance(name, str) and name.lower() not in skills:
+                        skills[name.lower()] = {"name": name}
+                        yield "skills", skills[name.lower()]
+        result["skills"] = list(skills.values())
+        yield "result", result
@@ -1,36 +1,117 @@
 # cv_extractor/extractors/nlp_skill_extractor.py
-import spacy
+import threading
+import time
+from contextlib import contextmanager
 from spacy.matcher import PhraseMatcher
-from typing import List
-
-# Import from SkillNer
-from skillNer.skill_extractor_class import SkillExtractor as SkillNerExtractor
-from skillNer.general_params import SKILL_DB
+from typing import Dict, Iterable, List
 
 # Import our Pydantic models
 from cv_extractor.models.cv_models import Skill
 from cv_extractor.models.common import Evidence
 
 
+class _PipedNlp:
+    """
+    Stands in for the spaCy pipeline inside SkillNer: a text whose Doc was
+    computed in advance by nlp.pipe (see NlpSkillExtractor.extract_many) is
+    served from it, any other text runs through the pipeline as usual.
+    Precomputed docs are per thread, as the extractor is shared.
+    """
+
+    def __init__(self, nlp):
+        self.nlp = nlp
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        # vocab, make_doc, ... of the real pipeline.
+        return getattr(self.nlp, name)
+
+    def __call__(self, text: str):
+        docs = getattr(self._local, "docs", None)
+        if docs is not None and text in docs:
+            return docs[text]
+        return self.nlp(text)
+
+    @contextmanager
+    def serving(self, docs: Dict[str, object]):
+        self._local.docs = docs
+        try:
+            yield
+        finally:
+            self._local.docs = None
+
+
 class NlpSkillExtractor:
     """
     A wrapper for the SkillNer library to extract skills and format them
     into our Pydantic models.
     """
+    # Identifies the skill output (used as a cache key). Bump it when the
+    # spaCy model, SkillNer or the adapter logic below changes.
+    version = "skillner-en_core_web_lg-2"
 
     def __init__(self):
-        # Initializes the spaCy model and the SkillNer extractor.
-        # This setup can take a moment on first run.
-        self.nlp = spacy.load("en_core_web_lg")
-        self.skill_extractor = SkillNerExtractor(self.nlp, SKILL_DB, PhraseMatcher)
+        # Imported here: importing skillNer loads SKILL_DB (downloading it
+        # when there is no local copy), which modules that only import this
+        # one, like the pipeline, must not pay for.
+        from skillNer.skill_extractor_class import SkillExtractor as SkillNerExtractor
+        from .skill_db import load_skill_db
+        from .skillner_artifacts import load_compiled, load_pipeline
+
+        # Uses the precompiled artifacts when they exist (see
+        # skillner_artifacts.py); otherwise loads the trimmed spaCy model
+        # and compiles the SkillNer matchers, which takes a while.
+        started = time.perf_counter()
+        compiled = load_compiled()
+        if compiled is not None:
+            self.nlp, self.skill_extractor = compiled
+            source = "precompiled artifacts"
+        else:
+            self.nlp = load_pipeline()
+            self.skill_extractor = SkillNerExtractor(self.nlp, load_skill_db(), PhraseMatcher)
+            source = "compiled at startup"
+        # SkillNer (skillNer 1.0.x) calls the pipeline from the extractor and
+        # from its matchers; both go through _PipedNlp so extract_many can
+        # hand them docs computed in batches.
+        self.piped_nlp = _PipedNlp(self.nlp)
+        self.skill_extractor.nlp = self.skill_extractor.skill_getters.nlp = self.piped_nlp
+        print(f"[NlpSkillExtractor] Ready in {time.perf_counter() - started:.1f}s ({source})")
 
     def extract(self, text: str) -> List[Skill]:
         """
         Extracts skills from text using SkillNer and maps them to our
         internal Pydantic models with evidence.
         """
-        annotations = self.skill_extractor.annotate(text)
+        return self._to_skills(self.skill_extractor.annotate(text))
+
+    def extract_many(self, texts: Iterable[str], batch_size: int = 32) -> List[List[Skill]]:
+        """
+        Like extract() for several texts, with spaCy running over all of
+        them in batches (nlp.pipe) instead of one call per text.
+        """
+        from skillNer.cleaner import Cleaner
+        from skillNer.text_class import Text
+
+        texts = list(texts)
+        # SkillNer runs the pipeline on the cleaned, lowercased text (see
+        # skillNer.text_class.Text), then on its lemmed, stemmed and
+        # abbreviation forms, which depend on the first result: two batched
+        # passes cover every call.
+        cleaner = Cleaner(include_cleaning_functions=["remove_punctuation", "remove_extra_space"],
+                          to_lowercase=False)
+        cleaned = list(dict.fromkeys(cleaner(text).lower() for text in texts))
+        docs = dict(zip(cleaned, self.nlp.pipe(cleaned, batch_size=batch_size)))
+        with self.piped_nlp.serving(docs):
+            forms = []
+            for text in texts:
+                text_obj = Text(text, self.piped_nlp)
+                forms.extend((text_obj.lemmed(), text_obj.abv_text, text_obj.stemmed()))
+            forms = [form for form in dict.fromkeys(forms) if form not in docs]
+            docs.update(zip(forms, self.nlp.pipe(forms, batch_size=batch_size)))
+            return [self._to_skills(self.skill_extractor.annotate(text)) for text in texts]
 
+    @staticmethod
+    def _to_skills(annotations: dict) -> List[Skill]:
         # --- Adapter Logic ---
         # Transforms SkillNer's dictionary output into our Pydantic objects
         extracted_skills = {}
@@ -0,0 +1,159 @@
+# cv_extractor/extractors/prompt_builder.py
+import json
+import re
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type
+
+from pydantic import BaseModel
+
+from ..config import PROMPT_SAVINGS_STATS
+
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except ImportError:  # tiktoken is optional; fall back to an estimate.
+    _encoding = None
+
+
+def count_tokens(text: str) -> int:
+    """Token count of `text` (exact with tiktoken, ~4 chars/token otherwise)."""
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    return (len(text) + 3) // 4
+
+
+def compact_json(data: Any) -> str:
+    """JSON without indentation or spaces after separators."""
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def _strip_schema(node: Any, exclude: set) -> Any:
+    if isinstance(node, list):
+        return [_strip_schema(item, exclude) for item in node]
+    if not isinstance(node, dict):
+        return node
+    stripped = {}
+    for key, value in node.items():
+        if key == "title":
+            continue
+        if key == "properties":
+            value = {name: prop for name, prop in value.items() if name not in exclude}
+        elif key == "required":
+            value = [name for name in value if name not in exclude]
+        stripped[key] = _strip_schema(value, exclude)
+    return stripped
+
+
+def compact_schema(model: Type[BaseModel], exclude: Iterable[str] = ()) -> Dict[str, Any]:
+    """
+    The model's JSON schema without titles and without the properties named
+    in `exclude` (at any nesting level), e.g. fields the LLM should not echo.
+    """
+    schema = _strip_schema(model.model_json_schema(), set(exclude))
+    # Drop definitions only the excluded properties referred to.
+    definitions = schema.get("$defs", {})
+    while True:
+        body = json.dumps({**schema, "$defs": {}}) + json.dumps(definitions)
+        unused = [name for name in definitions if f'"#/$defs/{name}"' not in body]
+        if not unused:
+            break
+        for name in unused:
+            del definitions[name]
+    if "$defs" in schema and not definitions:
+        del schema["$defs"]
+    return schema
+
+
+def compact_text(text: str) -> str:
+    """Collapses runs of spaces and drops blank lines."""
+    lines = (re.sub(r"[ \t\u00a0]+", " ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def split_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Splits `text` into consecutive chunks of at most ~`max_tokens` each,
+    cutting between lines (a single longer line is cut by length).
+    """
+    if count_tokens(text) <= max_tokens:
+        return [text]
+    chunks, lines, size = [], [], 0
+    for line in text.splitlines():
+        tokens = count_tokens(line) + 1
+        if tokens > max_tokens:
+            # Too long on its own: cut into pieces of ~max_tokens.
+            width = max(1, len(line) * max_tokens // tokens)
+            pieces = [line[i:i + width] for i in range(0, len(line), width)]
+        else:
+            pieces = [line]
+        for piece in pieces:
+            tokens = count_tokens(piece) + 1
+            if lines and size + tokens > max_tokens:
+                chunks.append("\n".join(lines))
+                lines, size = [], 0
+            lines.append(piece)
+            size += tokens
+    if lines:
+        chunks.append("\n".join(lines))
+    return chunks
+
+
+def dedent(prompt: str) -> str:
+    """Strips the indentation of every line (the templates are indented f-strings)."""
+    return "\n".join(line.strip() for line in prompt.strip().splitlines())
+
+
+class PromptStats:
+    """
+    Process-wide counters per prompt name: calls, prompt tokens sent and
+    saved, and inputs over the budget that were sent in several chunks.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def record(self, name: str, baseline_tokens: int, prompt_tokens: int) -> None:
+        saved = baseline_tokens - prompt_tokens
+        with self._lock:
+            entry = self._entry(name)
+            entry["calls"] += 1
+            entry["prompt_tokens"] += prompt_tokens
+            entry["tokens_saved"] += saved
+        if not saved:
+            print(f"[Prompt] {name}: {prompt_tokens} tokens")
+            return
+        ratio = saved / baseline_tokens if baseline_tokens else 0.0
+        print(f"[Prompt] {name}: {baseline_tokens} -> {prompt_tokens} tokens ({saved} saved, {ratio:.0%})")
+
+    def record_split(self, name: str, chunks: int) -> None:
+        with self._lock:
+            self._entry(name)["split_inputs"] += 1
+        print(f"[Prompt] {name}: input over the budget, sent in {chunks} chunks")
+
+    def _entry(self, name: str) -> Dict[str, int]:
+        return self._stats.setdefault(name, {"calls": 0, "prompt_tokens": 0, "tokens_saved": 0,
+                                             "split_inputs": 0})
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {name: dict(entry) for name, entry in self._stats.items()}
+
+
+prompt_stats = PromptStats()
+
+
+def report(name: str, prompt: str, baseline: Optional[Callable[[], str]] = None) -> str:
+    """
+    Records the token count of `prompt` and returns `prompt` unchanged.
+    With PROMPT_SAVINGS_STATS, `baseline` renders the verbatim, uncompacted
+    prompt, whose token count gives the tokens saved; otherwise it is not
+    called.
+    """
+    prompt_tokens = count_tokens(prompt)
+    if PROMPT_SAVINGS_STATS and baseline is not None:
+        baseline_tokens = count_tokens(baseline())
+    else:
+        baseline_tokens = prompt_tokens
+    prompt_stats.record(name, baseline_tokens, prompt_tokens)
+    return prompt
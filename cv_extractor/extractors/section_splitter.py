@@ -0,0 +1,78 @@
+# cv_extractor/extractors/section_splitter.py
+import re
+from typing import Dict
+
+SECTION_HEADER = "header"
+
+# Heading phrases (lower-case, accents kept) announcing each section, in
+# English and French.
+SECTION_HEADINGS = {
+    "experience": (
+        "experience", "experiences", "work experience", "professional experience", "employment",
+        "employment history", "work history", "career history", "internships",
+        "expérience", "expériences", "expérience professionnelle", "expériences professionnelles", "stages",
+    ),
+    "projects": (
+        "projects", "personal projects", "academic projects", "key projects", "selected projects",
+        "projets", "projets personnels", "projets académiques",
+    ),
+    "skills": (
+        "skills", "technical skills", "core skills", "key skills", "skills & tools", "technologies",
+        "tech stack", "skills & interests", "skills and interests", "compétences", "compétences techniques",
+    ),
+    "education": (
+        "education", "academic background", "qualifications", "formation", "formations", "diplômes",
+    ),
+    # Recognized only so that they end the previous section.
+    "other": (
+        "summary", "profile", "about me", "certifications", "awards", "awards & distinctions", "languages",
+        "interests", "hobbies", "references", "profil", "langues", "centres d'intérêt", "loisirs",
+    ),
+}
+
+_HEADING_TO_SECTION = {phrase: name for name, phrases in SECTION_HEADINGS.items() for phrase in phrases}
+_MAX_HEADING_WORDS = 4
+
+
+def _heading_of(line: str):
+    """The section a line announces, or None if it is not a heading."""
+    candidate = re.sub(r"^[\W\d_]+|[\s:|•\-–—]+$", "", line.strip()).lower()
+    if not candidate or len(candidate.split()) > _MAX_HEADING_WORDS:
+        return None
+    return _HEADING_TO_SECTION.get(candidate)
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    Segments CV text into the sections of SECTION_HEADINGS using heading
+    lines (short lines made of a known heading phrase). Text before the
+    first heading goes to "header"; a section repeated in the CV is
+    concatenated. Sections that were not found are absent.
+
+    Multi-column PDFs are often extracted with all their headings next to
+    each other, so the text under a heading is not its content. When a
+    heading is directly followed by another one, the segmentation is
+    discarded and {} is returned.
+    """
+    sections: Dict[str, list] = {}
+    current = SECTION_HEADER
+    empty_heading = False
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        heading = _heading_of(line)
+        if heading:
+            if empty_heading:
+                return {}
+            current = heading
+            sections.setdefault(current, [])
+            empty_heading = True
+            continue
+        sections.setdefault(current, []).append(line)
+        empty_heading = False
+    return {name: "\n".join(lines).strip() for name, lines in sections.items()}
+
+
+def has_section(sections: Dict[str, str], name: str, min_chars: int = 80) -> bool:
+    """True when `name` was found with enough text to be trusted."""
+    return len(sections.get(name, "")) >= min_chars
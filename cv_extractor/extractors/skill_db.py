@@ -0,0 +1,32 @@
+# cv_extractor/extractors/skill_db.py
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from ..config import SKILL_DB_PATH
+
+_skill_db: Optional[Dict[str, Dict]] = None
+_skill_db_lock = threading.Lock()
+
+
+def load_skill_db() -> Dict[str, Dict]:
+    """
+    SKILL_DB (skill id -> SkillNer entry), loaded once per process.
+
+    Read from SKILL_DB_PATH when the SkillNer artifacts were built (see
+    skillner_artifacts.py), so no network access is needed. Otherwise it
+    comes from skillNer itself, which downloads it on import unless
+    skill_db_relax_20.json is in the working directory.
+    """
+    global _skill_db
+    if _skill_db is None:
+        with _skill_db_lock:
+            if _skill_db is None:
+                if os.path.exists(SKILL_DB_PATH):
+                    with open(SKILL_DB_PATH, encoding="utf-8") as f:
+                        _skill_db = json.load(f)
+                else:
+                    from skillNer.general_params import SKILL_DB
+                    _skill_db = SKILL_DB
+    return _skill_db
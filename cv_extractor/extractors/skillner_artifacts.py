@@ -0,0 +1,161 @@
+# cv_extractor/extractors/skillner_artifacts.py
+"""
+Build step and loader for precompiled SkillNer artifacts.
+
+Building SkillNer's five phrase matchers tokenizes every surface form of
+the ~30k skills of SKILL_DB, and loading the full en_core_web_lg pipeline
+reads ~600 MB of vectors into memory. The build step does this once and
+writes to SKILLNER_ARTIFACT_DIR:
+
+- pipeline/       the spaCy pipeline without the components SkillNer does
+                  not use (see EXCLUDED_COMPONENTS) and without vectors,
+- vectors/        the vector table, memory-mapped at load time,
+- matchers.msgpack  the token hashes of every matcher pattern,
+- skill_db.json   a copy of SKILL_DB, read by load_skill_db() so the
+                  skill canonicalization needs no download (SKILL_DB_PATH),
+- manifest.json   what the artifacts were built from.
+
+    python -m cv_extractor.extractors.skillner_artifacts [--output DIR] [--model NAME]
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import time
+from typing import Dict, Optional, Tuple
+
+import numpy
+import spacy
+import srsly
+from spacy.language import Language
+from spacy.matcher import PhraseMatcher
+from spacy.vectors import Vectors
+
+from skillNer.general_params import SKILL_DB
+from skillNer.matcher_class import SkillsGetter
+from skillNer.skill_extractor_class import SkillExtractor as SkillNerExtractor
+from skillNer.utils import Utils
+
+from ..config import SKILLNER_ARTIFACT_DIR, SPACY_MODEL
+
+# SkillNer reads token text, lemmas (tagger + attribute_ruler + lemmatizer),
+# stop words and vectors. The dependency parser and the entity recognizer
+# only cost load time and memory.
+EXCLUDED_COMPONENTS = ("parser", "ner", "senter")
+
+# Bump when the layout of the artifacts changes.
+FORMAT_VERSION = 1
+
+
+def load_pipeline(model: str = SPACY_MODEL) -> Language:
+    """The spaCy pipeline SkillNer needs, without the unused components."""
+    return spacy.load(model, exclude=list(EXCLUDED_COMPONENTS))
+
+
+def _expected_manifest(model: str) -> Dict[str, object]:
+    return {"format": FORMAT_VERSION, "model": model, "spacy": spacy.__version__, "skills": len(SKILL_DB)}
+
+
+def _assemble(nlp: Language, matchers: Dict[str, PhraseMatcher]) -> SkillNerExtractor:
+    """
+    A SkillNer extractor around prebuilt matchers. Mirrors
+    SkillExtractor.__init__ (skillNer 1.0.x), which would compile them again.
+    """
+    extractor = SkillNerExtractor.__new__(SkillNerExtractor)
+    extractor.tranlsator_func = False
+    extractor.nlp = nlp
+    extractor.skills_db = SKILL_DB
+    extractor.phraseMatcher = PhraseMatcher
+    extractor.matchers = matchers
+    extractor.skill_getters = SkillsGetter(nlp)
+    extractor.utils = Utils(nlp, SKILL_DB)
+    return extractor
+
+
+def build(output_dir: str = SKILLNER_ARTIFACT_DIR, model: str = SPACY_MODEL) -> Dict[str, object]:
+    """Compiles the matchers and writes the artifacts; returns the manifest."""
+    started = time.perf_counter()
+    nlp = load_pipeline(model)
+    extractor = SkillNerExtractor(nlp, SKILL_DB, PhraseMatcher)
+
+    matchers = {}
+    for name, matcher in extractor.matchers.items():
+        # The pickling state of a PhraseMatcher: its patterns as tuples of
+        # token attribute hashes, keyed by skill id.
+        _, patterns, _, attr = matcher.__reduce__()[1]
+        matchers[name] = {
+            "attr": attr,
+            "patterns": {key: [list(p) for p in specs] for key, specs in patterns.items()},
+        }
+
+    # Written next to the target and swapped in at the end, so a running
+    # app never loads half-written artifacts.
+    staging = output_dir.rstrip(os.sep) + ".tmp"
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+    nlp.to_disk(os.path.join(staging, "pipeline"), exclude=["vectors"])
+    nlp.vocab.vectors.to_disk(os.path.join(staging, "vectors"))
+    srsly.write_msgpack(os.path.join(staging, "matchers.msgpack"), {"matchers": matchers})
+    srsly.write_json(os.path.join(staging, "skill_db.json"), SKILL_DB)
+    manifest = {**_expected_manifest(model), "pipeline": nlp.pipe_names,
+                "excluded": list(EXCLUDED_COMPONENTS), "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "build_seconds": round(time.perf_counter() - started, 2)}
+    srsly.write_json(os.path.join(staging, "manifest.json"), manifest)
+
+    shutil.rmtree(output_dir, ignore_errors=True)
+    os.replace(staging, output_dir)
+    return manifest
+
+
+def _load_vectors(path: str, nlp: Language) -> Vectors:
+    """
+    The vector table memory-mapped read-only: pages are read on first use
+    and shared by every process loading the same file.
+    """
+    data = numpy.load(os.path.join(path, "vectors"), mmap_mode="r")
+    vectors = Vectors(strings=nlp.vocab.strings, data=data)
+    vectors.from_disk(path, exclude=["vectors"])
+    return vectors
+
+
+def load_compiled(artifact_dir: str = SKILLNER_ARTIFACT_DIR,
+                  model: str = SPACY_MODEL) -> Optional[Tuple[Language, SkillNerExtractor]]:
+    """
+    Loads the artifacts written by `build`. Returns None when they are
+    missing, or were built from another model, spaCy version or SKILL_DB.
+    """
+    manifest_path = os.path.join(artifact_dir, "manifest.json")
+    if not os.path.exists(manifest_path):
+        return None
+    manifest = srsly.read_json(manifest_path)
+    stale = {key: manifest.get(key) for key, value in _expected_manifest(model).items() if manifest.get(key) != value}
+    if stale:
+        print(f"[SkillNer] Ignoring stale artifacts in {artifact_dir}: {stale}")
+        return None
+
+    nlp = spacy.load(os.path.join(artifact_dir, "pipeline"))
+    nlp.vocab.vectors = _load_vectors(os.path.join(artifact_dir, "vectors"), nlp)
+
+    matchers = {}
+    for name, spec in srsly.read_msgpack(os.path.join(artifact_dir, "matchers.msgpack"))["matchers"].items():
+        matcher = PhraseMatcher(nlp.vocab, attr=spec["attr"])
+        for key, patterns in spec["patterns"].items():
+            matcher.add(key, patterns)
+        matchers[name] = matcher
+    return nlp, _assemble(nlp, matchers)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Precompile the SkillNer matchers and the trimmed spaCy pipeline.")
+    parser.add_argument("--output", default=SKILLNER_ARTIFACT_DIR, help="Artifact directory.")
+    parser.add_argument("--model", default=SPACY_MODEL, help="spaCy model name or path.")
+    args = parser.parse_args(argv)
+
+    manifest = build(args.output, args.model)
+    print(json.dumps(manifest, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,4 +38,14 @@ class ExtractedCV(BaseModel):
     skills: List[Skill] = Field(description="A list of all skills identified in the CV.")
     work_experience: List[WorkExperience] = Field(default=[])
     # --- ADDED FIELD ---
-    projects: List[Project] = Field(default=[])
\ No newline at end of file
+    projects: List[Project] = Field(default=[])
+
+
+class BatchExtractionResult(BaseModel):
+    """
+    The outcome of one file in a batch extraction run. Exactly one of
+    `cv` or `error` is set.
+    """
+    file_path: str
+    cv: Optional[ExtractedCV] = None
+    error: Optional[str] = None
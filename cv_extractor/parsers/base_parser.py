@@ -1,9 +1,23 @@
 # cv_extractor/parsers/base_parser.py
 from abc import ABC, abstractmethod
+from typing import BinaryIO, Iterator, Union
+
+# What a parser accepts: a file path, the file's bytes, or a binary file object.
+Source = Union[str, bytes, BinaryIO]
+
 
 class BaseParser(ABC):
     """Abstract base class for all file parsers."""
+    # Identifies the text produced by a parser (used as a cache key).
+    version = "1"
+    # Placed between the chunks of `iter_text` by `get_text`.
+    separator = ""
+
     @abstractmethod
-    def get_text(self, file_path: str) -> str:
+    def iter_text(self, source: Source) -> Iterator[str]:
+        """Yields the text of a file chunk by chunk (page, paragraph, table row...)."""
+        pass
+
+    def get_text(self, source: Source) -> str:
         """Extracts plain text from a given file."""
-        pass
\ No newline at end of file
+        return self.separator.join(self.iter_text(source))
@@ -1,9 +1,72 @@
 # cv_extractor/parsers/docx_parser.py
+import io
+from typing import Iterator
+
 import docx
-from .base_parser import BaseParser
+from docx.oxml.ns import qn
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+from .base_parser import BaseParser, Source
+
+# Text boxes appear twice in a DOCX: as DrawingML and as a VML fallback for
+# old readers. Only the first copy is read.
+_TEXT_BOXES = ".//*[local-name()='txbxContent'][not(ancestor::*[local-name()='Fallback'])]"
+
 
 class DocxParser(BaseParser):
-    """Parses plain text from DOCX files."""
-    def get_text(self, file_path: str) -> str:
-        doc = docx.Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
+    """Parses plain text from DOCX files: body, tables, text boxes, headers and footers."""
+    # Bump when the extracted text changes, to invalidate cached text.
+    version = "python-docx-2"
+    separator = "\n"
+
+    def iter_text(self, source: Source) -> Iterator[str]:
+        """
+        Yields one chunk per non-empty paragraph or table row, in document
+        order: headers first (contact details often live there), then the
+        body, then footers. Text boxes follow the paragraph anchoring them;
+        the cells of a row are joined with " | ".
+        """
+        doc = docx.Document(io.BytesIO(source) if isinstance(source, bytes) else source)
+        yield from self._iter_parts(doc, ("first_page_header", "header", "even_page_header"))
+        yield from self._iter_blocks(doc.element.body, doc)
+        yield from self._iter_parts(doc, ("first_page_footer", "footer", "even_page_footer"))
+
+    def _iter_parts(self, doc, names) -> Iterator[str]:
+        """Headers or footers of every section, each distinct text once."""
+        seen = set()
+        for section in doc.sections:
+            for name in names:
+                part = getattr(section, name)
+                if part.is_linked_to_previous:
+                    continue
+                for text in self._iter_blocks(part._element, part):
+                    if text not in seen:
+                        seen.add(text)
+                        yield text
+
+    def _iter_blocks(self, element, parent) -> Iterator[str]:
+        for child in element.iterchildren():
+            if child.tag == qn("w:p"):
+                text = Paragraph(child, parent).text.strip()
+                if text:
+                    yield text
+                for box in child.xpath(_TEXT_BOXES):
+                    yield from self._iter_blocks(box, parent)
+            elif child.tag == qn("w:tbl"):
+                yield from self._iter_table(Table(child, parent))
+            elif child.tag == qn("w:sdt"):
+                # Content controls wrap ordinary paragraphs and tables.
+                for content in child.iterchildren(qn("w:sdtContent")):
+                    yield from self._iter_blocks(content, parent)
+
+    def _iter_table(self, table: Table) -> Iterator[str]:
+        for row in table.rows:
+            cells = []
+            for cell in row.cells:
+                text = " ".join(self._iter_blocks(cell._tc, cell))
+                # A merged cell is returned once per grid column it spans.
+                if text and (not cells or cells[-1] != text):
+                    cells.append(text)
+            if cells:
+                yield " | ".join(cells)
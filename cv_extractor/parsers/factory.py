@@ -1,21 +1,64 @@
 # cv_extractor/parsers/factory.py
-import os
-from typing import Type
-from .base_parser import BaseParser
+import io
+import zipfile
+from typing import Optional
+from .base_parser import BaseParser, Source
 from .pdf_parser import PdfParser
 from .docx_parser import DocxParser
 
+FORMAT_PDF = "pdf"
+FORMAT_DOCX = "docx"
 
-def get_parser(file_path: str) -> BaseParser:
+# The PDF header may be preceded by junk bytes; readers look for it in the
+# first kilobyte.
+_SNIFF_BYTES = 1024
+
+
+def _head(source: Source) -> bytes:
+    if isinstance(source, str):
+        with open(source, "rb") as f:
+            return f.read(_SNIFF_BYTES)
+    if isinstance(source, bytes):
+        return source[:_SNIFF_BYTES]
+    position = source.tell()
+    head = source.read(_SNIFF_BYTES)
+    source.seek(position)
+    return head
+
+
+def _is_docx(source: Source) -> bool:
+    """A ZIP package containing a Word main document."""
+    position = None if isinstance(source, (str, bytes)) else source.tell()
+    try:
+        with zipfile.ZipFile(io.BytesIO(source) if isinstance(source, bytes) else source) as package:
+            return "word/document.xml" in package.namelist()
+    except zipfile.BadZipFile:
+        return False
+    finally:
+        if position is not None:
+            source.seek(position)
+
+
+def sniff_format(source: Source) -> Optional[str]:
+    """FORMAT_PDF or FORMAT_DOCX from the file's content, or None."""
+    head = _head(source)
+    if b"%PDF-" in head:
+        return FORMAT_PDF
+    if head.startswith(b"PK\x03\x04") and _is_docx(source):
+        return FORMAT_DOCX
+    return None
+
+
+def get_parser(source: Source) -> BaseParser:
     """
-    Factory function to get the correct parser based on file extension.
+    Factory function to get the correct parser from the file's content
+    (magic bytes), so neither the file name nor its extension matter.
+    `source` is a path, the file's bytes or a seekable binary file.
     """
-    _, extension = os.path.splitext(file_path)
-    extension = extension.lower()
-
-    if extension == ".pdf":
+    file_format = sniff_format(source)
+    if file_format == FORMAT_PDF:
         return PdfParser()
-    elif extension == ".docx":
+    elif file_format == FORMAT_DOCX:
         return DocxParser()
     else:
-        raise ValueError(f"Unsupported file type: {extension}")
\ No newline at end of file
+        raise ValueError("Unsupported file type: expected a PDF or DOCX document")
@@ -1,12 +1,89 @@
 # cv_extractor/parsers/pdf_parser.py
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional, Union
+
 import fitz  # PyMuPDF
-from .base_parser import BaseParser
+
+from ..config import PDF_PARALLEL_MIN_PAGES, PDF_WORKERS
+from .base_parser import BaseParser, Source
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                # MuPDF serializes calls within a process, so pages are
+                # parsed in parallel by processes rather than threads.
+                # Workers come from a fork server rather than being forked
+                # from this multithreaded process (a child could inherit a
+                # lock held by another thread); the server imports this
+                # module once, so workers start without re-importing it.
+                context = multiprocessing.get_context("forkserver")
+                context.set_forkserver_preload([__name__])
+                _pool = ProcessPoolExecutor(max_workers=PDF_WORKERS, mp_context=context)
+    return _pool
+
+
+def _open(source: Union[str, bytes]) -> fitz.Document:
+    if isinstance(source, str):
+        return fitz.open(source)
+    return fitz.open(stream=source, filetype="pdf")
+
+
+def _extract_pages(source: Union[str, bytes], start: int, stop: int) -> List[str]:
+    """Worker task: the text of pages [start, stop)."""
+    with _open(source) as doc:
+        return [doc[i].get_text() for i in range(start, stop)]
+
 
 class PdfParser(BaseParser):
     """Parses plain text from PDF files."""
-    def get_text(self, file_path: str) -> str:
-        doc = fitz.open(file_path)
-        text = ""
-        for page in doc:
-            text += page.get_text()
-        return text
\ No newline at end of file
+    # Bump when the extracted text changes, to invalidate cached text.
+    version = "pymupdf-1"
+
+    def iter_text(self, source: Source) -> Iterator[str]:
+        """
+        Yields the text of each page, in order. Documents of at least
+        PDF_PARALLEL_MIN_PAGES pages are split into one page range per
+        worker process; the pages of a range are yielded as soon as it and
+        the ranges before it are done.
+        """
+        if not isinstance(source, (str, bytes)):
+            # A file object is read once.
+            source = bytes(source.read())
+        with _open(source) as doc:
+            page_count = doc.page_count
+            if page_count < PDF_PARALLEL_MIN_PAGES or PDF_WORKERS < 2:
+                for page in doc:
+                    yield page.get_text()
+                return
+
+        # Workers get a path: in-memory bytes are written to a temporary
+        # file once instead of being pickled to every worker.
+        path, temporary = source, None
+        if isinstance(source, bytes):
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as f:
+                f.write(source)
+            path = temporary = f.name
+
+        per_worker = math.ceil(page_count / PDF_WORKERS)
+        futures = []
+        try:
+            futures = [_get_pool().submit(_extract_pages, path, start, min(start + per_worker, page_count))
+                       for start in range(0, page_count, per_worker)]
+            for future in futures:
+                yield from future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+            if temporary is not None:
+                os.remove(temporary)
@@ -1,12 +1,93 @@
 # cv_extractor/pipeline.py
-from .models.cv_models import ExtractedCV
+from typing import Any, Callable, Iterator, List, Optional, Tuple, Union
+
+from observability.tracing import span
+
+from .cache import TIER_LLM, TIER_NLP, TIER_TEXT, ExtractionCache, file_sha256, get_cache
+from .extractors.hybrid_manager import HybridManager
+from .extractors.llm_data_extractor import STREAMED_FIELDS
+from .extractors.nlp_skill_extractor import NlpSkillExtractor
+from .models.cv_models import ExtractedCV, Skill
+from .parsers.base_parser import Source
 from .parsers.factory import get_parser
-# from .extractors.nlp_skill_extractor import NlpSkillExtractor
-from .extractors.hybrid_manager import HybridManager # Import the new manager
+from .registry import registry
+
+
+def _cached_stage(cache: Optional[ExtractionCache], file_hash: Optional[str],
+                  tier: str, version: str, compute: Callable[[], Any]) -> Any:
+    """Runs one pipeline stage through the extraction cache, if enabled."""
+    if cache is None:
+        return compute()
+    return cache.get_or_compute(file_hash, tier, version, compute)
+
+
+def _text_version(component_version: str, full_text: str) -> str:
+    """
+    Cache version of a stage that reads the parsed text: the component's
+    own version plus a digest of the text, so a parser change that alters
+    the text (e.g. tables read by a newer DocxParser) also invalidates the
+    NLP and LLM results computed from it.
+    """
+    return f"{component_version}:{file_sha256(full_text.encode('utf-8'))[:16]}"
+
+
+def _load(source: Source) -> Union[str, bytes]:
+    """A path or the file's bytes (a file object is read once)."""
+    return source if isinstance(source, (str, bytes)) else source.read()
+
+
+def _hash_file(source: Union[str, bytes]) -> Optional[str]:
+    """Content address of the file, or None when caching is disabled."""
+    if get_cache() is None:
+        return None
+    if isinstance(source, bytes):
+        return file_sha256(source)
+    with open(source, "rb") as f:
+        return file_sha256(f.read())
+
+
+def _parse_text(source: Union[str, bytes], file_hash: Optional[str]) -> str:
+    """Stage 1: text extraction."""
+    print("1. Parsing document...")
+    parser = get_parser(source)
+    with span("parse", parser=parser.__class__.__name__):
+        return _cached_stage(
+            get_cache(), file_hash, TIER_TEXT, parser.version,
+            lambda: parser.get_text(source),
+        )
 
 
+def _parse_and_tag(source: Union[str, bytes], file_hash: Optional[str]) -> Tuple[str, List[Skill]]:
+    """Stages 1 and 2a: text extraction and SkillNer."""
+    cache = get_cache()
+    full_text = _parse_text(source, file_hash)
 
-def extract_cv_data(file_path: str) -> ExtractedCV:
+    # Extractors come from the process-wide registry, so spaCy and SkillNer
+    # are only loaded on the first call (and not at all on a cache hit).
+    print("2a. Running NLP skill extraction...")
+    with span("nlp"):
+        skill_dicts = _cached_stage(
+            cache, file_hash, TIER_NLP, _text_version(NlpSkillExtractor.version, full_text),
+            lambda: [s.model_dump() for s in registry.get("nlp_skill_extractor").extract(full_text)],
+        )
+    return full_text, [Skill(**s) for s in skill_dicts]
+
+
+def _run_llm(full_text: str, nlp_skills: List[Skill], file_hash: Optional[str]) -> ExtractedCV:
+    """Stage 2b and 3: LLM extraction and merge with the NLP skills."""
+    print("2b. Running LLM for verification and contextual extraction...")
+    llm_extractor = registry.get("llm_data_extractor")
+    with span("llm_extraction"):
+        llm_output = _cached_stage(
+            get_cache(), file_hash, TIER_LLM, _text_version(llm_extractor.version, full_text),
+            lambda: llm_extractor.extract(full_text, nlp_skills),
+        )
+
+    print("3. Finalizing structured output...")
+    return HybridManager.merge(full_text, nlp_skills, llm_output)
+
+
+def extract_cv_data(source: Source) -> ExtractedCV:
     """
     The main orchestration function.
 
@@ -15,19 +96,57 @@ def extract_cv_data(file_path: str) -> ExtractedCV:
     3. Uses the NLP extractor to find skills with evidence.
     4. Populates and returns a structured ExtractedCV object.
 
+    Each stage result is cached by the SHA-256 of the file content (see
+    cv_extractor/cache.py), so re-uploading the same CV skips parsing,
+    SkillNer and the LLM call entirely.
+
     Args:
-        file_path (str): The path to the CV file (PDF or DOCX).
+        source: The CV file (PDF or DOCX) as a path, its bytes or a
+            binary file object; the format is detected from the content.
 
     Returns:
         ExtractedCV: A Pydantic model containing the extracted data.
     """
-    print("1. Parsing document...")
-    parser = get_parser(file_path)
-    full_text = parser.get_text(file_path)
+    source = _load(source)
+    file_hash = _hash_file(source)
+    full_text, nlp_skills = _parse_and_tag(source, file_hash)
+    return _run_llm(full_text, nlp_skills, file_hash)
 
-    # The manager now handles the entire extraction process
-    manager = HybridManager()
-    cv_data = manager.extract(full_text)
 
-    print("3. Finalizing structured output...")
-    return cv_data
\ No newline at end of file
+def extract_cv_data_stream(source: Source) -> Iterator[Tuple[str, Any]]:
+    """
+    Streaming variant of `extract_cv_data`. Yields:
+
+    - `("stage", name)` when a stage starts ("parsing", "llm"),
+    - `("nlp_skills", [skill names])` once SkillNer is done,
+    - `(field, item)` for each work_experience / projects / skills item
+      as soon as the LLM has finished writing it,
+    - `("cv", ExtractedCV)` last.
+
+    A cached LLM answer is replayed item by item without calling the model.
+    """
+    source = _load(source)
+    file_hash = _hash_file(source)
+    yield "stage", "parsing"
+    full_text, nlp_skills = _parse_and_tag(source, file_hash)
+    yield "nlp_skills", [skill.name for skill in nlp_skills]
+
+    yield "stage", "llm"
+    cache = get_cache()
+    llm_extractor = registry.get("llm_data_extractor")
+    llm_version = _text_version(llm_extractor.version, full_text)
+    llm_output = cache.get(file_hash, TIER_LLM, llm_version) if cache else None
+    if llm_output is not None:
+        for field in STREAMED_FIELDS:
+            for item in llm_output.get(field) or []:
+                yield field, item
+    else:
+        for event, payload in llm_extractor.extract_stream(full_text, nlp_skills):
+            if event == "result":
+                llm_output = payload
+            else:
+                yield event, payload
+        if cache and llm_output:
+            cache.put(file_hash, TIER_LLM, llm_version, llm_output)
+
+    yield "cv", HybridManager.merge(full_text, nlp_skills, llm_output)
@@ -0,0 +1,115 @@
+# cv_extractor/registry.py
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+
+class ModelRegistry:
+    """
+    A process-wide registry of heavy, read-only models (spaCy pipelines,
+    SkillNer matchers, LLM clients...).
+
+    Each model is built at most once per process, either lazily on first
+    access or eagerly through `warm_up()`. The loaded objects are shared by
+    all request threads and background jobs, so they must not be mutated
+    after construction.
+    """
+
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._errors: Dict[str, str] = {}
+        # One lock per model so a slow spaCy load does not block the
+        # (cheap) LLM client construction, and vice versa.
+        self._locks: Dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Registers a zero-argument factory used to build the model `name`."""
+        with self._registry_lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+
+    def get(self, name: str) -> Any:
+        """
+        Returns the shared instance for `name`, building it on first use.
+        Concurrent callers wait for the first load instead of starting
+        their own.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        if name not in self._factories:
+            raise KeyError(f"No model registered under '{name}'")
+
+        with self._locks[name]:
+            # Another thread may have finished the load while we waited.
+            instance = self._instances.get(name)
+            if instance is None:
+                print(f"[ModelRegistry] Loading '{name}'...")
+                try:
+                    instance = self._factories[name]()
+                except Exception as e:
+                    self._errors[name] = str(e)
+                    raise
+                self._instances[name] = instance
+                self._errors.pop(name, None)
+                print(f"[ModelRegistry] '{name}' ready.")
+        return instance
+
+    def warm_up(self, names: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """
+        Eagerly loads the given models (all registered ones by default).
+        Errors are recorded rather than raised so that a missing API key
+        does not prevent the app from starting; see `status()`.
+        """
+        for name in list(names or self._factories):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"[ModelRegistry] Failed to load '{name}': {e}")
+        return self.status()
+
+    def is_ready(self, names: Optional[Iterable[str]] = None) -> bool:
+        """True when every requested model (all by default) is loaded."""
+        return all(name in self._instances for name in (names or self._factories))
+
+    def status(self) -> Dict[str, str]:
+        """Maps each registered model to 'ready', 'loading', 'error: ...' or 'not_loaded'."""
+        result = {}
+        for name in self._factories:
+            if name in self._instances:
+                result[name] = "ready"
+            elif name in self._errors:
+                result[name] = f"error: {self._errors[name]}"
+            elif self._locks[name].locked():
+                result[name] = "loading"
+            else:
+                result[name] = "not_loaded"
+        return result
+
+
+def _build_nlp_skill_extractor():
+    from .extractors.nlp_skill_extractor import NlpSkillExtractor
+    return NlpSkillExtractor()
+
+
+def _build_llm_data_extractor():
+    from .extractors.llm_data_extractor import LlmDataExtractor
+    return LlmDataExtractor()
+
+
+# The single registry shared by the whole process.
+registry = ModelRegistry()
+registry.register("nlp_skill_extractor", _build_nlp_skill_extractor)
+registry.register("llm_data_extractor", _build_llm_data_extractor)
+
+
+def warm_up_models() -> Dict[str, str]:
+    """Loads all CV extraction models up-front (e.g. at app start)."""
+    return registry.warm_up()
+
+
+def models_ready() -> bool:
+    """Readiness check: True once every CV extraction model is loaded."""
+    return registry.is_ready()
@@ -0,0 +1,125 @@
+# cv_extractor/uploads.py
+import os
+import tempfile
+import threading
+import time
+import uuid
+from typing import BinaryIO
+
+from .cache import file_sha256
+from .config import UPLOAD_DIR, UPLOAD_JOB_DIR, UPLOAD_JOB_MAX_AGE, UPLOAD_MAX_BYTES
+from .parsers.factory import sniff_format
+
+_CHUNK_SIZE = 64 * 1024
+
+# Orphaned staged files are looked for at most this often (see stage_upload).
+_SWEEP_INTERVAL = 60
+_last_sweep = 0.0
+_sweep_lock = threading.Lock()
+
+
+class UploadTooLargeError(ValueError):
+    """Raised when an upload exceeds UPLOAD_MAX_BYTES."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"File too large (limit: {round(max_bytes / (1024 * 1024), 1):g} MB)")
+        self.max_bytes = max_bytes
+
+
+def read_upload(stream: BinaryIO, max_bytes: int = UPLOAD_MAX_BYTES) -> bytes:
+    """
+    Reads an uploaded file into memory chunk by chunk, giving up as soon
+    as it grows past `max_bytes`.
+    """
+    chunks, size = [], 0
+    while True:
+        chunk = stream.read(_CHUNK_SIZE)
+        if not chunk:
+            return b"".join(chunks)
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLargeError(max_bytes)
+        chunks.append(chunk)
+
+
+def _write(path: str, data: bytes) -> None:
+    """Writes under a temporary name, then renames, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def persist_upload(data: bytes, directory: str = UPLOAD_DIR) -> str:
+    """
+    Stores `data` as <sha256>.<format> in `directory` and returns the path.
+    Identical uploads share one file, and a file is written under a
+    temporary name and then renamed, so concurrent uploads never see a
+    partial file.
+    """
+    path = os.path.join(directory, f"{file_sha256(data)}.{sniff_format(data) or 'bin'}")
+    if not os.path.exists(path):
+        _write(path, data)
+    return path
+
+
+def stage_upload(data: bytes, directory: str = UPLOAD_JOB_DIR) -> str:
+    """
+    Stores `data` for one asynchronous job and returns the path. Each call
+    gets its own file, so `discard_upload` never removes a file another
+    job still needs.
+    """
+    path = os.path.join(directory, f"{uuid.uuid4().hex}.{sniff_format(data) or 'bin'}")
+    _write(path, data)
+    _maybe_sweep(directory)
+    return path
+
+
+def sweep_uploads(directory: str = UPLOAD_JOB_DIR, max_age: float = UPLOAD_JOB_MAX_AGE) -> int:
+    """
+    Deletes staged files older than `max_age` seconds, left behind by jobs
+    lost before their cleanup ran, and returns how many were removed.
+    """
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return 0
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    if removed:
+        print(f"[Uploads] Removed {removed} orphaned staged file(s).")
+    return removed
+
+
+def _maybe_sweep(directory: str) -> None:
+    global _last_sweep
+    now = time.monotonic()
+    if now - _last_sweep < _SWEEP_INTERVAL or not _sweep_lock.acquire(blocking=False):
+        return
+    try:
+        _last_sweep = now
+        sweep_uploads(directory)
+    finally:
+        _sweep_lock.release()
+
+
+def discard_upload(path: str) -> None:
+    """Deletes a staged upload (already deleted is fine)."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
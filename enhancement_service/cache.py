@@ -0,0 +1,166 @@
+# enhancement_service/cache.py
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from storage.sqlite import SQLiteDatabase
+from unification_service.models import UnifiedProfile
+
+from .config import (ENHANCEMENT_CACHE_ENABLED, ENHANCEMENT_CACHE_MAX_BYTES, ENHANCEMENT_CACHE_PATH,
+                     ENHANCEMENT_CACHE_TTL_SECONDS)
+
+# A hit refreshes the entry's LRU position at most this often, so hot
+# entries are not rewritten on every read.
+_TOUCH_INTERVAL = 60
+
+# Fields that do not change the enhancement: the id, and the raw sources
+# (only their unified mapping is sent to the LLM).
+VOLATILE_FIELDS = {"profile_id", "source_data"}
+
+# Kinds of lookup, counted separately: whole enhanced profiles and single
+# enhanced fields (see EnhancementCache.get).
+LOOKUP_PROFILE = "profile"
+LOOKUP_FIELD = "field"
+LOOKUPS = (LOOKUP_PROFILE, LOOKUP_FIELD)
+
+
+def content_key(content: Any, *context: str) -> str:
+    """SHA-256 of `content` in canonical JSON (sorted keys), with `context` (backend, model, ...)."""
+    payload = json.dumps(content, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256("\n".join((*context, payload)).encode("utf-8")).hexdigest()
+
+
+def profile_key(profile: UnifiedProfile, backend: str, model: str, prompt_version: str) -> str:
+    """
+    Key of a whole-profile enhancement: the profile content without its
+    volatile fields, with the backend, model and prompt version that would
+    enhance it. Two candidates with identical content share a key.
+    """
+    return content_key(profile.model_dump(exclude=VOLATILE_FIELDS), backend, model, prompt_version)
+
+
+class EnhancementCache:
+    """
+    A persistent cache of LLM enhancements, stored in SQLite so it survives
+    restarts and is shared between worker processes. Entries expire after
+    `ttl` seconds and the least recently used ones are evicted beyond
+    `max_bytes`.
+
+    Values are JSON documents: whole enhanced profiles without their
+    volatile fields (keyed by `profile_key`), or single enhanced fields.
+    Hit/miss counters are kept per kind of lookup for the current process.
+    """
+
+    def __init__(self, path: str = ENHANCEMENT_CACHE_PATH, max_bytes: int = ENHANCEMENT_CACHE_MAX_BYTES,
+                 ttl: int = ENHANCEMENT_CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hits = {kind: 0 for kind in LOOKUPS}
+        self._misses = {kind: 0 for kind in LOOKUPS}
+
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS enhancements (
+                key         TEXT PRIMARY KEY,
+                value       TEXT NOT NULL,
+                size        INTEGER NOT NULL,
+                created_at  REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_enhancements_last_access ON enhancements (last_access)",
+        ])
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl) and created_at < now - self.ttl
+
+    def get(self, key: str, kind: str = LOOKUP_PROFILE) -> Optional[Any]:
+        """Returns the cached value, or None on a miss, counted under `kind`."""
+        now = time.time()
+        with self.db.connect() as conn:
+            row = conn.execute(
+                "SELECT value, created_at, last_access FROM enhancements WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None and self._expired(row[1], now):
+                conn.execute("DELETE FROM enhancements WHERE key = ?", (key,))
+                row = None
+            if row is not None and row[2] < now - _TOUCH_INTERVAL:
+                conn.execute("UPDATE enhancements SET last_access = ? WHERE key = ?", (now, key))
+
+        with self._lock:
+            if row is None:
+                self._misses[kind] += 1
+                return None
+            self._hits[kind] += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Any) -> None:
+        """Stores a value, then evicts expired and least-recently-used entries."""
+        payload = json.dumps(value, ensure_ascii=False)
+        size = len(payload.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+
+        now = time.time()
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO enhancements (key, value, size, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, payload, size, now, now),
+            )
+            self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl:
+            conn.execute("DELETE FROM enhancements WHERE created_at < ?", (now - self.ttl,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM enhancements").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM enhancements ORDER BY last_access ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM enhancements WHERE key = ?", to_delete)
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-kind hit/miss counters for this process, plus the on-disk footprint."""
+        with self.db.connect() as conn:
+            entries, size = conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM enhancements"
+            ).fetchone()
+        with self._lock:
+            lookups = {
+                kind: {
+                    "hits": self._hits[kind],
+                    "misses": self._misses[kind],
+                    "hit_rate": (self._hits[kind] / (self._hits[kind] + self._misses[kind])
+                                 if self._hits[kind] + self._misses[kind] else 0.0),
+                }
+                for kind in LOOKUPS
+            }
+        return {"entries": entries, "size_bytes": size, "max_bytes": self.max_bytes, "lookups": lookups}
+
+
+_cache: Optional[EnhancementCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_enhancement_cache() -> Optional[EnhancementCache]:
+    """Returns the process-wide cache, or None when caching is disabled."""
+    global _cache
+    if not ENHANCEMENT_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = EnhancementCache()
+    return _cache
+
@@ -0,0 +1,25 @@
+# enhancement_service/config.py
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# --- Enhancement cache (see cache.py) ---
+# Set ENHANCEMENT_CACHE_ENABLED=0 to call the LLM for every enhancement.
+ENHANCEMENT_CACHE_ENABLED = os.getenv("ENHANCEMENT_CACHE_ENABLED", "1") == "1"
+ENHANCEMENT_CACHE_PATH = os.getenv("ENHANCEMENT_CACHE_PATH", os.path.join("instance", "enhancement_cache.db"))
+# Least recently used entries are evicted beyond this size.
+ENHANCEMENT_CACHE_MAX_BYTES = int(os.getenv("ENHANCEMENT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+# Entries older than this are enhanced again (0 keeps them forever).
+ENHANCEMENT_CACHE_TTL_SECONDS = int(os.getenv("ENHANCEMENT_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+
+# --- Enhancement mode ---
+# "profile": one prompt rewrites the whole profile. "fields": the summary
+# and each experience and project description are rewritten by small
+# concurrent prompts, and only those whose input changed since they were
+# last enhanced (see ProfileEnhancer.enhance).
+ENHANCEMENT_MODE = os.getenv("ENHANCEMENT_MODE", "profile")
+ENHANCER_FIELD_MODEL = os.getenv("ENHANCER_FIELD_MODEL", "gpt-4o")
+# Field prompts in flight per process.
+ENHANCER_FIELD_CONCURRENCY = int(os.getenv("ENHANCER_FIELD_CONCURRENCY", "8"))
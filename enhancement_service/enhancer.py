@@ -1,30 +1,132 @@
 # enhancement_service/enhancer.py
+import contextvars
 import json
-from openai import OpenAI
-from unification_service.models import UnifiedProfile
-from cv_extractor.config import OPENAI_API_KEY  # Re-use the existing config
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from unification_service.models import UnifiedProfile, UnifiedProject
+from observability.tracing import record_span, span
+from cv_extractor.config import ENHANCER_PROMPT_MAX_TOKENS  # Re-use the existing config
+from llm_backends.base_backend import BaseLlmBackend
+from llm_backends.config import ENHANCER_LLM_BACKEND, ENHANCER_LLM_MODEL
+from llm_backends.factory import get_backend
+from llm_backends.traced_backend import traced
+from cv_extractor.extractors.json_stream import IncrementalJsonParser, parse_llm_json
+from cv_extractor.extractors.prompt_builder import compact_json, compact_schema, count_tokens, dedent, report
+from .cache import LOOKUP_FIELD, VOLATILE_FIELDS, content_key, get_enhancement_cache, profile_key
+from .config import ENHANCEMENT_MODE, ENHANCER_FIELD_CONCURRENCY, ENHANCER_FIELD_MODEL
+
+# Arrays of the enhanced profile emitted item by item by `enhance_stream`.
+STREAMED_FIELDS = ("work_experience", "projects")
+
+# Fields neither sent to nor requested from the LLM; they are copied back
+# from the input profile. `source_data` repeats every raw source.
+PROMPT_EXCLUDE = {"profile_id", "source_data"}
+# Fields sent as context but not requested back. Skills are already
+# canonical and de-duplicated by the unifier (see skill_index.py).
+OUTPUT_EXCLUDE = PROMPT_EXCLUDE | {"skills"}
+
+SYSTEM_PROMPT = "You are a resume editor that outputs perfectly structured JSON."
+
+# Part of the enhancement cache keys: bump them when a prompt or the
+# handling of the LLM output changes, so cached enhancements are redone.
+PROMPT_VERSION = "1"
+FIELD_PROMPT_VERSION = "1"
+
+MODE_PROFILE = "profile"
+MODE_FIELDS = "fields"
+
+# Fields mode: what each prompt does with its text, and the answer schema.
+FIELD_TASKS = {
+    "summary": "Write a concise, powerful professional summary (2-4 sentences) that synthesizes the "
+               "candidate's key strengths based only on the profile below, improving the current summary "
+               "if there is one.",
+    "work_experience": "Rewrite the description of this job to be more professional and action-oriented. "
+                       "If it is messy, structure it into bullet points starting with action verbs.",
+    "projects": "Rewrite the description of this project to be clear, professional and concise.",
+}
+FIELD_SCHEMA = {"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]}
+
+_field_pool: Optional[ThreadPoolExecutor] = None
+_field_pool_lock = threading.Lock()
+
+
+def _get_field_pool() -> ThreadPoolExecutor:
+    global _field_pool
+    if _field_pool is None:
+        with _field_pool_lock:
+            if _field_pool is None:
+                _field_pool = ThreadPoolExecutor(max_workers=ENHANCER_FIELD_CONCURRENCY,
+                                                 thread_name_prefix="enhance-field")
+    return _field_pool
 
 
 class ProfileEnhancer:
     """
     Uses an LLM to refine and enhance a unified profile, focusing on
     consistency, coherence, and professional presentation.
+
+    In "profile" mode one prompt rewrites the whole profile; in "fields"
+    mode each text is rewritten on its own (see `_enhance_fields`).
     """
 
-    def __init__(self):
-        self.client = OpenAI(api_key=OPENAI_API_KEY)
+    def __init__(self, backend: BaseLlmBackend = None, use_cache: bool = True, mode: str = ENHANCEMENT_MODE,
+                 field_model: str = ENHANCER_FIELD_MODEL):
+        # OpenAI by default; see llm_backends/config.py for offline backends.
+        self.backend = traced(backend or get_backend(ENHANCER_LLM_BACKEND))
+        self.model_name = ENHANCER_LLM_MODEL
+        self.mode = mode
+        self.field_model = field_model
+        # Profiles (and, in fields mode, texts) with the same content are
+        # enhanced once (see cache.py).
+        self.cache = get_enhancement_cache() if use_cache else None
 
-    def enhance(self, profile: UnifiedProfile) -> UnifiedProfile:
+    def _cache_key(self, profile: UnifiedProfile) -> str:
+        if self.mode == MODE_FIELDS:
+            return profile_key(profile, self.backend.name, self.field_model, f"fields-{FIELD_PROMPT_VERSION}")
+        return profile_key(profile, self.backend.name, self.model_name, PROMPT_VERSION)
+
+    def _prompt_payload(self, profile: UnifiedProfile) -> Tuple[Dict[str, Any], List[UnifiedProject]]:
         """
-        Takes a UnifiedProfile object, sends it to an LLM for refinement,
-        and returns the enhanced UnifiedProfile.
+        The profile data sent to the LLM, and the projects left out of it.
+        When the data exceeds ENHANCER_PROMPT_MAX_TOKENS, trailing projects
+        are dropped until it fits; they are returned unchanged afterwards.
         """
-        profile_json = profile.model_dump_json(indent=2)
-        output_schema_json = UnifiedProfile.model_json_schema(by_alias=False)
+        data = profile.model_dump(exclude=PROMPT_EXCLUDE, exclude_none=True)
+        if count_tokens(compact_json(data)) <= ENHANCER_PROMPT_MAX_TOKENS:
+            return data, []
 
+        budget = ENHANCER_PROMPT_MAX_TOKENS - count_tokens(compact_json({**data, "projects": []}))
+        kept = []
+        for project in data["projects"]:
+            cost = count_tokens(compact_json(project)) + 1
+            if cost > budget:
+                break
+            budget -= cost
+            kept.append(project)
+        data["projects"] = kept
+        return data, profile.projects[len(kept):]
+
+    def _build_prompt(self, profile: UnifiedProfile) -> Tuple[str, List[UnifiedProject]]:
+        data, omitted = self._prompt_payload(profile)
+        prompt = dedent(self._render(
+            compact_json(data),
+            compact_json(compact_schema(UnifiedProfile, exclude=OUTPUT_EXCLUDE)),
+        ))
+        report("enhancement", prompt, lambda: self._render(
+            profile.model_dump_json(indent=2),
+            json.dumps(UnifiedProfile.model_json_schema(by_alias=False), indent=2),
+        ))
+        if omitted:
+            print(f"[Enhancer] {len(omitted)} projects over the prompt budget are kept as-is")
+        return prompt, omitted
+
+    @staticmethod
+    def _render(profile_json: str, output_schema_json: str) -> str:
         # This prompt is the most critical part of this service.
         # It strictly instructs the LLM to edit, not invent.
-        prompt = f"""
+        return f"""
         You are a world-class professional resume editor and career coach.
         Your task is to refine the following unified profile data, which has been aggregated from multiple sources (CV, LinkedIn, GitHub).
 
@@ -32,7 +134,7 @@ class ProfileEnhancer:
         1.  **DO NOT ADD NEW INFORMATION:** You must not invent any new skills, experiences, projects, or details. Your sole purpose is to improve the presentation of the EXISTING data.
         2.  **CREATE A PROFESSIONAL SUMMARY:** Write a concise, powerful professional summary (2-4 sentences) that synthesizes the candidate's key strengths based *only* on the provided skills, experience, and projects.
         3.  **REFINE WORK EXPERIENCE:** For each job, rewrite the description to be more professional and action-oriented. Use clear, impactful language. If descriptions are messy, structure them into bullet points starting with action verbs.
-        4.  **STANDARDIZE SKILLS:** Review the skill list. Correct capitalization (e.g., "python" -> "Python", "javascript" -> "JavaScript"). Ensure consistency.
+        4.  **KEEP SKILLS AS GIVEN:** The skill list is already standardized. Use it as context only; it is not part of your output.
         5.  **ENSURE COHERENCE:** Make sure the entire profile reads like a single, coherent document, not a patchwork of different sources.
 
         **Unified Profile Data to Refine:**
@@ -43,24 +145,218 @@ class ProfileEnhancer:
         Your final output MUST be a valid JSON object that strictly follows this JSON schema. Do not add any extra text or explanations.
 
         **Output Schema:**
-        {json.dumps(output_schema_json, indent=2)}
+        {output_schema_json}
+        """
+
+    @staticmethod
+    def _finalize(profile: UnifiedProfile, enhanced_data: dict, omitted: List[UnifiedProject]) -> UnifiedProfile:
+        """
+        Validates the LLM's output by creating a new UnifiedProfile object,
+        restoring the fields that were not requested from it.
+        """
+        enhanced = UnifiedProfile(**{**enhanced_data, "profile_id": profile.profile_id,
+                                     "skills": profile.skills, "source_data": profile.source_data})
+        enhanced.projects.extend(omitted)
+        return enhanced
+
+    def _cached(self, profile: UnifiedProfile) -> Tuple[Optional[str], Optional[UnifiedProfile]]:
+        """The whole-profile cache key and the cached enhancement, if any."""
+        if not self.cache:
+            return None, None
+        key = self._cache_key(profile)
+        data = self.cache.get(key)
+        if data is None:
+            return key, None
+        return key, UnifiedProfile(**{**data, "profile_id": profile.profile_id, "source_data": profile.source_data})
+
+    def _store(self, key: Optional[str], enhanced: UnifiedProfile) -> None:
+        if key is not None:
+            self.cache.put(key, enhanced.model_dump(exclude=VOLATILE_FIELDS))
+
+    def enhance(self, profile: UnifiedProfile) -> UnifiedProfile:
+        """
+        Takes a UnifiedProfile object, sends it to an LLM for refinement,
+        and returns the enhanced UnifiedProfile.
+        """
+        with span("enhance", mode=self.mode) as attributes:
+            key, cached = self._cached(profile)
+            attributes["cached"] = cached is not None
+            if cached is not None:
+                return cached
+
+            if self.mode == MODE_FIELDS:
+                for event, payload in self._enhance_fields(profile):
+                    if event == "result":
+                        enhanced, failed = payload
+                attributes["failed_fields"] = failed
+                if not failed:
+                    self._store(key, enhanced)
+                return enhanced
+
+            prompt, omitted = self._build_prompt(profile)
+            response = self.backend.generate(prompt, self.model_name, system=SYSTEM_PROMPT, json_output=True)
+
+            try:
+                enhanced_data = json.loads(response)
+                enhanced = self._finalize(profile, enhanced_data, omitted)
+            except (json.JSONDecodeError, TypeError, ValueError) as e:
+                print(f"Error parsing LLM response for enhancement: {e}")
+                # In case of an error, return the original profile to prevent data loss.
+                return profile
+            self._store(key, enhanced)
+            return enhanced
+
+    def enhance_stream(self, profile: UnifiedProfile) -> Iterator[Tuple[str, Any]]:
+        """
+        Streaming variant of `enhance`. Yields `(field, item)` for each
+        skill right away (they are not rewritten), for each refined
+        work_experience / projects item as soon as it has been written,
+        then `("profile", UnifiedProfile)`. A cached enhancement is replayed
+        the same way, without calling the LLM.
         """
+        started = time.perf_counter()
+        for skill in profile.skills:
+            yield "skills", skill
 
-        response = self.client.chat.completions.create(
-            model="gpt-4o",
-            response_format={"type": "json_object"},
-            messages=[
-                {"role": "system", "content": "You are a resume editor that outputs perfectly structured JSON."},
-                {"role": "user", "content": prompt}
-            ]
-        )
+        key, cached = self._cached(profile)
+        if cached is not None:
+            for field in STREAMED_FIELDS:
+                for item in getattr(cached, field):
+                    yield field, item.model_dump()
+            record_span("enhance", started, mode=self.mode, streamed=True, cached=True)
+            yield "profile", cached
+            return
+
+        if self.mode == MODE_FIELDS:
+            for event, payload in self._enhance_fields(profile):
+                if event == "result":
+                    enhanced, failed = payload
+                else:
+                    yield event, payload
+            if not failed:
+                self._store(key, enhanced)
+            record_span("enhance", started, mode=self.mode, streamed=True, cached=False, failed_fields=failed)
+            yield "profile", enhanced
+            return
+
+        prompt, omitted = self._build_prompt(profile)
+        parser = IncrementalJsonParser(STREAMED_FIELDS)
+        for chunk in self.backend.stream(prompt, self.model_name, system=SYSTEM_PROMPT, json_output=True):
+            yield from parser.feed(chunk)
 
         try:
-            enhanced_data = json.loads(response.choices[0].message.content)
-            # Validate the LLM's output by creating a new UnifiedProfile object.
-            # This ensures the data structure is correct before returning.
-            return UnifiedProfile(**enhanced_data)
-        except (json.JSONDecodeError, IndexError) as e:
+            enhanced = self._finalize(profile, parser.result(), omitted)
+            self._store(key, enhanced)
+        except (json.JSONDecodeError, TypeError, ValueError) as e:
             print(f"Error parsing LLM response for enhancement: {e}")
-            # In case of an error, return the original profile to prevent data loss.
-            return profile
\ No newline at end of file
+            enhanced = profile
+        record_span("enhance", started, mode=self.mode, streamed=True, cached=False)
+        yield "profile", enhanced
+
+    # --- Fields mode ---
+
+    @staticmethod
+    def _field_jobs(profile: UnifiedProfile) -> List[Tuple[str, Optional[int], Dict[str, Any]]]:
+        """
+        (field, item index, input) of every text to rewrite: the summary,
+        written from the whole profile (skipped for an empty profile), and
+        each non-empty experience and project description. Skills are
+        already canonical (see skill_index.py) and are not rewritten.
+        """
+        summary_input = {
+            "summary": profile.summary,
+            "skills": profile.skills,
+            "work_experience": [f"{exp.job_title} at {exp.company_name}" for exp in profile.work_experience],
+            "projects": [project.project_name for project in profile.projects],
+        }
+        summary_input = {k: v for k, v in summary_input.items() if v}
+        jobs = [("summary", None, summary_input)] if summary_input else []
+        for index, exp in enumerate(profile.work_experience):
+            if exp.description:
+                jobs.append(("work_experience", index, exp.model_dump(exclude_none=True)))
+        for index, project in enumerate(profile.projects):
+            if project.description:
+                jobs.append(("projects", index, project.model_dump(exclude={"source"}, exclude_none=True)))
+        return jobs
+
+    @staticmethod
+    def _field_prompt(field: str, data: Dict[str, Any]) -> str:
+        prompt = f"""
+        You are a world-class professional resume editor and career coach.
+        {FIELD_TASKS[field]}
+        Do not add new information: no invented skills, experiences, projects or details.
+
+        **Input:**
+        {compact_json(data)}
+
+        Return only valid JSON following this schema exactly:
+        {compact_json(FIELD_SCHEMA)}
+        """
+        return report(f"enhancement_{field}", dedent(prompt))
+
+    def _run_field(self, field: str, data: Dict[str, Any]) -> str:
+        response = self.backend.generate(self._field_prompt(field, data), self.field_model,
+                                         system=SYSTEM_PROMPT, json_output=True)
+        text = parse_llm_json(response).get("text")
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("answer has no 'text'")
+        return text.strip()
+
+    @staticmethod
+    def _apply(enhanced: UnifiedProfile, field: str, index: Optional[int], text: Optional[str]) -> Optional[dict]:
+        """Writes a rewritten text into `enhanced`; returns the item it belongs to (None for the summary)."""
+        if field == "summary":
+            enhanced.summary = text or enhanced.summary
+            return None
+        item = getattr(enhanced, field)[index]
+        item.description = text or item.description
+        return item.model_dump()
+
+    def _enhance_fields(self, profile: UnifiedProfile) -> Iterator[Tuple[str, Any]]:
+        """
+        Rewrites each text of `_field_jobs` with its own small prompt, the
+        prompts running concurrently. A text whose exact input was already
+        enhanced is read from the cache, so only new or changed content
+        reaches the LLM. Yields every work_experience / projects item once,
+        as soon as its description is final, then `("result", (profile,
+        number of failed prompts))`.
+
+        A failed prompt only keeps its own text unchanged.
+        """
+        enhanced = profile.model_copy(deep=True)
+        jobs = self._field_jobs(profile)
+        pending = {(field, index) for field, index, _ in jobs}
+        for field in STREAMED_FIELDS:
+            for index, item in enumerate(getattr(enhanced, field)):
+                if (field, index) not in pending:
+                    yield field, item.model_dump()
+
+        futures = {}
+        for field, index, data in jobs:
+            key = content_key(data, self.backend.name, self.field_model, FIELD_PROMPT_VERSION, field)
+            text = self.cache.get(key, LOOKUP_FIELD) if self.cache else None
+            if text is not None:
+                item = self._apply(enhanced, field, index, text)
+                if item is not None:
+                    yield field, item
+                continue
+            # The copied context keeps each call under the request's trace.
+            futures[_get_field_pool().submit(contextvars.copy_context().run,
+                                             self._run_field, field, data)] = (field, index, key)
+        print(f"[Enhancer] {len(futures)} of {len(jobs)} fields sent to the LLM")
+
+        failed = 0
+        for future in as_completed(futures):
+            field, index, key = futures[future]
+            try:
+                text = future.result()
+            except Exception as e:
+                print(f"[Enhancer] Field '{field}' failed: {e}")
+                failed += 1
+                text = None
+            if text is not None and self.cache:
+                self.cache.put(key, text)
+            item = self._apply(enhanced, field, index, text)
+            if item is not None:
+                yield field, item
+        yield "result", (enhanced, failed)
@@ -1,25 +1,14 @@
-import os
 import re
-import time
 import base64
-import requests
-from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()   
-
-GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
-HEADERS = {
-    "Accept": "application/vnd.github+json",
-    "Authorization": f"Bearer {GITHUB_TOKEN}",
-    "X-GitHub-Api-Version": "2022-11-28"
-}
+# All GitHub traffic goes through the shared client so it is pooled, cached
+# and paced by the process-wide rate-limit scheduler.
+from github_extractor.http_client import get_shared_http_client
 
 def get_user_named_repo_readme(username):
-    url = f"https://api.github.com/repos/{username}/{username}/readme"
-    resp = requests.get(url, headers=HEADERS)
+    resp = get_shared_http_client().get(f"/repos/{username}/{username}/readme")
     if resp.status_code == 200:
-        content = resp.json().get("content")
+        content = (resp.data or {}).get("content")
         if content:
             try:
                 return base64.b64decode(content).decode("utf-8", errors="ignore")
@@ -28,15 +17,14 @@ def get_user_named_repo_readme(username):
     return None
 
 def collect_github_profile(username):
-    user_url = f"https://api.github.com/users/{username}"
-    user_resp = requests.get(user_url, headers=HEADERS)
+    http = get_shared_http_client()
+    user_resp = http.get(f"/users/{username}")
     if user_resp.status_code != 200:
         raise Exception(f"GitHub user {username} not found ({user_resp.status_code})")
-    user_data = user_resp.json()
+    user_data = user_resp.data
 
-    repos_url = f"https://api.github.com/users/{username}/repos"
-    repos_resp = requests.get(repos_url, headers=HEADERS, params={"per_page": 100})
-    repos = repos_resp.json() if repos_resp.status_code == 200 else []
+    repos_resp = http.get(f"/users/{username}/repos", params={"per_page": 100})
+    repos = repos_resp.data if repos_resp.status_code == 200 else []
 
     # Combine repo name and description into a single list of dicts
     repos_list = [
@@ -54,15 +42,14 @@ def collect_github_profile(username):
             break
         if repo.get("fork"):
             continue
-        commits_url = f"https://api.github.com/repos/{username}/{repo['name']}/commits"
-        commits_resp = requests.get(commits_url, headers=HEADERS, params={"per_page": 5})
+        # No fixed sleep needed: the shared client waits for rate-limit budget.
+        commits_resp = http.get(f"/repos/{username}/{repo['name']}/commits", params={"per_page": 5})
         if commits_resp.status_code == 200:
-            commits = commits_resp.json()
+            commits = commits_resp.data
             for c in commits:
                 if "commit" in c and "message" in c["commit"]:
                     recent_commits.append(c["commit"]["message"])
         count += 1
-        time.sleep(0.2)
 
     readme_content = get_user_named_repo_readme(username)
 
@@ -1,17 +1,50 @@
 # github_extractor/api_client.py
-import os
 import re
-import time
 import base64
-import requests
-from dotenv import load_dotenv
-from typing import List, Optional
+import asyncio
+import heapq
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from requests.utils import parse_header_links
 
 # Import our new Pydantic models
 from .models import GitHubProfile, GitHubRepository
+from .config import GITHUB_FETCH_MODE, GITHUB_MAX_REPOS
+from .graphql_client import COMMITS_PER_REPO, GitHubGraphQLFetcher
+from .http_client import ApiResponse, GitHubHttpClient, get_shared_http_client
+from .rate_limiter import current_priority, rate_limit_priority
+
+# Shared pool used to issue the user/repos/README requests concurrently.
+_fetch_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix="github-fetch")
+
+
+def _submit(fn, *args):
+    """Submits to the fetch pool, carrying over the caller's rate-limit priority."""
+    return _fetch_pool.submit(contextvars.copy_context().run, fn, *args)
+
 
-# Load environment variables from .env file
-load_dotenv()
+def _next_link(headers) -> Optional[str]:
+    """The rel="next" URL of a paginated response, if any."""
+    link = headers.get("Link")
+    if not link:
+        return None
+    for item in parse_header_links(link):
+        if item.get("rel") == "next":
+            return item.get("url")
+    return None
+
+
+def _iso(moment: Optional[datetime]) -> Optional[str]:
+    """Formats a datetime like GitHub timestamps, so they compare as strings."""
+    if moment is None:
+        return None
+    if moment.tzinfo is not None:
+        moment = moment.astimezone(timezone.utc)
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
 
 
 class GitHubApiClient:
@@ -19,24 +52,101 @@ class GitHubApiClient:
     A client for fetching and processing data from the GitHub API.
     """
 
-    def __init__(self):
-        self.github_token = os.getenv("GITHUB_TOKEN")
-        if not self.github_token:
-            raise ValueError("GITHUB_TOKEN not found in .env file. Please add it.")
-
-        self.headers = {
-            "Accept": "application/vnd.github+json",
-            "Authorization": f"Bearer {self.github_token}",
-            "X-GitHub-Api-Version": "2022-11-28"
-        }
-        self.base_url = "https://api.github.com"
-
-    def _get_user_named_repo_readme(self, username: str) -> Optional[str]:
-        """Fetches the content of the user's special profile README."""
-        url = f"{self.base_url}/repos/{username}/{username}/readme"
-        resp = requests.get(url, headers=self.headers)
-        if resp.status_code == 200:
-            content = resp.json().get("content")
+    def __init__(self, http: Optional[GitHubHttpClient] = None):
+        # All clients share one pooled, retrying HTTP client by default.
+        self.http = http or get_shared_http_client()
+
+    # --- Requests ---
+    def _fetch_user(self, username: str) -> ApiResponse:
+        return self.http.get(f"/users/{username}")
+
+    def _fetch_readme(self, username: str) -> ApiResponse:
+        return self.http.get(f"/repos/{username}/{username}/readme")
+
+    def _fetch_commits(self, username: str, repo_name: str) -> ApiResponse:
+        return self.http.get(f"/repos/{username}/{repo_name}/commits", params={"per_page": COMMITS_PER_REPO})
+
+    def _iter_raw_repos(self, username: str, max_repos: Optional[int] = None,
+                        pushed_since: Optional[datetime] = None,
+                        prefetch: bool = True) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yields raw repository objects, following the `Link` headers
+        page by page; with `prefetch`, the next page is requested while the
+        current one is being consumed. Raises if a page cannot be fetched,
+        so a partial list is never taken for the complete one.
+        """
+        since = _iso(pushed_since)
+        params = {"per_page": 100}
+        if since:
+            # Newest first, so the walk can stop at the first older repo.
+            params.update(sort="pushed", direction="desc")
+
+        yielded = 0
+        pending = _submit(self.http.get, f"/users/{username}/repos", params)
+        while pending is not None:
+            resp = pending.result()
+            pending = None
+            if resp.status_code != 200:
+                raise Exception(f"GitHub repositories of {username} unavailable ({resp.status_code})")
+            page = resp.data or []
+            next_url = _next_link(resp.headers)
+            needs_more = next_url and (max_repos is None or yielded + len(page) < max_repos)
+            if needs_more and prefetch:
+                pending = _submit(self.http.get, next_url)
+
+            for repo in page:
+                if since and (repo.get("pushed_at") or "") < since:
+                    return
+                if not repo.get("name"):
+                    continue
+                yield repo
+                yielded += 1
+                if max_repos is not None and yielded >= max_repos:
+                    return
+
+            if needs_more and not prefetch:
+                pending = _submit(self.http.get, next_url)
+
+    def iter_repos(self, username: str, max_repos: Optional[int] = GITHUB_MAX_REPOS,
+                   pushed_since: Optional[datetime] = None,
+                   prefetch: bool = True) -> Iterator[GitHubRepository]:
+        """
+        Streams a user's repositories across all result pages.
+
+        Args:
+            username: The GitHub login.
+            max_repos: Stop after this many repositories (None = all).
+            pushed_since: Only repositories pushed at or after this time;
+                results are then ordered by most recent push.
+            prefetch: Request the next page while the current one is consumed.
+        """
+        for repo in self._iter_raw_repos(username, max_repos, pushed_since, prefetch):
+            yield GitHubRepository(repo_name=repo["name"], repo_description=repo.get("description") or "")
+
+    def _collect_repos(self, username: str, max_repos: Optional[int],
+                       pushed_since: Optional[datetime],
+                       commit_repos: int) -> Tuple[List[Dict[str, str]], List[str]]:
+        """
+        Walks all repositories once, returning the compact repo list and the
+        names of the `commit_repos` most recently pushed non-fork ones.
+        """
+        repos_list, top = [], []
+        for repo in self._iter_raw_repos(username, max_repos, pushed_since):
+            repos_list.append({"repo_name": repo["name"], "repo_description": repo.get("description") or ""})
+            if commit_repos > 0 and not repo.get("fork"):
+                entry = (repo.get("pushed_at") or "", repo["name"])
+                if len(top) < commit_repos:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heappushpop(top, entry)
+        return repos_list, [name for _, name in sorted(top, reverse=True)]
+
+    # --- Response handling ---
+    @staticmethod
+    def _decode_readme(resp: ApiResponse) -> Optional[str]:
+        """Decodes the content of the user's special profile README."""
+        if resp.status_code == 200 and resp.data:
+            content = resp.data.get("content")
             if content:
                 try:
                     return base64.b64decode(content).decode("utf-8", errors="ignore")
@@ -44,34 +154,30 @@ class GitHubApiClient:
                     return None
         return None
 
-    def get_profile_data(self, username: str) -> GitHubProfile:
-        """
-        Collects all GitHub profile data and returns it as a validated
-        Pydantic model.
-        """
-        # 1. Get user data
-        user_url = f"{self.base_url}/users/{username}"
-        user_resp = requests.get(user_url, headers=self.headers)
+    @staticmethod
+    def _commit_messages(commit_resps: List[ApiResponse]) -> List[str]:
+        messages = []
+        for resp in commit_resps:
+            if resp.status_code == 200:
+                for c in resp.data or []:
+                    if "commit" in c and "message" in c["commit"]:
+                        messages.append(c["commit"]["message"])
+        return messages
+
+    @staticmethod
+    def _check_user(username: str, user_resp: ApiResponse) -> Dict[str, Any]:
         if user_resp.status_code != 200:
             raise Exception(f"GitHub user {username} not found ({user_resp.status_code})")
-        user_data = user_resp.json()
-
-        # 2. Get repository data
-        repos_url = f"{self.base_url}/users/{username}/repos"
-        repos_resp = requests.get(repos_url, headers=self.headers, params={"per_page": 100})
-        repos = repos_resp.json() if repos_resp.status_code == 200 else []
-
-        # Pydantic will automatically validate this list of dictionaries
-        repos_list = [
-            {"repo_name": r.get("name"), "repo_description": r.get("description") or ""}
-            for r in repos if r.get("name")
-        ]
+        return user_resp.data
 
-        # 3. Get README content
-        readme_content = self._get_user_named_repo_readme(username)
+    @classmethod
+    def _build_profile(cls, username: str, user_resp: ApiResponse, readme_resp: ApiResponse,
+                       repos_list: List[Dict[str, str]],
+                       commit_resps: Optional[List[ApiResponse]] = None) -> GitHubProfile:
+        user_data = cls._check_user(username, user_resp)
 
-        # 4. Assemble and validate the data using our Pydantic model
-        github_profile = GitHubProfile(
+        # Assemble and validate the data using our Pydantic model
+        return GitHubProfile(
             user_id=str(user_data.get("id")),
             username=user_data.get("login"),
             name=user_data.get("name") or user_data.get("login"),
@@ -81,21 +187,140 @@ class GitHubApiClient:
             company=user_data.get("company"),
             website=user_data.get("blog"),
             repos=repos_list,
-            user_named_repo_readme=readme_content,
+            user_named_repo_readme=cls._decode_readme(readme_resp),
+            recent_commits=cls._commit_messages(commit_resps or []),
         )
 
-        return github_profile
+    # --- Public API ---
+    def get_profile_data(self, username: str, priority: Optional[str] = None,
+                         mode: Optional[str] = None, commit_repos: int = 0,
+                         max_repos: Optional[int] = GITHUB_MAX_REPOS,
+                         pushed_since: Optional[datetime] = None) -> GitHubProfile:
+        """
+        Collects all GitHub profile data and returns it as a validated
+        Pydantic model.
+
+        Args:
+            username: The GitHub login.
+            priority: "interactive" or "batch"; controls how the calls are
+                scheduled against the shared rate-limit budget. Defaults to
+                the caller's current priority.
+            mode: "rest" (user, README and repository pages requested
+                concurrently, plus one call per commit repo) or "graphql"
+                (a single paginated query). Defaults to GITHUB_FETCH_MODE.
+            commit_repos: Number of recently pushed repositories whose
+                latest commit messages go into `recent_commits`.
+            max_repos: Cap on the number of repositories (None = all).
+            pushed_since: Only keep repositories pushed since then (REST only).
+        """
+        mode = mode or GITHUB_FETCH_MODE
+        with rate_limit_priority(priority or current_priority()):
+            if mode == "graphql":
+                return GitHubGraphQLFetcher(self.http).fetch_profile(username, commit_repos, max_repos)
+            if mode != "rest":
+                raise ValueError(f"Unsupported GitHub fetch mode: {mode}")
+
+            user_f = _submit(self._fetch_user, username)
+            readme_f = _submit(self._fetch_readme, username)
+            repos_list, top_names = self._collect_repos(username, max_repos, pushed_since, commit_repos)
+            commit_fs = [_submit(self._fetch_commits, username, name) for name in top_names]
+        return self._build_profile(username, user_f.result(), readme_f.result(), repos_list,
+                                   [f.result() for f in commit_fs])
+
+    def get_profile_stream(self, username: str, priority: Optional[str] = None,
+                           max_repos: Optional[int] = GITHUB_MAX_REPOS,
+                           pushed_since: Optional[datetime] = None
+                           ) -> Tuple[GitHubProfile, Iterator[GitHubRepository]]:
+        """
+        Returns the profile without its repositories, plus a lazy iterator
+        over them (see ProfileUnifier.unify's `github_repos`). The pages are
+        requested while the caller consumes the repositories; the iterator
+        raises if one of them fails.
+        """
+        with rate_limit_priority(priority or current_priority()):
+            user_f = _submit(self._fetch_user, username)
+            readme_f = _submit(self._fetch_readme, username)
+            profile = self._build_profile(username, user_f.result(), readme_f.result(), [])
+            ctx = contextvars.copy_context()
+
+        def repos():
+            # Keep the caller's priority for the lazily requested pages.
+            iterator = ctx.run(self.iter_repos, username, max_repos, pushed_since)
+            while True:
+                try:
+                    yield ctx.run(next, iterator)
+                except StopIteration:
+                    return
+
+        return profile, repos()
+
+    async def get_profile_data_async(self, username: str, priority: Optional[str] = None,
+                                     mode: Optional[str] = None, commit_repos: int = 0,
+                                     max_repos: Optional[int] = GITHUB_MAX_REPOS,
+                                     pushed_since: Optional[datetime] = None) -> GitHubProfile:
+        """
+        Async variant of `get_profile_data`, for callers running an event
+        loop. Requests run concurrently on the pooled client.
+        """
+        mode = mode or GITHUB_FETCH_MODE
+        with rate_limit_priority(priority or current_priority()):
+            if mode == "graphql":
+                return await asyncio.to_thread(
+                    GitHubGraphQLFetcher(self.http).fetch_profile, username, commit_repos, max_repos
+                )
+            if mode != "rest":
+                raise ValueError(f"Unsupported GitHub fetch mode: {mode}")
+
+            user_resp, readme_resp, (repos_list, top_names) = await asyncio.gather(
+                asyncio.to_thread(self._fetch_user, username),
+                asyncio.to_thread(self._fetch_readme, username),
+                asyncio.to_thread(self._collect_repos, username, max_repos, pushed_since, commit_repos),
+            )
+            commit_resps = await asyncio.gather(*(
+                asyncio.to_thread(self._fetch_commits, username, name) for name in top_names
+            ))
+        return self._build_profile(username, user_resp, readme_resp, repos_list, list(commit_resps))
+
 
+_client: Optional[GitHubApiClient] = None
+_client_lock = threading.Lock()
 
-def get_profile_from_github_url(url: str) -> GitHubProfile:
+
+def _get_client() -> GitHubApiClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = GitHubApiClient()
+    return _client
+
+
+def _parse_username(url: str) -> str:
+    match = re.search(r"github\.com/([\w\-\d]+)", url)
+    if not match:
+        raise ValueError("Invalid GitHub URL")
+    return match.group(1)
+
+
+def get_profile_from_github_url(url: str, priority: Optional[str] = None,
+                                mode: Optional[str] = None) -> GitHubProfile:
     """
     Parses a GitHub URL to get the username and fetches the profile data.
     This is the main entry point for this module.
     """
-    match = re.search(r"github\.com/([\w\-\d]+)", url)
-    if not match:
-        raise ValueError("Invalid GitHub URL")
-    username = match.group(1)
+    return _get_client().get_profile_data(_parse_username(url), priority=priority, mode=mode)
+
+
+def get_profile_stream_from_github_url(url: str, priority: Optional[str] = None
+                                       ) -> Tuple[GitHubProfile, Iterator[GitHubRepository]]:
+    """
+    Like `get_profile_from_github_url`, but returns the repositories as a
+    lazy iterator next to a repo-less profile (see `get_profile_stream`).
+    """
+    return _get_client().get_profile_stream(_parse_username(url), priority=priority)
+
 
-    client = GitHubApiClient()
-    return client.get_profile_data(username)
\ No newline at end of file
+async def get_profile_from_github_url_async(url: str, priority: Optional[str] = None,
+                                            mode: Optional[str] = None) -> GitHubProfile:
+    """Async variant of `get_profile_from_github_url`."""
+    return await _get_client().get_profile_data_async(_parse_username(url), priority=priority, mode=mode)
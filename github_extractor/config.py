@@ -0,0 +1,59 @@
+# github_extractor/config.py
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+
+# Default profile fetch mode: "rest" (one call per resource) or "graphql"
+# (a single paginated query). Can be overridden per call.
+GITHUB_FETCH_MODE = os.getenv("GITHUB_FETCH_MODE", "rest")
+
+# --- HTTP client ---
+# Seconds to establish a connection / to wait for a response.
+GITHUB_CONNECT_TIMEOUT = float(os.getenv("GITHUB_CONNECT_TIMEOUT", "5"))
+GITHUB_READ_TIMEOUT = float(os.getenv("GITHUB_READ_TIMEOUT", "20"))
+# Retries on connection errors, timeouts, 429 and 5xx responses.
+GITHUB_MAX_RETRIES = int(os.getenv("GITHUB_MAX_RETRIES", "3"))
+# Base delay of the exponential backoff (full jitter is applied).
+GITHUB_BACKOFF_SECONDS = float(os.getenv("GITHUB_BACKOFF_SECONDS", "0.5"))
+# Keep-alive connections kept open to api.github.com.
+GITHUB_POOL_SIZE = int(os.getenv("GITHUB_POOL_SIZE", "20"))
+
+# --- Conditional-request (ETag) cache ---
+# Set GITHUB_CACHE_ENABLED=0 to disable the on-disk HTTP cache.
+GITHUB_CACHE_ENABLED = os.getenv("GITHUB_CACHE_ENABLED", "1") == "1"
+GITHUB_CACHE_PATH = os.getenv("GITHUB_CACHE_PATH", os.path.join("instance", "github_cache.db"))
+# Size budget of the stored responses; the least recently validated ones
+# are evicted beyond it.
+GITHUB_CACHE_MAX_BYTES = int(os.getenv("GITHUB_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+# Seconds during which a cached response is served without contacting
+# GitHub at all. After that it is revalidated with If-None-Match, and a
+# 304 answer does not count against the rate limit.
+GITHUB_CACHE_FRESHNESS = {
+    "user": int(os.getenv("GITHUB_CACHE_FRESH_USER", "300")),
+    "repos": int(os.getenv("GITHUB_CACHE_FRESH_REPOS", "300")),
+    "readme": int(os.getenv("GITHUB_CACHE_FRESH_README", "3600")),
+    "commits": int(os.getenv("GITHUB_CACHE_FRESH_COMMITS", "900")),
+    "default": int(os.getenv("GITHUB_CACHE_FRESH_DEFAULT", "60")),
+}
+
+# --- Rate-limit scheduler ---
+# Shared state file: every process using the same path shares one budget.
+GITHUB_RATE_STATE_PATH = os.getenv("GITHUB_RATE_STATE_PATH", os.path.join("instance", "github_rate.db"))
+# Requests kept in reserve for interactive traffic: batch requests wait
+# once the remaining budget drops to this level.
+GITHUB_BATCH_RESERVE = int(os.getenv("GITHUB_BATCH_RESERVE", "500"))
+# Longest a caller queues for budget before giving up, per priority.
+GITHUB_RATE_MAX_WAIT = {
+    "interactive": float(os.getenv("GITHUB_RATE_MAX_WAIT_INTERACTIVE", "120")),
+    "batch": float(os.getenv("GITHUB_RATE_MAX_WAIT_BATCH", "3700")),
+}
+
+# --- Repository pagination ---
+# Default cap on the number of repositories collected per profile
+# (unset = all of them). Can be overridden per call.
+GITHUB_MAX_REPOS = int(os.getenv("GITHUB_MAX_REPOS")) if os.getenv("GITHUB_MAX_REPOS") else None
@@ -0,0 +1,139 @@
+# github_extractor/graphql_client.py
+from typing import Any, Dict, List, Optional
+
+from .http_client import GitHubHttpClient, get_shared_http_client
+from .models import GitHubProfile
+
+# Number of commit messages fetched per repository.
+COMMITS_PER_REPO = 5
+
+# Profile README paths tried on the default branch, in order. The REST
+# /readme endpoint picks the README whatever its name; these cover the
+# names it finds in practice, so both modes return the same README. Any
+# other name (e.g. README.adoc) is only found by the REST mode.
+README_CANDIDATES = (
+    "README.md", "readme.md", "Readme.md", "README.MD", "README.markdown", "README.rst",
+    "readme.rst", "README.txt", "README", ".github/README.md", "docs/README.md",
+)
+_README_FIELDS = "\n      ".join(
+    f'readme{i}: object(expression: "HEAD:{path}") {{ ... on Blob {{ text }} }}'
+    for i, path in enumerate(README_CANDIDATES)
+)
+
+# First round trip: the user, the first page of repositories, the profile
+# README and the latest commits of the most recently pushed repositories.
+PROFILE_QUERY = """
+query($login: String!, $commitRepos: Int!, $withCommits: Boolean!, $commitsPerRepo: Int!) {
+  user(login: $login) {
+    databaseId login name bio location email company websiteUrl
+    profileRepo: repository(name: $login) {
+      %s
+    }
+    repositories(first: 100, ownerAffiliations: OWNER, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name description }
+    }
+    topRepos: repositories(first: $commitRepos, isFork: false, ownerAffiliations: OWNER,
+                           orderBy: {field: PUSHED_AT, direction: DESC}) @include(if: $withCommits) {
+      nodes {
+        name
+        defaultBranchRef { target { ... on Commit { history(first: $commitsPerRepo) { nodes { message } } } } }
+      }
+    }
+  }
+}
+""" % _README_FIELDS
+
+# Follow-up round trips, only for accounts with more than 100 repositories.
+REPOS_PAGE_QUERY = """
+query($login: String!, $cursor: String!) {
+  user(login: $login) {
+    repositories(first: 100, after: $cursor, ownerAffiliations: OWNER, orderBy: {field: NAME, direction: ASC}) {
+      pageInfo { hasNextPage endCursor }
+      nodes { name description }
+    }
+  }
+}
+"""
+
+
+class GitHubGraphQLFetcher:
+    """
+    Builds a GitHubProfile from the GitHub GraphQL API in one query, plus
+    one more per extra 100 repositories. The REST path needs 3 + N calls
+    for the same data.
+    """
+
+    def __init__(self, http: Optional[GitHubHttpClient] = None):
+        self.http = http or get_shared_http_client()
+
+    def _query(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        resp = self.http.post("/graphql", {"query": query, "variables": variables}, resource="graphql")
+        if resp.status_code != 200 or not resp.data:
+            raise Exception(f"GitHub GraphQL request failed ({resp.status_code})")
+        if resp.data.get("errors") and not resp.data.get("data"):
+            raise Exception(f"GitHub GraphQL error: {resp.data['errors'][0].get('message')}")
+        return resp.data.get("data") or {}
+
+    @staticmethod
+    def _commit_messages(top_repos: Optional[Dict[str, Any]]) -> List[str]:
+        messages = []
+        for repo in (top_repos or {}).get("nodes") or []:
+            target = ((repo.get("defaultBranchRef") or {}).get("target") or {})
+            for commit in (target.get("history") or {}).get("nodes") or []:
+                if commit.get("message"):
+                    messages.append(commit["message"])
+        return messages
+
+    def fetch_profile(self, username: str, commit_repos: int = 0,
+                      max_repos: Optional[int] = None) -> GitHubProfile:
+        """
+        Fetches a profile. When `commit_repos` > 0, the latest commit
+        messages of that many recently pushed (non-fork) repositories are
+        included in `recent_commits`. Pagination stops after `max_repos`
+        repositories.
+        """
+        data = self._query(PROFILE_QUERY, {
+            "login": username,
+            "commitRepos": max(1, min(commit_repos, 100)),
+            "withCommits": commit_repos > 0,
+            "commitsPerRepo": COMMITS_PER_REPO,
+        })
+        user = data.get("user")
+        if not user:
+            raise Exception(f"GitHub user {username} not found (404)")
+
+        repos_list = []
+        page = user["repositories"]
+        while True:
+            repos_list.extend(
+                {"repo_name": r["name"], "repo_description": r.get("description") or ""}
+                for r in page.get("nodes") or [] if r.get("name")
+            )
+            if max_repos is not None and len(repos_list) >= max_repos:
+                repos_list = repos_list[:max_repos]
+                break
+            if not page["pageInfo"]["hasNextPage"]:
+                break
+            page = self._query(REPOS_PAGE_QUERY, {
+                "login": username, "cursor": page["pageInfo"]["endCursor"],
+            })["user"]["repositories"]
+
+        profile_repo = user.get("profileRepo") or {}
+        readme = next((blob["text"] for blob in (profile_repo.get(f"readme{i}")
+                                                 for i in range(len(README_CANDIDATES)))
+                       if blob and blob.get("text") is not None), None)
+
+        return GitHubProfile(
+            user_id=str(user.get("databaseId")),
+            username=user.get("login"),
+            name=user.get("name") or user.get("login"),
+            bio=user.get("bio"),
+            location=user.get("location"),
+            email=user.get("email") or None,
+            company=user.get("company"),
+            website=user.get("websiteUrl"),
+            repos=repos_list,
+            user_named_repo_readme=readme,
+            recent_commits=self._commit_messages(user.get("topRepos")),
+        )
@@ -0,0 +1,184 @@
+# github_extractor/http_cache.py
+import json
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Mapping, Optional
+from urllib.parse import urlencode
+
+from storage.sqlite import SQLiteDatabase
+
+from .config import GITHUB_CACHE_FRESHNESS, GITHUB_CACHE_MAX_BYTES, GITHUB_CACHE_PATH
+
+# Maps an API path to the endpoint family used for freshness windows.
+_ENDPOINT_PATTERNS = [
+    ("readme", re.compile(r"/repos/[^/]+/[^/]+/readme")),
+    ("commits", re.compile(r"/repos/[^/]+/[^/]+/commits")),
+    ("repos", re.compile(r"/users/[^/]+/repos")),
+    ("user", re.compile(r"/users/[^/]+/?$")),
+]
+
+
+def endpoint_of(url: str) -> str:
+    """Classifies a URL into one of the GITHUB_CACHE_FRESHNESS families."""
+    path = url.split("?", 1)[0]
+    for name, pattern in _ENDPOINT_PATTERNS:
+        if pattern.search(path):
+            return name
+    return "default"
+
+
+def cache_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+class CachedEntry:
+    """A stored 200 response plus the validators needed to revalidate it."""
+
+    def __init__(self, data: Any, headers: Dict[str, str], etag: Optional[str],
+                 last_modified: Optional[str], fetched_at: float):
+        self.data = data
+        self.headers = headers
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, freshness_seconds: int) -> bool:
+        return time.time() - self.fetched_at < freshness_seconds
+
+    def validators(self) -> Dict[str, str]:
+        """Conditional-request headers for this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class GitHubHttpCache:
+    """
+    An on-disk cache of GitHub API responses keyed by URL, storing ETag and
+    Last-Modified validators.
+
+    Within an endpoint's freshness window the cached body is served without
+    any request. Past it, the request is sent with If-None-Match: GitHub
+    answers 304 for unchanged resources, and 304s are not counted against
+    the rate limit.
+
+    Stored responses are capped at `max_bytes`: beyond it, the entries
+    least recently fetched or revalidated are evicted first.
+    """
+
+    def __init__(self, path: str = GITHUB_CACHE_PATH,
+                 freshness: Optional[Dict[str, int]] = None,
+                 max_bytes: int = GITHUB_CACHE_MAX_BYTES):
+        self.path = path
+        self.freshness = freshness or GITHUB_CACHE_FRESHNESS
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._counters = {"fresh": 0, "not_modified": 0, "ok": 0, "uncacheable": 0}
+
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS http_cache (
+                key           TEXT PRIMARY KEY,
+                etag          TEXT,
+                last_modified TEXT,
+                headers       TEXT NOT NULL,
+                body          TEXT NOT NULL,
+                size          INTEGER NOT NULL DEFAULT 0,
+                fetched_at    REAL NOT NULL
+            )
+            """,
+        ])
+        with self.db.transaction() as conn:
+            # Databases created before the size budget lack the column;
+            # their entries count as empty until refetched or evicted.
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(http_cache)")}
+            if "size" not in columns:
+                conn.execute("ALTER TABLE http_cache ADD COLUMN size INTEGER NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_http_cache_fetched_at ON http_cache (fetched_at)")
+
+    def freshness_for(self, url: str) -> int:
+        return self.freshness.get(endpoint_of(url), self.freshness.get("default", 0))
+
+    def lookup(self, key: str) -> Optional[CachedEntry]:
+        with self.db.connect() as conn:
+            row = conn.execute(
+                "SELECT body, headers, etag, last_modified, fetched_at FROM http_cache WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedEntry(json.loads(row[0]), json.loads(row[1]), row[2], row[3], row[4])
+
+    def store(self, key: str, data: Any, headers: Mapping[str, str]) -> None:
+        """Stores a 200 response if it carries a validator."""
+        etag, last_modified = headers.get("ETag"), headers.get("Last-Modified")
+        if not etag and not last_modified:
+            self.record("uncacheable")
+            return
+        headers_json, body = json.dumps(dict(headers)), json.dumps(data)
+        size = len(headers_json.encode("utf-8")) + len(body.encode("utf-8"))
+        if size > self.max_bytes:
+            self.record("uncacheable")
+            return
+        with self.db.transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO http_cache "
+                "(key, etag, last_modified, headers, body, size, fetched_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, headers_json, body, size, time.time()),
+            )
+            self._evict(conn)
+        self.record("ok")
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM http_cache ORDER BY fetched_at ASC").fetchall()
+        to_delete = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            to_delete.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM http_cache WHERE key = ?", to_delete)
+
+    def touch(self, key: str) -> None:
+        """Marks an entry as fresh again after a 304."""
+        with self.db.connect() as conn:
+            conn.execute("UPDATE http_cache SET fetched_at = ? WHERE key = ?", (time.time(), key))
+        self.record("not_modified")
+
+    def invalidate(self, prefix: Optional[str] = None) -> int:
+        """Drops entries whose key starts with `prefix` (all entries if None)."""
+        with self.db.connect() as conn:
+            if prefix is None:
+                return conn.execute("DELETE FROM http_cache").rowcount
+            return conn.execute(
+                "DELETE FROM http_cache WHERE substr(key, 1, ?) = ?", (len(prefix), prefix)
+            ).rowcount
+
+    def record(self, outcome: str) -> None:
+        with self._lock:
+            self._counters[outcome] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Outcome counters for this process. `revalidation_304_ratio` is the
+        share of requests sent to GitHub that came back 304.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+        sent = counters["not_modified"] + counters["ok"] + counters["uncacheable"]
+        served = counters["fresh"] + sent
+        counters["revalidation_304_ratio"] = counters["not_modified"] / sent if sent else 0.0
+        counters["quota_saved_ratio"] = (
+            (counters["fresh"] + counters["not_modified"]) / served if served else 0.0
+        )
+        return counters
@@ -0,0 +1,213 @@
+# github_extractor/http_client.py
+import random
+import threading
+import time
+from typing import Any, Dict, NamedTuple, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from observability.metrics import HTTP_CLIENT_REQUESTS
+from observability.tracing import span
+
+from .config import (
+    GITHUB_API_URL,
+    GITHUB_BACKOFF_SECONDS,
+    GITHUB_CACHE_ENABLED,
+    GITHUB_CONNECT_TIMEOUT,
+    GITHUB_MAX_RETRIES,
+    GITHUB_POOL_SIZE,
+    GITHUB_READ_TIMEOUT,
+    GITHUB_TOKEN,
+)
+from .http_cache import GitHubHttpCache, cache_key
+from .rate_limiter import GitHubRateLimiter, RateLimitExceeded, is_rate_limited
+
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class ApiResponse(NamedTuple):
+    """A decoded GitHub API response (headers are case-insensitive)."""
+    status_code: int
+    data: Any
+    headers: CaseInsensitiveDict
+
+
+class GitHubHttpClient:
+    """
+    A thread-safe, connection-pooled HTTP client for the GitHub REST API.
+
+    All requests go through one `requests.Session`, so TLS connections to
+    api.github.com are reused. Transient failures (connection errors,
+    timeouts, 429 and 5xx) are retried with exponential backoff and full
+    jitter.
+
+    When a GitHubHttpCache is attached, successful responses are cached
+    with their ETag and later requests are sent as conditional requests.
+    When a GitHubRateLimiter is attached, every request first takes a token
+    from the shared budget, and rate-limited responses are queued and
+    retried once the budget refills.
+    """
+
+    def __init__(self, token: Optional[str] = GITHUB_TOKEN,
+                 base_url: str = GITHUB_API_URL,
+                 connect_timeout: float = GITHUB_CONNECT_TIMEOUT,
+                 read_timeout: float = GITHUB_READ_TIMEOUT,
+                 max_retries: int = GITHUB_MAX_RETRIES,
+                 backoff: float = GITHUB_BACKOFF_SECONDS,
+                 pool_size: int = GITHUB_POOL_SIZE,
+                 session: Optional[requests.Session] = None,
+                 cache: Optional[GitHubHttpCache] = None,
+                 rate_limiter: Optional[GitHubRateLimiter] = None):
+        if not token:
+            raise ValueError("GITHUB_TOKEN not found in .env file. Please add it.")
+
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.headers.update({
+            "Accept": "application/vnd.github+json",
+            "Authorization": f"Bearer {token}",
+            "X-GitHub-Api-Version": "2022-11-28",
+        })
+
+    def _url(self, path: str) -> str:
+        return path if path.startswith("http") else f"{self.base_url}/{path.lstrip('/')}"
+
+    def _sleep_before_retry(self, attempt: int, retry_after: Optional[str] = None) -> None:
+        if retry_after and retry_after.isdigit():
+            delay = float(retry_after)
+        else:
+            delay = random.uniform(0, self.backoff * (2 ** attempt))
+        time.sleep(delay)
+
+    def get(self, path: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None) -> ApiResponse:
+        """
+        GETs an API path (e.g. "/users/octocat") or absolute URL and returns
+        the decoded response. Non-retryable error statuses (e.g. 404) are
+        returned, not raised; network errors are raised once retries are
+        exhausted.
+        """
+        url = self._url(path)
+        if self.cache is None:
+            return self._send(url, params, headers)
+
+        key = cache_key(url, params)
+        entry = self.cache.lookup(key)
+        if entry is not None and entry.is_fresh(self.cache.freshness_for(url)):
+            self.cache.record("fresh")
+            return ApiResponse(200, entry.data, CaseInsensitiveDict(entry.headers))
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.validators())
+
+        resp = self._send(url, params, request_headers)
+        if resp.status_code == 304 and entry is not None:
+            self.cache.touch(key)
+            # Keep the cached headers but expose the fresh rate-limit info.
+            return ApiResponse(200, entry.data, CaseInsensitiveDict({**entry.headers, **resp.headers}))
+        if resp.status_code == 200:
+            self.cache.store(key, resp.data, resp.headers)
+        return resp
+
+    def post(self, path: str, json_body: Dict[str, Any], resource: str = "core") -> ApiResponse:
+        """
+        POSTs a JSON body (e.g. a GraphQL query to "/graphql", with
+        resource="graphql"). POST responses are never cached.
+        """
+        return self._send(self._url(path), None, None, resource=resource,
+                          method="POST", json_body=json_body)
+
+    def _send(self, url: str, params: Optional[Dict[str, Any]],
+              headers: Optional[Dict[str, str]], resource: str = "core",
+              method: str = "GET", json_body: Optional[Dict[str, Any]] = None) -> ApiResponse:
+        """Sends one request, retrying transient failures and waiting out rate limits."""
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(resource)
+            try:
+                with span("http.github", method=method, url=url) as attributes:
+                    resp = self.session.request(method, url, params=params, headers=headers,
+                                                json=json_body, timeout=self.timeout)
+                    attributes["status"] = resp.status_code
+                HTTP_CLIENT_REQUESTS.inc(target="github", status=resp.status_code)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                HTTP_CLIENT_REQUESTS.inc(target="github", status=e.__class__.__name__)
+                if attempt >= self.max_retries:
+                    raise
+                print(f"[GitHubHttpClient] {e.__class__.__name__} on {url}, retrying...")
+                self._sleep_before_retry(attempt)
+                attempt += 1
+                continue
+
+            if self.rate_limiter is not None:
+                self.rate_limiter.update(resp.headers)
+                if is_rate_limited(resp.status_code, resp.headers):
+                    # Queue rather than fail: the next acquire() blocks until
+                    # the budget resets (or raises after the max wait). A
+                    # secondary limit leaves budget, so its Retry-After is
+                    # waited here, within the same max wait and retry count.
+                    if attempt >= self.max_retries:
+                        raise RateLimitExceeded(f"GitHub kept rate limiting {url} after {attempt} retries")
+                    retry_after = resp.headers.get("Retry-After")
+                    if retry_after and retry_after.isdigit():
+                        max_wait = self.rate_limiter.max_wait_for()
+                        if float(retry_after) > max_wait:
+                            raise RateLimitExceeded(
+                                f"GitHub asked to retry {url} in {retry_after}s (max wait {max_wait:.0f}s)"
+                            )
+                        print(f"[GitHubHttpClient] Rate limited on {url}, retrying in {retry_after}s...")
+                        time.sleep(float(retry_after))
+                    else:
+                        print(f"[GitHubHttpClient] Rate limited on {url}, waiting for budget...")
+                    attempt += 1
+                    continue
+
+            if resp.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                print(f"[GitHubHttpClient] HTTP {resp.status_code} on {url}, retrying...")
+                self._sleep_before_retry(attempt, resp.headers.get("Retry-After"))
+                attempt += 1
+                continue
+
+            try:
+                data = resp.json() if resp.content else None
+            except ValueError:
+                data = None
+            return ApiResponse(resp.status_code, data, CaseInsensitiveDict(resp.headers))
+
+    def close(self) -> None:
+        self.session.close()
+
+
+_shared_client: Optional[GitHubHttpClient] = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_http_client() -> GitHubHttpClient:
+    """Returns the process-wide pooled client, creating it on first use."""
+    global _shared_client
+    if _shared_client is None:
+        with _shared_lock:
+            if _shared_client is None:
+                _shared_client = GitHubHttpClient(
+                    cache=GitHubHttpCache() if GITHUB_CACHE_ENABLED else None,
+                    rate_limiter=GitHubRateLimiter(),
+                )
+    return _shared_client
+
+
+def shared_cache_stats() -> Optional[Dict[str, Any]]:
+    """HTTP cache counters of the shared client; None until it exists or when caching is off."""
+    client = _shared_client
+    return client.cache.stats() if client is not None and client.cache is not None else None
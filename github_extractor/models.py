@@ -30,4 +30,8 @@ class GitHubProfile(BaseModel):
     repos: List[GitHubRepository] = []
 
     # Optional field for the special profile README
-    user_named_repo_readme: Optional[str] = None
\ No newline at end of file
+    user_named_repo_readme: Optional[str] = None
+
+    # Latest commit messages of the most recently pushed repositories
+    # (only filled when commits are requested).
+    recent_commits: List[str] = []
\ No newline at end of file
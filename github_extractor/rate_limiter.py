@@ -0,0 +1,202 @@
+# github_extractor/rate_limiter.py
+import contextvars
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Mapping, Optional
+
+from storage.sqlite import SQLiteDatabase
+
+from .config import GITHUB_BATCH_RESERVE, GITHUB_RATE_MAX_WAIT, GITHUB_RATE_STATE_PATH
+
+PRIORITY_INTERACTIVE = "interactive"
+PRIORITY_BATCH = "batch"
+
+# Priority of the GitHub calls made in the current context (request,
+# thread or task). Set it with `rate_limit_priority(...)`.
+_current_priority = contextvars.ContextVar("github_priority", default=PRIORITY_INTERACTIVE)
+
+# Used until GitHub has told us the real numbers.
+_DEFAULT_LIMIT = 5000
+_DEFAULT_WINDOW = 3600
+# Upper bound on a single sleep, so waiters notice budget refills early.
+_MAX_SLEEP = 5.0
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a caller waited longer than allowed for API budget."""
+
+
+@contextmanager
+def rate_limit_priority(priority: str):
+    """
+    Runs the enclosed GitHub calls at the given priority:
+
+        with rate_limit_priority(PRIORITY_BATCH):
+            refresh_all_profiles()
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> str:
+    return _current_priority.get()
+
+
+class GitHubRateLimiter:
+    """
+    A token-bucket scheduler for GitHub API calls, fed by the
+    X-RateLimit-* response headers.
+
+    The bucket state lives in a small SQLite file, so every process pointing
+    at the same file shares one budget. Interactive calls may spend the
+    budget down to zero. Batch calls are paced to spread the remaining
+    budget until the reset time, and they stop at a reserve kept for
+    interactive traffic. When the budget runs low, callers queue until it
+    refills instead of failing with 403s.
+    """
+
+    def __init__(self, path: str = GITHUB_RATE_STATE_PATH,
+                 batch_reserve: int = GITHUB_BATCH_RESERVE,
+                 max_wait: Optional[Dict[str, float]] = None):
+        self.path = path
+        self.batch_reserve = batch_reserve
+        self.max_wait = max_wait or GITHUB_RATE_MAX_WAIT
+
+        # In-process priority: batch callers yield while interactive ones wait.
+        self._interactive_waiting = 0
+        self._waiting_lock = threading.Lock()
+        self._counters = {"granted": 0, "waited": 0, "wait_seconds": 0.0}
+
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS rate_state (
+                resource      TEXT PRIMARY KEY,
+                rate_limit    INTEGER NOT NULL,
+                remaining     INTEGER NOT NULL,
+                reset_at      REAL NOT NULL,
+                next_batch_at REAL NOT NULL DEFAULT 0
+            )
+            """,
+        ])
+
+    def _load(self, conn: sqlite3.Connection, resource: str, now: float):
+        row = conn.execute(
+            "SELECT rate_limit, remaining, reset_at, next_batch_at FROM rate_state WHERE resource = ?",
+            (resource,),
+        ).fetchone()
+        if row is None:
+            return _DEFAULT_LIMIT, _DEFAULT_LIMIT, now + _DEFAULT_WINDOW, 0.0
+        limit, remaining, reset_at, next_batch_at = row
+        if now >= reset_at:
+            # The window has rolled over: the bucket is full again.
+            return limit, limit, now + _DEFAULT_WINDOW, 0.0
+        return limit, remaining, reset_at, next_batch_at
+
+    def _try_acquire(self, resource: str, priority: str) -> float:
+        """Takes one token if allowed; otherwise returns how long to wait."""
+        now = time.time()
+        with self.db.transaction() as conn:
+            limit, remaining, reset_at, next_batch_at = self._load(conn, resource, now)
+            wait = 0.0
+            if priority == PRIORITY_BATCH:
+                spendable = remaining - self.batch_reserve
+                if spendable <= 0:
+                    wait = reset_at - now
+                elif now < next_batch_at:
+                    wait = next_batch_at - now
+                else:
+                    # Spread the batch share evenly until the reset.
+                    next_batch_at = now + (reset_at - now) / spendable
+            elif remaining <= 0:
+                wait = reset_at - now
+
+            if wait <= 0:
+                remaining -= 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_state "
+                "(resource, rate_limit, remaining, reset_at, next_batch_at) VALUES (?, ?, ?, ?, ?)",
+                (resource, limit, remaining, reset_at, next_batch_at),
+            )
+        return max(wait, 0.0)
+
+    def max_wait_for(self, priority: Optional[str] = None) -> float:
+        """Longest a caller of `priority` (default: the current one) may queue, in seconds."""
+        return self.max_wait.get(priority or current_priority(), self.max_wait[PRIORITY_INTERACTIVE])
+
+    def acquire(self, resource: str = "core", priority: Optional[str] = None) -> None:
+        """
+        Blocks until one request on `resource` may be sent. Raises
+        RateLimitExceeded if that takes longer than the priority's max wait.
+        """
+        priority = priority or current_priority()
+        max_wait = self.max_wait_for(priority)
+        started = time.monotonic()
+        is_interactive = priority != PRIORITY_BATCH
+
+        if is_interactive:
+            with self._waiting_lock:
+                self._interactive_waiting += 1
+        try:
+            while True:
+                if not is_interactive and self._interactive_waiting:
+                    wait = 0.05
+                else:
+                    wait = self._try_acquire(resource, priority)
+                    if wait <= 0:
+                        break
+                waited = time.monotonic() - started
+                if waited + wait > max_wait:
+                    raise RateLimitExceeded(
+                        f"GitHub '{resource}' budget exhausted; next slot in {wait:.0f}s"
+                    )
+                time.sleep(min(wait, _MAX_SLEEP))
+        finally:
+            if is_interactive:
+                with self._waiting_lock:
+                    self._interactive_waiting -= 1
+
+        waited = time.monotonic() - started
+        with self._waiting_lock:
+            self._counters["granted"] += 1
+            if waited > 0.01:
+                self._counters["waited"] += 1
+                self._counters["wait_seconds"] += waited
+
+    def update(self, headers: Mapping[str, str]) -> None:
+        """Records the authoritative budget reported by GitHub."""
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        resource = headers.get("X-RateLimit-Resource", "core")
+        limit = int(headers.get("X-RateLimit-Limit", _DEFAULT_LIMIT))
+        with self.db.connect() as conn:
+            conn.execute(
+                "INSERT INTO rate_state (resource, rate_limit, remaining, reset_at) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(resource) DO UPDATE SET rate_limit = excluded.rate_limit, "
+                "remaining = excluded.remaining, reset_at = excluded.reset_at",
+                (resource, limit, int(remaining), float(reset)),
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        with self.db.connect() as conn:
+            rows = conn.execute("SELECT resource, rate_limit, remaining, reset_at FROM rate_state").fetchall()
+        with self._waiting_lock:
+            counters = dict(self._counters)
+        counters["budgets"] = {
+            resource: {"limit": limit, "remaining": remaining, "reset_at": reset_at}
+            for resource, limit, remaining, reset_at in rows
+        }
+        return counters
+
+
+def is_rate_limited(status_code: int, headers: Mapping[str, str]) -> bool:
+    """True for GitHub's primary (403/429 with no budget left) and secondary limits."""
+    if status_code not in (403, 429):
+        return False
+    return headers.get("X-RateLimit-Remaining") == "0" or "Retry-After" in headers
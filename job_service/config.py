@@ -0,0 +1,37 @@
+# job_service/config.py
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# SQLite file holding job state, shared by every app process.
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", os.path.join("instance", "jobs.db"))
+
+# Worker threads per app process.
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+
+# Maximum number of pending jobs before new submissions get a 429.
+JOB_MAX_PENDING = int(os.getenv("JOB_MAX_PENDING", "100"))
+
+# Finished jobs (completed or error) are deleted after this many seconds.
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "3600"))
+
+# A running job not updated for this long is considered lost (crashed
+# worker) and is re-queued, up to JOB_MAX_ATTEMPTS times.
+JOB_STALE_SECONDS = int(os.getenv("JOB_STALE_SECONDS", "900"))
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+
+# How often a process refreshes the jobs it is running, so long jobs are
+# never taken for lost ones. Must stay well below JOB_STALE_SECONDS.
+JOB_HEARTBEAT_SECONDS = float(os.getenv("JOB_HEARTBEAT_SECONDS", "60"))
+
+# Per-source concurrency limits, per process.
+JOB_SOURCE_LIMITS = {
+    "cv": int(os.getenv("JOB_LIMIT_CV", "2")),
+    "linkedin": int(os.getenv("JOB_LIMIT_LINKEDIN", "2")),
+    "github": int(os.getenv("JOB_LIMIT_GITHUB", "4")),
+}
+
+# How often idle workers look for jobs submitted by other processes.
+JOB_POLL_SECONDS = float(os.getenv("JOB_POLL_SECONDS", "1.0"))
@@ -0,0 +1,222 @@
+# job_service/queue.py
+import math
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, Optional
+
+from observability.tracing import span
+
+from .config import (
+    JOB_HEARTBEAT_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOB_MAX_PENDING,
+    JOB_POLL_SECONDS,
+    JOB_SOURCE_LIMITS,
+    JOB_STALE_SECONDS,
+    JOB_TTL_SECONDS,
+    JOB_WORKERS,
+)
+from .store import STATUS_PENDING, STATUS_RUNNING, JobStore
+
+
+class QueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Job queue is full, retry in {retry_after}s")
+        self.retry_after = retry_after
+
+
+class JobQueue:
+    """
+    A bounded pool of worker threads executing jobs persisted in a JobStore.
+
+    Jobs are claimed from SQLite rather than handed over in memory, so any
+    process sharing the database can pick them up, and pending jobs survive
+    a restart. Each source type has its own concurrency limit so that, for
+    example, a burst of CV uploads cannot starve GitHub lookups.
+
+    `cleanup` maps a source type to a function called with the payload of
+    its jobs once they are finished for good (completed, failed, abandoned
+    or purged), e.g. to delete an input file staged for the job. It runs
+    only then, so a job re-queued after a crash still finds its input.
+    """
+
+    def __init__(self, handlers: Dict[str, Callable[..., Any]],
+                 store: Optional[JobStore] = None,
+                 workers: int = JOB_WORKERS,
+                 max_pending: int = JOB_MAX_PENDING,
+                 source_limits: Optional[Dict[str, int]] = None,
+                 ttl_seconds: int = JOB_TTL_SECONDS,
+                 cleanup: Optional[Dict[str, Callable[..., Any]]] = None):
+        self.handlers = handlers
+        self.cleanup = cleanup or {}
+        self.store = store or JobStore()
+        self.workers = max(1, workers)
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        limits = source_limits or JOB_SOURCE_LIMITS
+        self._slots = {source: threading.BoundedSemaphore(limits.get(source, self.workers))
+                       for source in handlers}
+
+        self._wake_up = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+        self._maintenance_lock = threading.Lock()
+        self._last_maintenance = 0.0
+        # Jobs running in this process, refreshed by the heartbeat thread.
+        self._running = set()
+        self._running_lock = threading.Lock()
+        # Moving average of job durations, used to compute Retry-After.
+        self._avg_duration = 5.0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    def start(self) -> None:
+        """Starts the worker threads (idempotent)."""
+        if self._threads:
+            return
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        thread = threading.Thread(target=self._heartbeat_loop, name="job-heartbeat", daemon=True)
+        thread.start()
+        self._threads.append(thread)
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        self._stop.set()
+        self._wake_up.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+
+    def submit(self, source_type: str, **payload: Any) -> str:
+        """
+        Persists a new job and returns its id.
+        Raises QueueFullError when too many jobs are already pending.
+        """
+        if source_type not in self.handlers:
+            raise ValueError(f"Invalid source_type: '{source_type}'")
+
+        job_id = str(uuid.uuid4())
+        pending = self.store.create(job_id, source_type, payload, max_pending=self.max_pending)
+        if pending >= self.max_pending:
+            raise QueueFullError(self._retry_after(pending))
+        self._wake_up.set()
+        return job_id
+
+    def get_status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.store.get(job_id)
+
+    def depth(self) -> Dict[str, int]:
+        """Number of pending and running jobs across all processes."""
+        return {"pending": self.store.count(STATUS_PENDING),
+                "running": self.store.count(STATUS_RUNNING)}
+
+    # ------------------------------------------------------------------
+    # Workers
+    # ------------------------------------------------------------------
+    def _retry_after(self, pending: int) -> int:
+        return max(1, math.ceil(pending / self.workers * self._avg_duration))
+
+    def _acquire_sources(self):
+        """Reserves a slot on every source type that still has capacity."""
+        return [source for source, slot in self._slots.items() if slot.acquire(blocking=False)]
+
+    def _worker_loop(self) -> None:
+        while not self._stop.is_set():
+            self._maintenance()
+
+            reserved = self._acquire_sources()
+            job = None
+            try:
+                job = self.store.claim_next(reserved)
+            except Exception as e:
+                print(f"[JobQueue] Failed to claim a job: {e}")
+            finally:
+                # Keep only the slot of the claimed job's source.
+                for source in reserved:
+                    if job is None or source != job["source_type"]:
+                        self._slots[source].release()
+
+            if job is None:
+                self._wake_up.wait(JOB_POLL_SECONDS)
+                self._wake_up.clear()
+                continue
+
+            try:
+                self._run(job)
+            finally:
+                self._slots[job["source_type"]].release()
+                # A freed slot may unblock a job another worker skipped.
+                self._wake_up.set()
+
+    def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        print(f"[INFO] Démarrage du job {job_id}")
+        started = time.monotonic()
+        with self._running_lock:
+            self._running.add(job_id)
+        try:
+            with span(f"job.{job['source_type']}"):
+                result = self.handlers[job["source_type"]](**job["payload"])
+            if hasattr(result, "model_dump"):
+                result = result.model_dump()
+            self.store.complete(job_id, result)
+            print(f"[INFO] Job {job_id} terminé avec succès")
+        except Exception as e:
+            print(f"[ERREUR] Job {job_id}: {e}")
+            self.store.fail(job_id, str(e))
+        finally:
+            with self._running_lock:
+                self._running.discard(job_id)
+            duration = time.monotonic() - started
+            self._avg_duration = 0.8 * self._avg_duration + 0.2 * duration
+        self._cleanup(job)
+
+    def _cleanup(self, job: Dict[str, Any]) -> None:
+        cleanup = self.cleanup.get(job["source_type"])
+        if cleanup is None:
+            return
+        try:
+            cleanup(**job["payload"])
+        except Exception as e:
+            print(f"[JobQueue] Cleanup of job {job['job_id']} failed: {e}")
+
+    def _heartbeat_loop(self) -> None:
+        """
+        Refreshes the jobs running in this process every
+        JOB_HEARTBEAT_SECONDS, so `requeue_stale` only picks up jobs whose
+        process died, however long they take.
+        """
+        while not self._stop.wait(JOB_HEARTBEAT_SECONDS):
+            with self._running_lock:
+                running = list(self._running)
+            try:
+                self.store.heartbeat(running)
+            except Exception as e:
+                print(f"[JobQueue] Heartbeat failed: {e}")
+
+    def _maintenance(self) -> None:
+        """Periodically purges expired jobs and re-queues abandoned ones."""
+        now = time.monotonic()
+        if now - self._last_maintenance < 60 or not self._maintenance_lock.acquire(blocking=False):
+            return
+        try:
+            self._last_maintenance = now
+            purged = self.store.purge_finished(self.ttl_seconds)
+            requeued, abandoned = self.store.requeue_stale(JOB_STALE_SECONDS, JOB_MAX_ATTEMPTS)
+            # Cleanup is idempotent: purged jobs were normally cleaned up
+            # when they finished, unless their process died right after.
+            for job in purged + abandoned:
+                self._cleanup(job)
+            if purged or requeued or abandoned:
+                print(f"[JobQueue] Purged {len(purged)} expired job(s), re-queued {requeued} "
+                      f"and abandoned {len(abandoned)} stale job(s).")
+        except Exception as e:
+            print(f"[JobQueue] Maintenance failed: {e}")
+        finally:
+            self._maintenance_lock.release()
@@ -0,0 +1,176 @@
+# job_service/store.py
+import json
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from storage.sqlite import SQLiteDatabase
+
+from .config import JOB_DB_PATH
+
+STATUS_PENDING = "pending"
+STATUS_RUNNING = "running"
+STATUS_COMPLETED = "completed"
+STATUS_ERROR = "error"
+
+
+def _job(row: sqlite3.Row) -> Dict[str, Any]:
+    """The internal view of a job row, as handed to the workers."""
+    return {"job_id": row["job_id"], "source_type": row["source_type"],
+            "payload": json.loads(row["payload"])}
+
+
+class JobStore:
+    """
+    SQLite-backed persistence for background jobs.
+
+    Every app process (e.g. each gunicorn worker) opens the same database,
+    so a job submitted by one process can be executed by another and its
+    status can be read from any of them.
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH):
+        self.path = path
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id      TEXT PRIMARY KEY,
+                source_type TEXT NOT NULL,
+                payload     TEXT NOT NULL,
+                status      TEXT NOT NULL,
+                result      TEXT,
+                message     TEXT,
+                attempts    INTEGER NOT NULL DEFAULT 0,
+                created_at  REAL NOT NULL,
+                updated_at  REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, created_at)",
+        ], row_factory=sqlite3.Row)
+
+    def create(self, job_id: str, source_type: str, payload: Dict[str, Any],
+               max_pending: Optional[int] = None) -> int:
+        """
+        Inserts a pending job, unless `max_pending` jobs are already
+        pending. The count and the insert share one write transaction, so
+        concurrent submissions cannot overshoot the limit.
+
+        Returns the number of jobs that were pending before: the job was
+        created if and only if it is below `max_pending`.
+        """
+        now = time.time()
+        with self.db.transaction() as conn:
+            pending = conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (STATUS_PENDING,)).fetchone()[0]
+            if max_pending is None or pending < max_pending:
+                conn.execute(
+                    "INSERT INTO jobs (job_id, source_type, payload, status, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (job_id, source_type, json.dumps(payload), STATUS_PENDING, now, now),
+                )
+        return pending
+
+    def claim_next(self, source_types: Iterable[str]) -> Optional[Dict[str, Any]]:
+        """
+        Atomically moves the oldest pending job of one of `source_types`
+        to 'running' and returns it, or returns None if there is none.
+        """
+        source_types = list(source_types)
+        if not source_types:
+            return None
+        placeholders = ",".join("?" for _ in source_types)
+        # The write lock is taken up-front so two processes can never claim
+        # the same job.
+        with self.db.transaction() as conn:
+            row = conn.execute(
+                f"SELECT * FROM jobs WHERE status = ? AND source_type IN ({placeholders}) "
+                "ORDER BY created_at LIMIT 1",
+                [STATUS_PENDING, *source_types],
+            ).fetchone()
+            if row is not None:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, attempts = attempts + 1, updated_at = ? "
+                    "WHERE job_id = ?",
+                    (STATUS_RUNNING, time.time(), row["job_id"]),
+                )
+        return None if row is None else _job(row)
+
+    def complete(self, job_id: str, result: Any) -> None:
+        self._finish(job_id, STATUS_COMPLETED, result=json.dumps(result))
+
+    def fail(self, job_id: str, message: str) -> None:
+        self._finish(job_id, STATUS_ERROR, message=message)
+
+    def _finish(self, job_id: str, status: str, result: Optional[str] = None,
+                message: Optional[str] = None) -> None:
+        with self.db.connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, message = ?, updated_at = ? WHERE job_id = ?",
+                (status, result, message, time.time(), job_id),
+            )
+
+    def heartbeat(self, job_ids: Iterable[str]) -> None:
+        """Marks running jobs as still in progress (see requeue_stale)."""
+        job_ids = list(job_ids)
+        if not job_ids:
+            return
+        with self.db.connect() as conn:
+            conn.execute(
+                f"UPDATE jobs SET updated_at = ? WHERE status = ? "
+                f"AND job_id IN ({','.join('?' * len(job_ids))})",
+                (time.time(), STATUS_RUNNING, *job_ids),
+            )
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Returns the public view of a job, as served by /status/<job_id>."""
+        with self.db.connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {"status": row["status"]}
+        if row["status"] == STATUS_COMPLETED:
+            job["result"] = json.loads(row["result"])
+        elif row["status"] == STATUS_ERROR:
+            job["message"] = row["message"]
+        return job
+
+    def count(self, status: str) -> int:
+        with self.db.connect() as conn:
+            return conn.execute("SELECT COUNT(*) FROM jobs WHERE status = ?", (status,)).fetchone()[0]
+
+    def purge_finished(self, ttl_seconds: int) -> List[Dict[str, Any]]:
+        """Deletes completed/failed jobs older than `ttl_seconds` and returns them."""
+        cutoff = time.time() - ttl_seconds
+        with self.db.transaction() as conn:
+            rows = conn.execute(
+                "SELECT * FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                (STATUS_COMPLETED, STATUS_ERROR, cutoff),
+            ).fetchall()
+            conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(row["job_id"],) for row in rows])
+        return [_job(row) for row in rows]
+
+    def requeue_stale(self, stale_seconds: int, max_attempts: int) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Re-queues running jobs whose heartbeat stopped (their worker
+        crashed or was restarted); gives up after `max_attempts`. Both
+        updates run in one transaction, so no job is claimed or finished
+        between them.
+
+        Returns the number of re-queued jobs and the jobs given up on.
+        """
+        cutoff = time.time() - stale_seconds
+        now = time.time()
+        with self.db.transaction() as conn:
+            abandoned = conn.execute(
+                "SELECT * FROM jobs WHERE status = ? AND updated_at < ? AND attempts >= ?",
+                (STATUS_RUNNING, cutoff, max_attempts),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE jobs SET status = ?, message = ?, updated_at = ? WHERE job_id = ?",
+                [(STATUS_ERROR, "Job abandoned after repeated worker failures", now, row["job_id"])
+                 for row in abandoned],
+            )
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ? WHERE status = ? AND updated_at < ?",
+                (STATUS_PENDING, now, STATUS_RUNNING, cutoff),
+            ).rowcount
+        return requeued, [_job(row) for row in abandoned]
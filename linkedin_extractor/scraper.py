@@ -3,6 +3,9 @@ import os
 import requests
 from dotenv import load_dotenv
 
+from observability.metrics import HTTP_CLIENT_REQUESTS
+from observability.tracing import span
+
 # Import our new Pydantic model
 from .models import LinkedInProfile
 
@@ -34,7 +37,10 @@ class LinkedInScraperClient:
         params = {"key": self.api_key, "profileUrl": profile_url}
 
         # Make API call
-        response = requests.get(self.api_url, params=params, headers=self.headers, timeout=60)
+        with span("http.linkedin", url=self.api_url) as attributes:
+            response = requests.get(self.api_url, params=params, headers=self.headers, timeout=60)
+            attributes["status"] = response.status_code
+        HTTP_CLIENT_REQUESTS.inc(target="linkedin", status=response.status_code)
         response.raise_for_status()  # Raises an HTTPError for bad responses (4xx or 5xx)
 
         data = response.json()
@@ -50,7 +56,8 @@ class LinkedInScraperClient:
             headline=person_data.get("headline"),
             summary=person_data.get("summary"),
             location=person_data.get("geoFull"),  # Mapping 'geoFull' to 'location'
-            skills=person_data.get("skills", []),
+            # Scrapetable returns skills as plain strings.
+            skills=[{"name": s} if isinstance(s, str) else s for s in person_data.get("skills", [])],
             education=person_data.get("education", []),
             projects=person_data.get("projects", []),
             positions=person_data.get("positions", []),
@@ -0,0 +1,20 @@
+# llm_backends/base_backend.py
+from abc import ABC, abstractmethod
+from typing import Iterator, Optional
+
+
+class BaseLlmBackend(ABC):
+    """Abstract base class for all LLM backends."""
+    # Identifies the backend in cache keys and logs.
+    name = "base"
+
+    @abstractmethod
+    def generate(self, prompt: str, model: str, system: Optional[str] = None,
+                 json_output: bool = False) -> str:
+        """Returns the model's complete answer to `prompt`."""
+        pass
+
+    def stream(self, prompt: str, model: str, system: Optional[str] = None,
+               json_output: bool = False) -> Iterator[str]:
+        """Yields the answer in chunks as it is generated."""
+        yield self.generate(prompt, model, system=system, json_output=json_output)
@@ -0,0 +1,30 @@
+# llm_backends/config.py
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+
+# Backend per stage: "gemini", "openai", "replay" or "stub".
+# LLM_BACKEND, when set, overrides both (e.g. LLM_BACKEND=stub in CI).
+LLM_BACKEND = os.getenv("LLM_BACKEND")
+CV_LLM_BACKEND = LLM_BACKEND or os.getenv("CV_LLM_BACKEND", "gemini")
+ENHANCER_LLM_BACKEND = LLM_BACKEND or os.getenv("ENHANCER_LLM_BACKEND", "openai")
+# Model per stage. The gemini and openai backends reject a model of another
+# provider (ValueError), so moving a stage to another backend means setting
+# its models too: CV_LLM_MODEL and CV_MODEL_* (cv_extractor/config.py),
+# ENHANCER_LLM_MODEL and ENHANCER_FIELD_MODEL (enhancement_service/config.py).
+CV_LLM_MODEL = os.getenv("CV_LLM_MODEL", "gemini-1.5-pro")
+ENHANCER_LLM_MODEL = os.getenv("ENHANCER_LLM_MODEL", "gpt-4o")
+
+# Replay backend: recorded responses keyed by a hash of (model, system, prompt).
+LLM_REPLAY_PATH = os.getenv("LLM_REPLAY_PATH", os.path.join("instance", "llm_replay.db"))
+# Backend called on a replay miss. A real backend ("gemini", "openai") records
+# its answer for the next run; "stub" keeps everything offline.
+LLM_REPLAY_UPSTREAM = os.getenv("LLM_REPLAY_UPSTREAM", "stub")
+
+# Simulated generation time of the stub backend, in seconds per call.
+LLM_STUB_LATENCY = float(os.getenv("LLM_STUB_LATENCY", "0"))
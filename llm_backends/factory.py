@@ -0,0 +1,44 @@
+# llm_backends/factory.py
+import threading
+from typing import Dict
+
+from .base_backend import BaseLlmBackend
+from .config import LLM_REPLAY_UPSTREAM
+
+BACKEND_NAMES = ("gemini", "openai", "replay", "stub")
+
+_backends: Dict[str, BaseLlmBackend] = {}
+_backends_lock = threading.RLock()  # "replay" creates its upstream under the lock
+
+
+def create_backend(name: str) -> BaseLlmBackend:
+    """
+    Factory function to build an LLM backend by name. Provider SDKs are
+    imported here, so an offline setup never needs them installed.
+    """
+    if name == "gemini":
+        from .gemini_backend import GeminiBackend
+        return GeminiBackend()
+    elif name == "openai":
+        from .openai_backend import OpenAIBackend
+        return OpenAIBackend()
+    elif name == "stub":
+        from .stub_backend import StubBackend
+        return StubBackend()
+    elif name == "replay":
+        from .replay_backend import ReplayBackend
+        upstream = get_backend(LLM_REPLAY_UPSTREAM) if LLM_REPLAY_UPSTREAM else None
+        return ReplayBackend(upstream=upstream)
+    else:
+        raise ValueError(f"Unsupported LLM backend: {name} (expected one of {', '.join(BACKEND_NAMES)})")
+
+
+def get_backend(name: str) -> BaseLlmBackend:
+    """The process-wide backend called `name`, created on first use."""
+    backend = _backends.get(name)
+    if backend is None:
+        with _backends_lock:
+            backend = _backends.get(name)
+            if backend is None:
+                backend = _backends[name] = create_backend(name)
+    return backend
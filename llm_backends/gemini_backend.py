@@ -0,0 +1,33 @@
+# llm_backends/gemini_backend.py
+from typing import Iterator, Optional
+import google.generativeai as genai
+from .base_backend import BaseLlmBackend
+from .config import GEMINI_API_KEY
+
+
+class GeminiBackend(BaseLlmBackend):
+    name = "gemini"
+
+    def __init__(self, api_key: Optional[str] = GEMINI_API_KEY):
+        genai.configure(api_key=api_key)
+
+    def _model(self, model: str, system: Optional[str]):
+        if not model.startswith("gemini"):
+            raise ValueError(f"The {self.name} backend cannot run model '{model}'")
+        return genai.GenerativeModel(model, system_instruction=system)
+
+    @staticmethod
+    def _config(json_output: bool):
+        return {"response_mime_type": "application/json"} if json_output else None
+
+    def generate(self, prompt: str, model: str, system: Optional[str] = None,
+                 json_output: bool = False) -> str:
+        response = self._model(model, system).generate_content(
+            prompt, generation_config=self._config(json_output))
+        return response.text
+
+    def stream(self, prompt: str, model: str, system: Optional[str] = None,
+               json_output: bool = False) -> Iterator[str]:
+        for chunk in self._model(model, system).generate_content(
+                prompt, generation_config=self._config(json_output), stream=True):
+            yield chunk.text
@@ -0,0 +1,35 @@
+# llm_backends/openai_backend.py
+from typing import Iterator, Optional
+from openai import OpenAI
+from .base_backend import BaseLlmBackend
+from .config import OPENAI_API_KEY
+
+
+class OpenAIBackend(BaseLlmBackend):
+    name = "openai"
+
+    def __init__(self, api_key: Optional[str] = OPENAI_API_KEY):
+        self.client = OpenAI(api_key=api_key)
+
+    def _request(self, prompt: str, model: str, system: Optional[str], json_output: bool) -> dict:
+        if not model.startswith(("gpt", "o1", "o3", "o4")):
+            raise ValueError(f"The {self.name} backend cannot run model '{model}'")
+        messages = [{"role": "system", "content": system}] if system else []
+        messages.append({"role": "user", "content": prompt})
+        request = {"model": model, "messages": messages}
+        if json_output:
+            request["response_format"] = {"type": "json_object"}
+        return request
+
+    def generate(self, prompt: str, model: str, system: Optional[str] = None,
+                 json_output: bool = False) -> str:
+        response = self.client.chat.completions.create(**self._request(prompt, model, system, json_output))
+        return response.choices[0].message.content
+
+    def stream(self, prompt: str, model: str, system: Optional[str] = None,
+               json_output: bool = False) -> Iterator[str]:
+        stream = self.client.chat.completions.create(
+            **self._request(prompt, model, system, json_output), stream=True)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
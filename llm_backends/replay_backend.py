@@ -0,0 +1,78 @@
+# llm_backends/replay_backend.py
+import hashlib
+import time
+from typing import Iterator, Optional
+
+from storage.sqlite import SQLiteDatabase
+
+from .base_backend import BaseLlmBackend
+from .config import LLM_REPLAY_PATH
+
+_CHUNK_SIZE = 40
+
+
+def prompt_key(prompt: str, model: str, system: Optional[str] = None) -> str:
+    """Recording key of a request."""
+    payload = "\x00".join((model, system or "", prompt))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReplayBackend(BaseLlmBackend):
+    """
+    Answers from responses recorded in a SQLite file, keyed by the hash of
+    (model, system prompt, prompt).
+
+    On a miss the request goes to `upstream`: a real backend's answer is
+    recorded, so a run with network access fills the file and later runs
+    replay it offline; with the stub backend as upstream the answer is
+    returned but not recorded.
+    """
+    name = "replay"
+
+    def __init__(self, path: str = LLM_REPLAY_PATH, upstream: Optional[BaseLlmBackend] = None):
+        self.path = path
+        self.upstream = upstream
+        self.record = upstream is not None and upstream.name != "stub"
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS recordings (
+                key         TEXT PRIMARY KEY,
+                model       TEXT NOT NULL,
+                response    TEXT NOT NULL,
+                recorded_at REAL NOT NULL
+            )
+            """,
+        ])
+
+    def lookup(self, key: str) -> Optional[str]:
+        with self.db.connect() as conn:
+            row = conn.execute("SELECT response FROM recordings WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def save(self, key: str, model: str, response: str) -> None:
+        with self.db.connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO recordings (key, model, response, recorded_at) VALUES (?, ?, ?, ?)",
+                (key, model, response, time.time()),
+            )
+
+    def generate(self, prompt: str, model: str, system: Optional[str] = None,
+                 json_output: bool = False) -> str:
+        key = prompt_key(prompt, model, system)
+        response = self.lookup(key)
+        if response is not None:
+            return response
+        if self.upstream is None:
+            raise LookupError(f"No recorded LLM response for prompt {key[:12]} (model {model})")
+
+        print(f"[ReplayBackend] Miss for {key[:12]}; asking '{self.upstream.name}'")
+        response = self.upstream.generate(prompt, model, system=system, json_output=json_output)
+        if self.record:
+            self.save(key, model, response)
+        return response
+
+    def stream(self, prompt: str, model: str, system: Optional[str] = None,
+               json_output: bool = False) -> Iterator[str]:
+        response = self.generate(prompt, model, system=system, json_output=json_output)
+        for i in range(0, len(response), _CHUNK_SIZE):
+            yield response[i:i + _CHUNK_SIZE]
@@ -0,0 +1,172 @@
+# llm_backends/stub_backend.py
+import json
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from .base_backend import BaseLlmBackend
+from .config import LLM_STUB_LATENCY
+
+_YEAR = re.compile(r"\b(19|20)\d{2}\b")
+_SEPARATOR = re.compile(r"\s+[–—|-]\s+|\t+")
+_HEADING = re.compile(r"^[A-Z][A-Z &/'’-]{3,}$")
+_CHUNK_SIZE = 40
+
+
+def _block(prompt: str, marker: str) -> Optional[str]:
+    """The text between the two '---' lines following `marker`."""
+    start = prompt.find(marker)
+    if start < 0:
+        return None
+    lines = prompt[start:].splitlines()[1:]
+    try:
+        begin = lines.index("---")
+        end = lines.index("---", begin + 1)
+    except ValueError:
+        return None
+    return "\n".join(lines[begin + 1:end])
+
+
+def _json_after(prompt: str, marker: str) -> Any:
+    """The first line after `marker` that parses as JSON."""
+    start = prompt.find(marker)
+    if start < 0:
+        return None
+    for line in prompt[start:].splitlines()[1:]:
+        try:
+            return json.loads(line)
+        except ValueError:
+            continue
+    return None
+
+
+def _output_fields(prompt: str) -> List[str]:
+    """Top-level properties of the last JSON schema in the prompt."""
+    for line in reversed(prompt.splitlines()):
+        line = line.strip()
+        if line.startswith("{"):
+            try:
+                return list(json.loads(line).get("properties", {}))
+            except ValueError:
+                continue
+    return []
+
+
+class StubBackend(BaseLlmBackend):
+    """
+    A deterministic, offline stand-in for an LLM. It recognizes the
+    prompts of this project and answers them with simple rules: the CV
+    extraction prompts get skills from the NLP list and "Label: a, b"
+    lines, positions from dated lines and projects from the PROJECTS
+    section; the enhancement prompt gets its input back, without the
+    skills it was given as context, and a templated summary; the field
+    enhancement prompts get their description back, or that summary.
+
+    The output is meant to exercise the pipeline end to end (throughput
+    tests, CI), not to be accurate.
+    """
+    name = "stub"
+
+    def __init__(self, latency: float = LLM_STUB_LATENCY):
+        self.latency = latency
+
+    def generate(self, prompt: str, model: str, system: Optional[str] = None,
+                 json_output: bool = False) -> str:
+        if self.latency:
+            time.sleep(self.latency)
+        fields = _output_fields(prompt)
+        if "contact_info" in fields:
+            return json.dumps(self._enhance(prompt))
+        if fields == ["text"]:
+            return json.dumps({"text": self._enhance_field(prompt)})
+        return json.dumps(self._extract(prompt, fields))
+
+    def stream(self, prompt: str, model: str, system: Optional[str] = None,
+               json_output: bool = False) -> Iterator[str]:
+        answer = self.generate(prompt, model, system=system, json_output=json_output)
+        for i in range(0, len(answer), _CHUNK_SIZE):
+            yield answer[i:i + _CHUNK_SIZE]
+
+    # --- CV extraction ---
+
+    def _extract(self, prompt: str, fields: List[str]) -> Dict[str, Any]:
+        text = _block(prompt, "**Resume Text:**") or ""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        result = {}
+        if "skills" in fields:
+            result["skills"] = [{"name": name} for name in self._skills(prompt, lines)]
+        if "work_experience" in fields:
+            result["work_experience"] = self._positions(lines)
+        if "projects" in fields:
+            # A projects-only prompt receives the PROJECTS section without its heading.
+            result["projects"] = self._projects(lines, in_section=fields == ["projects"])
+        return result
+
+    @staticmethod
+    def _skills(prompt: str, lines: List[str]) -> List[str]:
+        names = list(_json_after(prompt, "**Skills found by NLP Tool:**") or [])
+        for line in lines:
+            label, sep, values = line.partition(":")
+            if not sep or len(label.split()) > 6:
+                continue
+            for value in re.split(r"[,;]", values):
+                value = re.sub(r"\(.*?\)", "", value).strip(" .")
+                if value and len(value.split()) <= 3:
+                    names.append(value)
+        seen, skills = set(), []
+        for name in names:
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                skills.append(name)
+        return skills
+
+    @staticmethod
+    def _positions(lines: List[str]) -> List[Dict[str, Any]]:
+        positions = []
+        for i, line in enumerate(lines):
+            parts = [p.strip() for p in _SEPARATOR.split(line) if p.strip()]
+            if not _YEAR.search(line) or len(parts) < 2 or len(parts[0].split()) > 8:
+                continue
+            company = parts[1]
+            if _YEAR.search(company) and i > 0:
+                company = _SEPARATOR.split(lines[i - 1])[0].strip()
+            description = []
+            for following in lines[i + 1:i + 6]:
+                if _YEAR.search(following) or _HEADING.match(following):
+                    break
+                description.append(following)
+            positions.append({"job_title": parts[0], "company": company,
+                              "description": "\n".join(description) or None, "inferred_skills": []})
+        return positions
+
+    @staticmethod
+    def _projects(lines: List[str], in_section: bool = False) -> List[Dict[str, Any]]:
+        projects = []
+        for line in lines:
+            if _HEADING.match(line):
+                in_section = "PROJECT" in line.upper()
+                continue
+            if in_section and len(line.split()) <= 12 and not line.endswith(".") and ":" not in line:
+                projects.append({"project_name": line, "description": None, "inferred_skills": []})
+        return projects
+
+    # --- Enhancement ---
+
+    @staticmethod
+    def _enhance(prompt: str) -> Dict[str, Any]:
+        data = json.loads(_block(prompt, "**Unified Profile Data to Refine:**") or "{}")
+        skills = data.pop("skills", [])
+        data.setdefault("contact_info", {})
+        if skills:
+            name = data.get("full_name") or "The candidate"
+            data["summary"] = f"{name} is a professional skilled in {', '.join(skills[:5])}."
+        return data
+
+    @staticmethod
+    def _enhance_field(prompt: str) -> str:
+        data = _json_after(prompt, "**Input:**") or {}
+        if "description" in data:
+            return data["description"]
+        skills = data.get("skills", [])
+        return (f"A professional skilled in {', '.join(skills[:5])}." if skills
+                else data.get("summary") or "A professional.")
@@ -0,0 +1,68 @@
+# llm_backends/traced_backend.py
+import time
+from typing import Iterator, Optional
+
+from observability.metrics import LLM_CALLS, LLM_TOKENS
+from observability.tracing import record_span, span
+
+from .base_backend import BaseLlmBackend
+
+
+def _count_tokens(text: str) -> int:
+    # Imported here: cv_extractor itself builds backends on import.
+    from cv_extractor.extractors.prompt_builder import count_tokens
+    return count_tokens(text)
+
+
+class TracedBackend(BaseLlmBackend):
+    """
+    Wraps a backend so that every call is an "llm" span carrying the
+    backend, model and estimated prompt/completion token counts, and is
+    counted in the LLM metrics. Callers see the wrapped backend's name.
+    """
+
+    def __init__(self, backend: BaseLlmBackend):
+        self.backend = backend
+        self.name = backend.name
+
+    def _account(self, attributes: dict, model: str, prompt: str, system: Optional[str],
+                 answer: Optional[str]) -> None:
+        attributes["prompt_tokens"] = _count_tokens((system or "") + prompt)
+        LLM_TOKENS.inc(attributes["prompt_tokens"], backend=self.name, model=model, kind="prompt")
+        if answer is None:
+            LLM_CALLS.inc(backend=self.name, model=model, outcome="error")
+            return
+        attributes["completion_tokens"] = _count_tokens(answer)
+        LLM_TOKENS.inc(attributes["completion_tokens"], backend=self.name, model=model, kind="completion")
+        LLM_CALLS.inc(backend=self.name, model=model, outcome="ok")
+
+    def generate(self, prompt: str, model: str, system: Optional[str] = None,
+                 json_output: bool = False) -> str:
+        with span("llm", backend=self.name, model=model) as attributes:
+            answer = None
+            try:
+                answer = self.backend.generate(prompt, model, system=system, json_output=json_output)
+            finally:
+                self._account(attributes, model, prompt, system, answer)
+        return answer
+
+    def stream(self, prompt: str, model: str, system: Optional[str] = None,
+               json_output: bool = False) -> Iterator[str]:
+        started = time.perf_counter()
+        attributes = {"backend": self.name, "model": model, "streamed": True}
+        chunks, complete = [], False
+        try:
+            for chunk in self.backend.stream(prompt, model, system=system, json_output=json_output):
+                if not chunks:
+                    attributes["first_chunk_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                chunks.append(chunk)
+                yield chunk
+            complete = True
+        finally:
+            self._account(attributes, model, prompt, system, "".join(chunks) if complete else None)
+            record_span("llm", started, **attributes)
+
+
+def traced(backend: BaseLlmBackend) -> BaseLlmBackend:
+    """`backend` wrapped in a TracedBackend (unless it already is one)."""
+    return backend if isinstance(backend, TracedBackend) else TracedBackend(backend)
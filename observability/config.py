@@ -0,0 +1,16 @@
+# observability/config.py
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# Upper bounds (seconds) of the latency histogram buckets exposed on /metrics.
+METRICS_LATENCY_BUCKETS = tuple(
+    float(b) for b in os.getenv(
+        "METRICS_LATENCY_BUCKETS", "0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60,120"
+    ).split(",")
+)
+
+# Prefix of every metric name.
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "skillsense")
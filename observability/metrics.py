@@ -0,0 +1,188 @@
+# observability/metrics.py
+import functools
+import math
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import METRICS_LATENCY_BUCKETS, METRICS_NAMESPACE
+
+# A callback returns the current samples of a metric as (labels, value) pairs.
+Samples = Iterable[Tuple[Dict[str, str], float]]
+
+# Results of the per_scrape functions during the current render.
+_scrape = threading.local()
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base of the metric types: a name, a help text and fixed label names."""
+    type = "untyped"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 callback: Optional[Callable[[], Samples]] = None):
+        self.name = f"{METRICS_NAMESPACE}_{name}"
+        self.help = help
+        self.labels = tuple(labels)
+        self.callback = callback
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def _key(self, labels: Dict[str, str]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _format_labels(self, key: Tuple[str, ...], extra: Optional[Dict[str, str]] = None) -> str:
+        pairs = list(zip(self.labels, key)) + list((extra or {}).items())
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def _samples(self) -> List[Tuple[Tuple[str, ...], float]]:
+        if self.callback is not None:
+            return [(self._key(labels), value) for labels, value in self.callback()]
+        with self._lock:
+            return list(self._values.items())
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        for key, value in self._samples():
+            lines.append(f"{self.name}{self._format_labels(key)} {_format_value(value)}")
+        return lines
+
+
+class Counter(_Metric):
+    """A value that only goes up (requests, tokens, errors)."""
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """A value that goes up and down, usually read from a callback at scrape time."""
+    type = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, plus their sum and count."""
+    type = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            # One count per bucket, then sum and count.
+            series = self._series.setdefault(key, [0] * (len(self.buckets) + 2))
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            series = {key: list(values) for key, values in self._series.items()}
+        for key, values in series.items():
+            for bound, count in zip(self.buckets, values):
+                le = {"le": _format_value(bound)}
+                lines.append(f"{self.name}_bucket{self._format_labels(key, le)} {count}")
+            lines.append(f"{self.name}_sum{self._format_labels(key)} {_format_value(values[-2])}")
+            lines.append(f"{self.name}_count{self._format_labels(key)} {values[-1]}")
+        return lines
+
+
+class MetricsRegistry:
+    """The metrics of this process, rendered in the Prometheus text format."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        """Adds `metric`; a metric already registered under its name is returned instead."""
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        _scrape.results = {}
+        try:
+            for metric in metrics:
+                try:
+                    lines.extend(metric.render())
+                except Exception as e:
+                    # A failing callback (e.g. a locked database) must not break the scrape.
+                    print(f"[Metrics] Could not collect '{metric.name}': {e}")
+        finally:
+            _scrape.results = None
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+
+def per_scrape(fn: Callable[[], Any]) -> Callable[[], Any]:
+    """
+    Runs `fn` at most once per scrape, so several callbacks can read the
+    same stats (e.g. a database query) without repeating it.
+    """
+    @functools.wraps(fn)
+    def wrapper():
+        results = getattr(_scrape, "results", None)
+        if results is None:
+            return fn()
+        if fn not in results:
+            results[fn] = fn()
+        return results[fn]
+    return wrapper
+
+
+def counter(name: str, help: str, labels: Tuple[str, ...] = (),
+            callback: Optional[Callable[[], Samples]] = None) -> Counter:
+    return registry.register(Counter(name, help, labels, callback=callback))
+
+
+def gauge(name: str, help: str, labels: Tuple[str, ...] = (),
+          callback: Optional[Callable[[], Samples]] = None) -> Gauge:
+    return registry.register(Gauge(name, help, labels, callback=callback))
+
+
+def histogram(name: str, help: str, labels: Tuple[str, ...] = (),
+              buckets: Tuple[float, ...] = METRICS_LATENCY_BUCKETS) -> Histogram:
+    return registry.register(Histogram(name, help, labels, buckets=buckets))
+
+
+# --- Metrics shared by the pipeline modules ---
+
+STAGE_SECONDS = histogram(
+    "stage_duration_seconds", "Duration of each traced pipeline stage.", ("stage",))
+LLM_CALLS = counter(
+    "llm_requests_total", "LLM calls by backend, model and outcome.", ("backend", "model", "outcome"))
+LLM_TOKENS = counter(
+    "llm_tokens_total", "Estimated LLM tokens by backend, model and direction.", ("backend", "model", "kind"))
+HTTP_CLIENT_REQUESTS = counter(
+    "outbound_http_requests_total", "Requests sent to external APIs.", ("target", "status"))
+HTTP_SERVER_SECONDS = histogram(
+    "http_request_duration_seconds", "Latency of the API endpoints.", ("endpoint", "method", "status"))
@@ -0,0 +1,111 @@
+# observability/tracing.py
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from .metrics import STAGE_SECONDS
+
+_span_ids = itertools.count(1)
+
+
+class Trace:
+    """The spans recorded while handling one request, from any thread."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._spans: List[Dict[str, Any]] = []
+
+    def add(self, span: Dict[str, Any]) -> None:
+        with self._lock:
+            self._spans.append(span)
+
+    def breakdown(self) -> Dict[str, Any]:
+        """
+        The spans as a tree (children under the span that was open when
+        they started), with start offsets and durations in milliseconds,
+        plus the total time per stage name.
+        """
+        with self._lock:
+            spans = sorted(self._spans, key=lambda s: s["start"])
+        nodes, roots, stages = {}, [], {}
+        for span in spans:
+            nodes[span["id"]] = {
+                "name": span["name"],
+                "start_ms": round((span["start"] - self.started) * 1000, 2),
+                "duration_ms": round(span["duration"] * 1000, 2),
+                **({"attributes": span["attributes"]} if span["attributes"] else {}),
+                "children": [],
+            }
+            stages[span["name"]] = stages.get(span["name"], 0.0) + span["duration"] * 1000
+        for span in spans:
+            parent = nodes.get(span["parent"])
+            (parent["children"] if parent else roots).append(nodes[span["id"]])
+        return {
+            "total_ms": round((time.perf_counter() - self.started) * 1000, 2),
+            "stages_ms": {name: round(ms, 2) for name, ms in stages.items()},
+            "spans": roots,
+        }
+
+
+# The trace of the current request (None when no breakdown was asked for)
+# and the innermost open span. Thread pools that should report into the
+# request's trace submit through `contextvars.copy_context().run`.
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+_current_span: ContextVar[Optional[int]] = ContextVar("span", default=None)
+
+
+def start_trace():
+    """Starts collecting spans for the current context; returns the token for `end_trace`."""
+    return _current_trace.set(Trace())
+
+
+def current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+def end_trace(token) -> None:
+    _current_trace.reset(token)
+
+
+def _record(name: str, started: float, attributes: Dict[str, Any],
+            span_id: int, parent: Optional[int]) -> None:
+    duration = time.perf_counter() - started
+    STAGE_SECONDS.observe(duration, stage=name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add({"id": span_id, "parent": parent, "name": name, "start": started,
+                   "duration": duration, "attributes": attributes})
+
+
+def record_span(name: str, started: float, **attributes) -> None:
+    """
+    Records a span that began at `started` (a perf_counter value) and ends
+    now. Used by generators, which cannot keep a span open across their
+    yields; everything else uses `span`.
+    """
+    _record(name, started, attributes, next(_span_ids), _current_span.get())
+
+
+@contextmanager
+def span(name: str, **attributes) -> Iterator[Dict[str, Any]]:
+    """
+    Times the enclosed block as stage `name`: the duration goes to the
+    stage latency histogram and, when the request asked for a timing
+    breakdown, into its trace. Yields the attribute dict so the block can
+    add results (status codes, token counts, ...).
+    """
+    span_id, parent = next(_span_ids), _current_span.get()
+    token = _current_span.set(span_id)
+    started = time.perf_counter()
+    try:
+        yield attributes
+    except Exception as e:
+        attributes["error"] = e.__class__.__name__
+        raise
+    finally:
+        _current_span.reset(token)
+        _record(name, started, attributes, span_id, parent)
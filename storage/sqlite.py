@@ -0,0 +1,56 @@
+# storage/sqlite.py
+import os
+import sqlite3
+from contextlib import contextmanager
+from typing import Callable, Iterable, Optional
+
+
+class SQLiteDatabase:
+    """
+    A SQLite file shared by every process of the application, used by the
+    stores and caches (jobs, profiles, extraction and enhancement caches,
+    GitHub HTTP cache and rate-limit state, embeddings, LLM recordings).
+
+    The database runs in WAL mode: readers never wait for a writer, and a
+    write only waits for other writes. Connections are opened per
+    operation. `connect` yields an autocommit connection; `transaction`
+    yields one inside a write transaction taken up front (BEGIN IMMEDIATE),
+    so a read-modify-write cannot interleave with another process doing
+    the same.
+    """
+
+    def __init__(self, path: str, schema: Iterable[str] = (),
+                 row_factory: Optional[Callable] = None, timeout: float = 30):
+        self.path = path
+        self.row_factory = row_factory
+        self.timeout = timeout
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in schema:
+                conn.execute(statement)
+
+    @contextmanager
+    def connect(self):
+        """Yields an autocommit connection that is always closed."""
+        conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+        if self.row_factory is not None:
+            conn.row_factory = self.row_factory
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def transaction(self):
+        """Yields a connection inside a write transaction, committed on success."""
+        with self.connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
@@ -0,0 +1,67 @@
+# test_batch.py
+import os
+
+import pytest
+
+from cv_extractor import batch, pipeline
+from cv_extractor.models.cv_models import Skill
+from cv_extractor.registry import ModelRegistry
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+DOCX_CV = os.path.join(FIXTURES, "Gaurav_Kumar.docx")
+PDF_CV = os.path.join(FIXTURES, "Gaurav_Kumar.pdf")
+
+
+class FakeNlpExtractor:
+    def __init__(self):
+        self.batches = []
+
+    def extract_many(self, texts):
+        texts = list(texts)
+        self.batches.append(len(texts))
+        return [[Skill(name="python", evidence=[])] for _ in texts]
+
+
+class FakeLlmExtractor:
+    version = "test"
+
+    def extract(self, text, nlp_skills):
+        return {"skills": [{"name": "Python"}], "work_experience": [], "projects": []}
+
+
+@pytest.fixture
+def nlp(monkeypatch):
+    """Fake extractors in a private registry, caching off."""
+    extractor = FakeNlpExtractor()
+    registry = ModelRegistry()
+    registry.register("nlp_skill_extractor", lambda: extractor)
+    registry.register("llm_data_extractor", FakeLlmExtractor)
+    for module in (batch, pipeline):
+        monkeypatch.setattr(module, "registry", registry)
+        monkeypatch.setattr(module, "get_cache", lambda: None)
+    return extractor
+
+
+def test_a_chunk_is_tagged_in_one_nlp_batch(nlp, tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+
+    items = batch._parse_chunk([DOCX_CV, str(broken), PDF_CV])
+
+    assert nlp.batches == [2]
+    assert [item[0] for item in items] == [DOCX_CV, str(broken), PDF_CV]
+    assert items[1][4].startswith("Parsing failed:")
+    assert items[0][3] == [{"name": "python", "evidence": []}]
+
+
+def test_batch_streams_one_result_per_file(nlp, tmp_path):
+    broken = tmp_path / "broken.pdf"
+    broken.write_bytes(b"not a pdf")
+
+    results = {result.file_path: result
+               for result in batch.extract_cv_batch([DOCX_CV, str(broken), PDF_CV], n_process=1, batch_size=2)}
+
+    assert set(results) == {DOCX_CV, str(broken), PDF_CV}
+    assert results[str(broken)].error.startswith("Parsing failed:")
+    assert [skill.name for skill in results[DOCX_CV].cv.skills] == ["python"]
+    assert nlp.batches == [1, 1]
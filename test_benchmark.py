@@ -0,0 +1,30 @@
+# test_benchmark.py
+import os
+from unittest import mock
+
+import pytest
+
+from benchmarks.pipeline import DEFAULT_CVS, ROOT_DIR, STAGES, PipelineBench, percentile, run_level
+
+
+@pytest.fixture
+def bench():
+    bench = PipelineBench(llm_latency=0.0, skip_skillner=True)
+    yield bench
+    # PipelineBench patches the LinkedIn HTTP call for the whole run.
+    mock.patch.stopall()
+
+
+def test_the_pipeline_benchmark_times_every_stage(bench):
+    level = run_level(bench, [os.path.join(ROOT_DIR, DEFAULT_CVS[0])], concurrency=2, docs=2)
+
+    assert level["errors"] == []
+    assert level["docs_per_sec"] > 0
+    assert set(level["stages_s"]) == set(STAGES)
+    assert level["latency_s"]["p95"] >= level["latency_s"]["p50"] > 0
+
+
+def test_percentile_uses_the_nearest_rank():
+    values = [5, 1, 4, 2, 3]
+
+    assert (percentile(values, 50), percentile(values, 95), percentile([], 50)) == (3, 5, 0.0)
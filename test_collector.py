@@ -0,0 +1,37 @@
+# test_collector.py
+import threading
+import time
+
+from unification_service.collector import collect_sources
+
+
+def test_sources_run_concurrently():
+    started = time.monotonic()
+
+    results, errors = collect_sources({name: lambda name=name: (time.sleep(0.3), name)[1]
+                                       for name in ("cv", "linkedin", "github")}, deadline=5)
+
+    assert results == {"cv": "cv", "linkedin": "linkedin", "github": "github"}
+    assert errors == {}
+    assert time.monotonic() - started < 0.8
+
+
+def test_a_failed_source_does_not_sink_the_others():
+    def broken():
+        raise RuntimeError("profile is private")
+
+    results, errors = collect_sources({"cv": lambda: "cv data", "linkedin": broken}, deadline=5)
+
+    assert results == {"cv": "cv data"}
+    assert errors == {"linkedin": "profile is private"}
+
+
+def test_the_deadline_drops_slow_sources():
+    release = threading.Event()
+    try:
+        results, errors = collect_sources({"cv": lambda: "cv data", "github": release.wait}, deadline=0.3)
+    finally:
+        release.set()
+
+    assert results == {"cv": "cv data"}
+    assert errors == {"github": "timed out after 0.3s"}
@@ -0,0 +1,40 @@
+# test_cv_cache.py
+from cv_extractor.cache import TIER_LLM, TIER_NLP, TIER_TEXT, ExtractionCache, file_sha256
+
+
+def test_get_or_compute_runs_each_stage_once_per_version(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.db"))
+    file_hash = file_sha256(b"%PDF cv")
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return "parsed text"
+
+    assert cache.get_or_compute(file_hash, TIER_TEXT, "1", compute) == "parsed text"
+    assert cache.get_or_compute(file_hash, TIER_TEXT, "1", compute) == "parsed text"
+    assert len(calls) == 1
+    # A new component version is a miss; the other tiers are untouched.
+    assert cache.get(file_hash, TIER_TEXT, "2") is None
+    assert cache.get(file_hash, TIER_NLP, "1") is None
+    tiers = cache.stats()["tiers"]
+    assert (tiers[TIER_TEXT]["hits"], tiers[TIER_TEXT]["misses"], tiers[TIER_NLP]["misses"]) == (1, 2, 1)
+
+
+def test_empty_results_are_not_stored(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.db"))
+
+    cache.get_or_compute("hash", TIER_LLM, "1", dict)
+
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted_over_budget(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache.db"), max_bytes=250)
+    for name in ("a", "b", "c"):
+        cache.put(name, TIER_TEXT, "1", "x" * 100)
+
+    assert cache.get("a", TIER_TEXT, "1") is None
+    assert cache.get("c", TIER_TEXT, "1") == "x" * 100
+    assert cache.stats()["size_bytes"] <= 250
+    assert cache.invalidate(file_hash="c") == 1
@@ -0,0 +1,55 @@
+# test_dedup.py
+import re
+
+import numpy
+
+from unification_service.dedup import cluster, deduplicate
+
+
+class BagOfWordsEmbedder:
+    """Normalized word counts: the cosine similarity of two texts is their word overlap."""
+
+    def __init__(self):
+        self.vocabulary = {}
+
+    def encode(self, texts):
+        rows = [re.findall(r"\w+", text.lower()) for text in texts]
+        for words in rows:
+            for word in words:
+                self.vocabulary.setdefault(word, len(self.vocabulary))
+        vectors = numpy.zeros((len(texts), 256), dtype=numpy.float32)
+        for row, words in enumerate(rows):
+            for word in words:
+                vectors[row, self.vocabulary[word]] += 1
+        return vectors / numpy.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def _experience(title, description):
+    return {"job_title": title, "company_name": "Acme", "description": description}
+
+
+def test_two_roles_at_one_company_are_kept_apart():
+    experiences = [_experience("Developer", "Built the payments API in Go"),
+                   _experience("Senior Developer", "Led hiring and ran the platform team roadmap")]
+
+    result = deduplicate(experiences, ["cv", "linkedin"], [], BagOfWordsEmbedder())
+
+    assert [exp["job_title"] for exp in result["work_experience"]] == ["Developer", "Senior Developer"]
+
+
+def test_one_role_seen_by_two_sources_is_merged():
+    experiences = [_experience("Developer", "Built the payments API"),
+                   _experience("Developer", "Built the payments API in Go")]
+
+    result = deduplicate(experiences, ["cv", "linkedin"], [], BagOfWordsEmbedder())
+
+    assert result["work_experience"] == [_experience("Developer", "Built the payments API in Go")]
+
+
+def test_cluster_never_merges_two_items_of_one_source():
+    vectors = numpy.array([[1.0, 0.0], [1.0, 0.0], [1.0, 0.0]], dtype=numpy.float32)
+
+    clusters = cluster(vectors, ["cv", "cv", "github"])
+
+    assert sorted(row for rows in clusters for row in rows) == [0, 1, 2]
+    assert len(clusters) == 2 and not any({0, 1} <= set(rows) for rows in clusters)
@@ -0,0 +1,67 @@
+# test_enhancement_cache.py
+import json
+import time
+
+from enhancement_service.cache import LOOKUP_FIELD, EnhancementCache, content_key, profile_key
+from enhancement_service.enhancer import MODE_PROFILE, ProfileEnhancer
+from llm_backends.base_backend import BaseLlmBackend
+from unification_service.models import UnifiedProfile
+
+
+def _profile(profile_id, summary="Engineer", source_data=None):
+    return UnifiedProfile(profile_id=profile_id, contact_info={}, full_name="Ada Lovelace", summary=summary,
+                          source_data=source_data or {})
+
+
+class CountingBackend(BaseLlmBackend):
+    """Rewrites the summary; counts its calls."""
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, model, system=None, json_output=False):
+        self.calls += 1
+        return json.dumps({"contact_info": {}, "full_name": "Ada Lovelace", "summary": "Pioneering engineer."})
+
+
+def test_keys_ignore_key_order_and_volatile_fields():
+    assert content_key({"a": 1, "b": 2}, "openai") == content_key({"b": 2, "a": 1}, "openai")
+    assert content_key({"a": 1}, "openai") != content_key({"a": 1}, "gemini")
+
+    key = profile_key(_profile("1", source_data={"cv": {}}), "openai", "gpt-4o", "1")
+
+    assert key == profile_key(_profile("2"), "openai", "gpt-4o", "1")
+    assert key != profile_key(_profile("1", summary="Mathematician"), "openai", "gpt-4o", "1")
+    assert key != profile_key(_profile("1"), "openai", "gpt-4o", "2")
+
+
+def test_expired_and_least_recently_used_entries_are_dropped(tmp_path):
+    cache = EnhancementCache(str(tmp_path / "cache.db"), max_bytes=25, ttl=60)
+    cache.put("old", "x" * 10)
+    with cache.db.connect() as conn:
+        conn.execute("UPDATE enhancements SET created_at = ?", (time.time() - 120,))
+
+    assert cache.get("old") is None
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 10)
+    assert cache.get("a") is None
+    assert cache.get("c", LOOKUP_FIELD) == "x" * 10
+    stats = cache.stats()
+    assert stats["entries"] == 2
+    assert stats["lookups"]["profile"]["misses"] == 2
+    assert stats["lookups"]["field"] == {"hits": 1, "misses": 0, "hit_rate": 1.0}
+
+
+def test_a_profile_with_unchanged_content_is_enhanced_once(tmp_path):
+    backend = CountingBackend()
+    enhancer = ProfileEnhancer(backend=backend, use_cache=False, mode=MODE_PROFILE)
+    enhancer.cache = EnhancementCache(str(tmp_path / "cache.db"))
+
+    first = enhancer.enhance(_profile("1"))
+    second = enhancer.enhance(_profile("2", source_data={"cv": {"raw": "..."}}))
+    enhancer.enhance(_profile("1", summary="Mathematician"))
+
+    assert backend.calls == 2
+    assert first.summary == second.summary == "Pioneering engineer."
+    assert second.profile_id == "2" and second.source_data == {"cv": {"raw": "..."}}
@@ -0,0 +1,82 @@
+# test_field_enhancement.py
+import json
+
+from enhancement_service.cache import EnhancementCache
+from enhancement_service.enhancer import FIELD_TASKS, MODE_FIELDS, MODE_PROFILE, ProfileEnhancer
+from llm_backends.base_backend import BaseLlmBackend
+from unification_service.models import UnifiedProfile
+
+PROFILE = UnifiedProfile(
+    profile_id="ada", contact_info={}, full_name="Ada Lovelace", summary="engineer", skills=["Python"],
+    work_experience=[{"job_title": "Engineer", "company_name": "Analytical Engines", "description": "wrote code"},
+                     {"job_title": "Translator", "company_name": "Scientific Memoirs"}],
+    projects=[{"project_name": "Note G", "description": "bernoulli numbers", "source": "CV"}],
+)
+
+
+class FieldBackend(BaseLlmBackend):
+    """Answers the summary and experience prompts; the project prompt fails."""
+    name = "fields"
+
+    def __init__(self):
+        self.fields = []
+
+    def generate(self, prompt, model, system=None, json_output=False):
+        field = next(field for field, task in FIELD_TASKS.items() if task in prompt)
+        self.fields.append(field)
+        if field == "projects":
+            raise RuntimeError("quota exceeded")
+        return json.dumps({"text": f"Rewritten {field}."})
+
+
+def _enhancer(backend, tmp_path, mode=MODE_FIELDS):
+    enhancer = ProfileEnhancer(backend=backend, use_cache=False, mode=mode)
+    enhancer.cache = EnhancementCache(str(tmp_path / "cache.db"))
+    return enhancer
+
+
+def test_a_failed_field_keeps_its_text_and_the_profile_is_not_cached(tmp_path):
+    backend = FieldBackend()
+    enhancer = _enhancer(backend, tmp_path)
+
+    enhanced = enhancer.enhance(PROFILE)
+
+    assert sorted(backend.fields) == ["projects", "summary", "work_experience"]
+    assert enhanced.summary == "Rewritten summary."
+    assert [exp.description for exp in enhanced.work_experience] == ["Rewritten work_experience.", None]
+    assert enhanced.projects[0].description == "bernoulli numbers"
+    assert enhanced.skills == ["Python"]
+    # The texts that were rewritten are cached; only the failed one is sent again.
+    backend.fields.clear()
+    enhancer.enhance(PROFILE)
+    assert backend.fields == ["projects"]
+
+
+def test_stream_yields_each_item_once(tmp_path):
+    events = list(_enhancer(FieldBackend(), tmp_path).enhance_stream(PROFILE))
+
+    assert [field for field, _ in events].count("work_experience") == 2
+    assert [field for field, _ in events].count("projects") == 1
+    assert events[0] == ("skills", "Python")
+    assert events[-1][0] == "profile"
+
+
+def test_an_empty_profile_sends_no_prompt(tmp_path):
+    backend = FieldBackend()
+    empty = UnifiedProfile(profile_id="empty", contact_info={})
+
+    assert _enhancer(backend, tmp_path).enhance(empty) == empty
+    assert backend.fields == []
+
+
+def test_profile_mode_keeps_the_profile_when_the_answer_does_not_validate(tmp_path):
+    class InvalidBackend(BaseLlmBackend):
+        name = "invalid"
+
+        def generate(self, prompt, model, system=None, json_output=False):
+            return json.dumps({"contact_info": "none", "work_experience": [{"job_title": "Engineer"}]})
+
+    enhancer = _enhancer(InvalidBackend(), tmp_path, mode=MODE_PROFILE)
+
+    assert enhancer.enhance(PROFILE) is PROFILE
+    assert enhancer.cache.stats()["entries"] == 0
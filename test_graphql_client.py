@@ -0,0 +1,46 @@
+# test_graphql_client.py
+from github_extractor.graphql_client import README_CANDIDATES, GitHubGraphQLFetcher
+from github_extractor.http_client import GitHubHttpClient
+
+
+def _repositories(names, next_cursor=None):
+    return {"pageInfo": {"hasNextPage": next_cursor is not None, "endCursor": next_cursor},
+            "nodes": [{"name": name, "description": None} for name in names]}
+
+
+def _user(**fields):
+    return {"databaseId": 583231, "login": "octocat", "name": None, "bio": "Octo", "location": "SF",
+            "email": "", "company": None, "websiteUrl": None, "profileRepo": None,
+            "repositories": _repositories(["hello-world"]), **fields}
+
+
+def test_a_profile_takes_one_query_per_100_repositories(fake_session):
+    profile_repo = {f"readme{i}": None for i in range(len(README_CANDIDATES))}
+    profile_repo["readme1"] = {"text": "# hi from readme.md"}
+    session = fake_session(
+        (200, {"data": {"user": _user(profileRepo=profile_repo,
+                                      repositories=_repositories(["a", "b"], next_cursor="c1"),
+                                      topRepos={"nodes": [{"name": "a", "defaultBranchRef": {"target": {
+                                          "history": {"nodes": [{"message": "Fix"}]}}}}]})}}),
+        (200, {"data": {"user": {"repositories": _repositories(["c"])}}}),
+    )
+    fetcher = GitHubGraphQLFetcher(GitHubHttpClient(token="token", session=session))
+
+    profile = fetcher.fetch_profile("octocat", commit_repos=1)
+
+    assert [repo.repo_name for repo in profile.repos] == ["a", "b", "c"]
+    assert profile.user_named_repo_readme == "# hi from readme.md"
+    assert profile.recent_commits == ["Fix"]
+    assert (profile.user_id, profile.name, profile.email) == ("583231", "octocat", None)
+    assert session.sent[1]["json"]["variables"] == {"login": "octocat", "cursor": "c1"}
+
+
+def test_max_repos_stops_the_pagination(fake_session):
+    session = fake_session((200, {"data": {"user": _user(repositories=_repositories(["a", "b"], "c1"))}}))
+    fetcher = GitHubGraphQLFetcher(GitHubHttpClient(token="token", session=session))
+
+    profile = fetcher.fetch_profile("octocat", max_repos=1)
+
+    assert [repo.repo_name for repo in profile.repos] == ["a"]
+    assert profile.user_named_repo_readme is None
+    assert len(session.sent) == 1
@@ -0,0 +1,52 @@
+# test_http_cache.py
+from github_extractor.http_cache import GitHubHttpCache, endpoint_of
+from github_extractor.http_client import GitHubHttpClient
+
+USER = {"login": "octocat", "name": "The Octocat"}
+
+
+def _cache(tmp_path, **kwargs):
+    return GitHubHttpCache(str(tmp_path / "github_cache.db"), **kwargs)
+
+
+def test_a_304_is_served_from_the_cache(tmp_path, fake_session):
+    session = fake_session((200, USER, {"ETag": '"v1"', "X-RateLimit-Remaining": "4999"}),
+                           (304, None, {"ETag": '"v1"', "X-RateLimit-Remaining": "4998"}))
+    # Freshness 0: every read is revalidated.
+    client = GitHubHttpClient(token="token", session=session, cache=_cache(tmp_path, freshness={"default": 0}))
+
+    client.get("/users/octocat")
+    response = client.get("/users/octocat")
+
+    assert session.sent[1]["headers"]["If-None-Match"] == '"v1"'
+    assert (response.status_code, response.data) == (200, USER)
+    assert response.headers["X-RateLimit-Remaining"] == "4998"
+    assert client.cache.stats()["not_modified"] == 1
+
+
+def test_fresh_entries_skip_the_request(tmp_path, fake_session):
+    session = fake_session((200, USER, {"ETag": '"v1"'}))
+    client = GitHubHttpClient(token="token", session=session, cache=_cache(tmp_path, freshness={"user": 300}))
+
+    client.get("/users/octocat")
+
+    assert client.get("/users/octocat").data == USER
+    assert len(session.sent) == 1
+    assert endpoint_of("https://api.github.com/users/octocat") == "user"
+
+
+def test_responses_without_validators_are_not_stored(tmp_path):
+    cache = _cache(tmp_path)
+
+    cache.store("https://api.github.com/users/octocat", USER, {})
+
+    assert cache.lookup("https://api.github.com/users/octocat") is None
+
+
+def test_the_oldest_entries_are_evicted_over_budget(tmp_path):
+    cache = _cache(tmp_path, max_bytes=300)
+    for name in ("a", "b", "c"):
+        cache.store(name, {"body": "x" * 100}, {"ETag": name})
+
+    assert cache.lookup("a") is None
+    assert cache.lookup("c").data == {"body": "x" * 100}
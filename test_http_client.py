@@ -0,0 +1,44 @@
+# test_http_client.py
+import pytest
+import requests
+
+from github_extractor.http_client import GitHubHttpClient
+
+
+def _client(session, **kwargs):
+    return GitHubHttpClient(token="token", session=session, backoff=0, **kwargs)
+
+
+def test_transient_failures_are_retried(fake_session):
+    session = fake_session(requests.ConnectionError("reset"), (502, None), (200, {"login": "octocat"}))
+
+    response = _client(session).get("/users/octocat")
+
+    assert (response.status_code, response.data) == (200, {"login": "octocat"})
+    assert len(session.sent) == 3
+    assert session.headers["Authorization"] == "Bearer token"
+
+
+def test_retries_are_bounded(fake_session):
+    session = fake_session((503, None), (503, None), (503, None))
+
+    assert _client(session, max_retries=2).get("/users/octocat").status_code == 503
+    assert len(session.sent) == 3
+
+    session = fake_session(requests.Timeout("slow"), requests.Timeout("slow"))
+    with pytest.raises(requests.Timeout):
+        _client(session, max_retries=1).get("/users/octocat")
+
+
+def test_client_errors_are_returned_without_retry(fake_session):
+    session = fake_session((404, {"message": "Not Found"}))
+
+    response = _client(session).get("https://api.github.com/users/nobody")
+
+    assert (response.status_code, response.data) == (404, {"message": "Not Found"})
+    assert len(session.sent) == 1
+
+
+def test_a_token_is_required():
+    with pytest.raises(ValueError):
+        GitHubHttpClient(token=None)
@@ -0,0 +1,86 @@
+# test_job_queue.py
+import os
+import threading
+import time
+
+import pytest
+
+from cv_extractor.uploads import stage_upload, sweep_uploads
+from job_service.queue import JobQueue, QueueFullError
+from job_service.store import STATUS_PENDING, JobStore
+
+
+def test_submit_rejects_jobs_beyond_max_pending(tmp_path):
+    queue = JobQueue(handlers={"cv": print}, store=JobStore(str(tmp_path / "jobs.db")), max_pending=2)
+    queue.submit("cv", source="a")
+    queue.submit("cv", source="b")
+
+    with pytest.raises(QueueFullError) as error:
+        queue.submit("cv", source="c")
+    assert error.value.retry_after >= 1
+    assert queue.depth() == {"pending": 2, "running": 0}
+    with pytest.raises(ValueError):
+        queue.submit("unknown")
+
+
+def test_concurrent_submissions_never_overshoot_the_limit(tmp_path):
+    queue = JobQueue(handlers={"cv": print}, store=JobStore(str(tmp_path / "jobs.db")), max_pending=5)
+    accepted = []
+
+    def submit():
+        try:
+            accepted.append(queue.submit("cv"))
+        except QueueFullError:
+            pass
+
+    threads = [threading.Thread(target=submit) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(accepted) == 5
+    assert queue.store.count(STATUS_PENDING) == 5
+
+
+def test_stale_jobs_are_requeued_then_abandoned(tmp_path):
+    store = JobStore(str(tmp_path / "jobs.db"))
+    store.create("job", "cv", {"source": "cv.pdf"})
+
+    assert store.claim_next(["cv"])["job_id"] == "job"
+    # A negative staleness makes every running job stale right away.
+    assert store.requeue_stale(-1, max_attempts=2) == (1, [])
+    assert store.get("job") == {"status": STATUS_PENDING}
+
+    store.claim_next(["cv"])
+    requeued, abandoned = store.requeue_stale(-1, max_attempts=2)
+    assert requeued == 0
+    assert abandoned == [{"job_id": "job", "source_type": "cv", "payload": {"source": "cv.pdf"}}]
+    assert store.get("job")["status"] == "error"
+
+
+def test_finished_jobs_are_cleaned_up(tmp_path):
+    cleaned = []
+    queue = JobQueue(handlers={"cv": lambda source: {"parsed": source}},
+                     store=JobStore(str(tmp_path / "jobs.db")), workers=1,
+                     cleanup={"cv": lambda source: cleaned.append(source)})
+    queue.start()
+    try:
+        job_id = queue.submit("cv", source="cv.pdf")
+        deadline = time.monotonic() + 10
+        while queue.get_status(job_id)["status"] != "completed" and time.monotonic() < deadline:
+            time.sleep(0.05)
+    finally:
+        queue.stop(timeout=5)
+
+    assert queue.get_status(job_id) == {"status": "completed", "result": {"parsed": "cv.pdf"}}
+    assert cleaned == ["cv.pdf"]
+
+
+def test_sweep_removes_only_old_staged_uploads(tmp_path):
+    old = stage_upload(b"%PDF-1.4 old", directory=str(tmp_path))
+    new = stage_upload(b"%PDF-1.4 new", directory=str(tmp_path))
+    os.utime(old, (time.time() - 7200, time.time() - 7200))
+
+    assert sweep_uploads(str(tmp_path), max_age=3600) == 1
+    assert os.listdir(tmp_path) == [os.path.basename(new)]
@@ -0,0 +1,55 @@
+# test_json_stream.py
+import json
+
+import pytest
+
+from cv_extractor.extractors.json_stream import IncrementalJsonParser, parse_llm_json
+
+DOCUMENT = {
+    "summary": "Keys like \"work_experience\": [ in a string are text",
+    "work_experience": [
+        {"job_title": "Dev, \"senior\"", "company": "A {B} [C]", "description": "line\nbreak \\ slash"},
+        {"job_title": "Intern", "company": "Ünïcode", "tags": [{"name": "x"}, []]},
+    ],
+    "skills": [{"name": "Python"}, {"name": "SQL"}],
+    "projects": ["plain string item", 42, None],
+}
+TEXT = "```json\n" + json.dumps(DOCUMENT, ensure_ascii=False, indent=2) + "\n```"
+
+
+def _feed(text, size):
+    parser = IncrementalJsonParser(("work_experience", "projects"))
+    emitted = []
+    for start in range(0, len(text), size):
+        emitted.extend(parser.feed(text[start:start + size]))
+    return parser, emitted
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 8, 13, len(TEXT)])
+def test_items_are_emitted_whole_across_chunk_splits(size):
+    parser, emitted = _feed(TEXT, size)
+
+    assert emitted == ([("work_experience", item) for item in DOCUMENT["work_experience"]]
+                       + [("projects", item) for item in DOCUMENT["projects"]])
+    assert parser.result() == DOCUMENT
+
+
+def test_an_item_is_emitted_as_soon_as_it_is_complete():
+    parser = IncrementalJsonParser(("projects",))
+    text = '{"projects": [{"name": "a"}, {"name": "b"}]}'
+    split = text.index("}") + 1
+
+    assert parser.feed(text[:split]) == [("projects", {"name": "a"})]
+    assert parser.feed(text[split:]) == [("projects", {"name": "b"})]
+
+
+def test_an_unfinished_answer_fails_only_the_final_parse():
+    parser, emitted = _feed('{"projects": [{"name": "a"}, {"name": "b', 4)
+
+    assert emitted == [("projects", {"name": "a"})]
+    with pytest.raises(json.JSONDecodeError):
+        parser.result()
+
+
+def test_parse_llm_json_strips_a_fence():
+    assert parse_llm_json('```json\n{"a": 1}\n```') == {"a": 1}
@@ -0,0 +1,70 @@
+# test_llm_backends.py
+import json
+
+import pytest
+
+from cv_extractor.extractors.llm_data_extractor import LlmDataExtractor
+from llm_backends.base_backend import BaseLlmBackend
+from llm_backends.gemini_backend import GeminiBackend
+from llm_backends.openai_backend import OpenAIBackend
+from llm_backends.replay_backend import ReplayBackend
+from llm_backends.stub_backend import StubBackend
+
+CV = """Ada Lovelace
+Skills: Python, Mathematics
+EXPERIENCE
+Engineer - Analytical Engines - 2019
+Wrote the first published algorithm.
+PROJECTS
+Note G"""
+
+
+class CountingBackend(BaseLlmBackend):
+    name = "counting"
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate(self, prompt, model, system=None, json_output=False):
+        self.calls += 1
+        return json.dumps({"answer": self.calls})
+
+
+def test_replay_records_upstream_answers_and_replays_them(tmp_path):
+    path = str(tmp_path / "replay.db")
+    upstream = CountingBackend()
+    recording = ReplayBackend(path, upstream=upstream)
+
+    first = recording.generate("prompt", "model", system="system")
+    assert recording.generate("prompt", "model", system="system") == first
+    assert upstream.calls == 1
+
+    offline = ReplayBackend(path)
+    assert "".join(offline.stream("prompt", "model", system="system")) == first
+    with pytest.raises(LookupError):
+        offline.generate("prompt", "another-model")
+
+
+def test_replay_does_not_record_stub_answers(tmp_path):
+    path = str(tmp_path / "replay.db")
+
+    ReplayBackend(path, upstream=StubBackend(latency=0)).generate("prompt", "model")
+
+    with pytest.raises(LookupError):
+        ReplayBackend(path).generate("prompt", "model")
+
+
+def test_the_stub_answers_the_cv_extraction_prompt():
+    result = LlmDataExtractor(mode="single", backend=StubBackend(latency=0)).extract(CV, [])
+
+    assert [skill["name"] for skill in result["skills"]] == ["Python", "Mathematics"]
+    assert [(exp["job_title"], exp["company"]) for exp in result["work_experience"]] == [
+        ("Engineer", "Analytical Engines")]
+    assert [project["project_name"] for project in result["projects"]] == ["Note G"]
+
+
+def test_provider_backends_reject_a_foreign_model():
+    with pytest.raises(ValueError, match="gemini backend cannot run model 'gpt-4o'"):
+        GeminiBackend(api_key="key")._model("gpt-4o", None)
+    with pytest.raises(ValueError, match="openai backend cannot run model 'gemini-1.5-pro'"):
+        OpenAIBackend(api_key="key")._request("prompt", "gemini-1.5-pro", None, False)
@@ -0,0 +1,65 @@
+# test_observability.py
+import pytest
+
+from observability.metrics import Counter, Gauge, Histogram, MetricsRegistry, per_scrape
+from observability.tracing import current_trace, end_trace, span, start_trace
+
+
+def test_spans_nest_into_the_request_trace():
+    token = start_trace()
+    try:
+        with span("extract", source="cv"):
+            with span("parse"):
+                pass
+            with pytest.raises(ValueError), span("llm"):
+                raise ValueError("bad answer")
+        breakdown = current_trace().breakdown()
+    finally:
+        end_trace(token)
+
+    [root] = breakdown["spans"]
+    assert (root["name"], root["attributes"]) == ("extract", {"source": "cv"})
+    assert [child["name"] for child in root["children"]] == ["parse", "llm"]
+    assert root["children"][1]["attributes"] == {"error": "ValueError"}
+    assert set(breakdown["stages_ms"]) == {"extract", "parse", "llm"}
+    assert current_trace() is None
+
+
+def test_metrics_render_in_the_prometheus_text_format():
+    registry = MetricsRegistry()
+    requests = registry.register(Counter("test_requests_total", "Requests.", ("status",)))
+    latency = registry.register(Histogram("test_seconds", "Latency.", buckets=(0.1, 1.0)))
+    requests.inc(status="200")
+    requests.inc(2, status="200")
+    latency.observe(0.5)
+
+    lines = registry.render().splitlines()
+
+    assert f'{requests.name}{{status="200"}} 3' in lines
+    assert f'{latency.name}_bucket{{le="0.1"}} 0' in lines
+    assert f'{latency.name}_bucket{{le="+Inf"}} 1' in lines
+    assert f"{latency.name}_sum 0.5" in lines
+
+
+def test_callbacks_share_one_query_per_scrape_and_may_fail():
+    calls = []
+
+    @per_scrape
+    def stats():
+        calls.append(1)
+        return {"pending": 2, "running": 1}
+
+    def broken():
+        raise RuntimeError("database is locked")
+
+    registry = MetricsRegistry()
+    registry.register(Gauge("test_pending", "Pending.", callback=lambda: [({}, stats()["pending"])]))
+    registry.register(Gauge("test_running", "Running.", callback=lambda: [({}, stats()["running"])]))
+    registry.register(Gauge("test_broken", "Broken.", callback=broken))
+
+    output = registry.render()
+
+    assert len(calls) == 1
+    assert "_test_pending 2" in output and "_test_running 1" in output
+    registry.render()
+    assert len(calls) == 2
@@ -0,0 +1,47 @@
+# test_parsers.py
+import docx
+import fitz
+
+from cv_extractor.parsers import pdf_parser
+from cv_extractor.parsers.docx_parser import DocxParser
+from cv_extractor.parsers.pdf_parser import PdfParser
+
+
+def _pdf(pages):
+    doc = fitz.open()
+    for i in range(pages):
+        doc.new_page().insert_text((72, 72), f"Page {i} of the CV")
+    return doc.tobytes()
+
+
+def test_docx_text_reads_headers_tables_and_merged_cells(tmp_path):
+    document = docx.Document()
+    document.sections[0].header.paragraphs[0].text = "ada@example.com"
+    document.add_paragraph("Ada Lovelace")
+    document.add_paragraph("   ")
+    table = document.add_table(rows=2, cols=3)
+    table.cell(0, 0).text, table.cell(0, 1).text, table.cell(0, 2).text = "Python", "SQL", "Go"
+    table.cell(1, 0).merge(table.cell(1, 1)).text = "Mathematics"
+    table.cell(1, 2).text = "Logic"
+    path = str(tmp_path / "cv.docx")
+    document.save(path)
+
+    chunks = list(DocxParser().iter_text(path))
+
+    assert chunks == ["ada@example.com", "Ada Lovelace", "Python | SQL | Go", "Mathematics | Logic"]
+    with open(path, "rb") as f:
+        assert DocxParser().get_text(f.read()) == "\n".join(chunks)
+
+
+def test_pdf_pages_are_yielded_in_order():
+    assert list(PdfParser().iter_text(_pdf(3))) == [f"Page {i} of the CV\n" for i in range(3)]
+
+
+def test_a_long_pdf_is_parsed_by_page_ranges_in_parallel(monkeypatch):
+    monkeypatch.setattr(pdf_parser, "PDF_PARALLEL_MIN_PAGES", 4)
+    monkeypatch.setattr(pdf_parser, "PDF_WORKERS", 2)
+    data = _pdf(9)
+
+    pages = list(PdfParser().iter_text(data))
+
+    assert pages == [f"Page {i} of the CV\n" for i in range(9)]
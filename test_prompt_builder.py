@@ -0,0 +1,63 @@
+# test_prompt_builder.py
+import json
+
+from cv_extractor.extractors import llm_data_extractor
+from cv_extractor.extractors.llm_data_extractor import LlmDataExtractor
+from cv_extractor.extractors.prompt_builder import compact_schema, compact_text, count_tokens, split_text
+from cv_extractor.models.cv_models import ExtractedCV
+from llm_backends.base_backend import BaseLlmBackend
+
+LONG_CV = "\n".join(f"Line {i}: built service {i} with Python and Kafka" for i in range(200))
+
+
+class RecordingBackend(BaseLlmBackend):
+    name = "recording"
+
+    def __init__(self):
+        self.prompts = []
+
+    def generate(self, prompt, model, system=None, json_output=False):
+        self.prompts.append(prompt)
+        return json.dumps({"skills": [{"name": "Python"}], "work_experience": [], "projects": []})
+
+
+def test_split_text_keeps_every_line_within_the_budget():
+    chunks = split_text(LONG_CV, 100)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 100 for chunk in chunks)
+    assert "\n".join(chunks) == LONG_CV
+
+
+def test_split_text_cuts_a_line_longer_than_the_budget():
+    line = "x" * 2000
+
+    chunks = split_text(line, 100)
+
+    assert all(count_tokens(chunk) <= 100 for chunk in chunks)
+    assert "".join(chunks) == line
+    assert split_text("short", 100) == ["short"]
+
+
+def test_compact_schema_drops_titles_and_excluded_fields():
+    schema = json.dumps(compact_schema(ExtractedCV, exclude=("full_text", "evidence")))
+
+    assert '"title"' not in schema
+    assert "full_text" not in schema and "evidence" not in schema
+    assert "work_experience" in schema
+
+
+def test_compact_text_drops_blank_lines_and_runs_of_spaces():
+    assert compact_text("  Python\t\t and   SQL \n\n\n Go  ") == "Python and SQL\nGo"
+
+
+def test_an_over_budget_cv_is_sent_in_chunks_not_cut(monkeypatch):
+    monkeypatch.setattr(llm_data_extractor, "CV_PROMPT_MAX_TOKENS", 500)
+    backend = RecordingBackend()
+    extractor = LlmDataExtractor(mode="single", backend=backend)
+
+    result = extractor.extract(LONG_CV, [])
+
+    assert len(backend.prompts) > 3
+    assert all(any(f"Line {i}:" in prompt for prompt in backend.prompts) for i in range(200))
+    assert result["skills"] == [{"name": "Python"}]
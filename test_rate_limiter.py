@@ -0,0 +1,75 @@
+# test_rate_limiter.py
+import time
+
+import pytest
+
+from github_extractor.rate_limiter import (
+    PRIORITY_BATCH,
+    GitHubRateLimiter,
+    RateLimitExceeded,
+    is_rate_limited,
+    rate_limit_priority,
+)
+from github_extractor.http_client import GitHubHttpClient
+
+
+def _limiter(tmp_path, **kwargs):
+    return GitHubRateLimiter(str(tmp_path / "rate.db"), max_wait={"interactive": 0.5, "batch": 0.5}, **kwargs)
+
+
+def _budget(limiter, remaining, reset_in=3600):
+    limiter.update({"X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": str(remaining),
+                    "X-RateLimit-Reset": str(time.time() + reset_in)})
+
+
+def test_interactive_calls_spend_the_budget_down_to_zero(tmp_path):
+    limiter = _limiter(tmp_path, batch_reserve=10)
+    _budget(limiter, 2)
+
+    limiter.acquire()
+    limiter.acquire()
+    with pytest.raises(RateLimitExceeded):
+        limiter.acquire()
+    assert limiter.stats()["budgets"]["core"]["remaining"] == 0
+
+
+def test_batch_calls_stop_at_the_reserve(tmp_path):
+    limiter = _limiter(tmp_path, batch_reserve=10)
+    _budget(limiter, 10)
+
+    with rate_limit_priority(PRIORITY_BATCH):
+        with pytest.raises(RateLimitExceeded):
+            limiter.acquire()
+    limiter.acquire()
+
+
+def test_processes_sharing_a_state_file_share_the_budget(tmp_path):
+    first, second = _limiter(tmp_path), _limiter(tmp_path)
+    _budget(first, 1)
+
+    first.acquire()
+    with pytest.raises(RateLimitExceeded):
+        second.acquire()
+
+
+def test_a_window_reset_refills_the_bucket(tmp_path):
+    limiter = _limiter(tmp_path)
+    _budget(limiter, 0, reset_in=-1)
+
+    limiter.acquire()
+
+
+def test_rate_limited_responses_are_recognized():
+    assert is_rate_limited(403, {"X-RateLimit-Remaining": "0"})
+    assert is_rate_limited(429, {"Retry-After": "30"})
+    assert not is_rate_limited(403, {"X-RateLimit-Remaining": "12"})
+    assert not is_rate_limited(500, {"X-RateLimit-Remaining": "0"})
+
+
+def test_the_client_retries_a_secondary_rate_limit(tmp_path, fake_session):
+    session = fake_session((403, {"message": "secondary rate limit"}, {"Retry-After": "0"}),
+                           (200, {"login": "octocat"}))
+    client = GitHubHttpClient(token="token", session=session, rate_limiter=_limiter(tmp_path))
+
+    assert client.get("/users/octocat").data == {"login": "octocat"}
+    assert client.rate_limiter.stats()["granted"] == 2
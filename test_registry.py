@@ -0,0 +1,44 @@
+# test_registry.py
+import threading
+import time
+
+import pytest
+
+from cv_extractor.registry import ModelRegistry
+
+
+def test_concurrent_callers_share_one_load():
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.1)
+        return object()
+
+    registry = ModelRegistry()
+    registry.register("model", factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("model"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert len(set(map(id, results))) == 1
+    assert registry.status() == {"model": "ready"}
+
+
+def test_warm_up_records_errors_instead_of_raising():
+    def broken():
+        raise RuntimeError("no API key")
+
+    registry = ModelRegistry()
+    registry.register("ok", object)
+    registry.register("broken", broken)
+
+    assert registry.warm_up() == {"ok": "ready", "broken": "error: no API key"}
+    assert not registry.is_ready()
+    assert registry.is_ready(["ok"])
+    with pytest.raises(KeyError):
+        registry.get("unknown")
@@ -0,0 +1,54 @@
+# test_repo_pagination.py
+from datetime import datetime, timezone
+
+import pytest
+
+from github_extractor.api_client import GitHubApiClient
+from github_extractor.http_client import GitHubHttpClient
+
+PAGE_2 = "https://api.github.com/user/1/repos?per_page=100&page=2"
+
+
+def _client(session):
+    return GitHubApiClient(GitHubHttpClient(token="token", session=session))
+
+
+def _repo(name, pushed_at="2024-01-01T00:00:00Z"):
+    return {"name": name, "description": None, "pushed_at": pushed_at}
+
+
+def test_repositories_are_streamed_across_pages(fake_session):
+    session = fake_session((200, [_repo("a"), _repo("b")], {"Link": f'<{PAGE_2}>; rel="next"'}),
+                           (200, [_repo("c")]))
+
+    names = [repo.repo_name for repo in _client(session).iter_repos("octocat", max_repos=None)]
+
+    assert names == ["a", "b", "c"]
+    assert session.sent[1]["url"] == PAGE_2
+
+
+def test_the_walk_stops_at_max_repos_without_the_next_page(fake_session):
+    session = fake_session((200, [_repo("a"), _repo("b")], {"Link": f'<{PAGE_2}>; rel="next"'}))
+
+    names = [repo.repo_name for repo in _client(session).iter_repos("octocat", max_repos=2)]
+
+    assert names == ["a", "b"]
+    assert len(session.sent) == 1
+
+
+def test_pushed_since_stops_at_the_first_older_repository(fake_session):
+    session = fake_session((200, [_repo("new", "2024-06-01T00:00:00Z"), _repo("old", "2023-01-01T00:00:00Z")],
+                            {"Link": f'<{PAGE_2}>; rel="next"'}))
+    since = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+    repos = _client(session).iter_repos("octocat", max_repos=None, pushed_since=since, prefetch=False)
+
+    assert [repo.repo_name for repo in repos] == ["new"]
+    assert session.sent[0]["params"] == {"per_page": 100, "sort": "pushed", "direction": "desc"}
+
+
+def test_a_failed_page_raises_instead_of_truncating(fake_session):
+    session = fake_session((200, [_repo("a")], {"Link": f'<{PAGE_2}>; rel="next"'}), (404, None))
+
+    with pytest.raises(Exception, match="unavailable"):
+        list(_client(session).iter_repos("octocat", max_repos=None))
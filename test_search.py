@@ -0,0 +1,35 @@
+# test_search.py
+import numpy
+
+from unification_service.models import UnifiedContactInfo, UnifiedProfile, UnifiedWorkExperience
+from unification_service.search import VECTORS_PER_RESULT, ProfileSearchIndex
+from unification_service.store import ProfileStore
+
+
+class FakeEmbedder:
+    """2-d vectors: the query and Alpha experiences point one way, the rest nearby."""
+    dimension = 2
+
+    def encode(self, texts):
+        return numpy.array([[1.0, 0.0] if "Alpha" in text or text == "query" else [0.6, 0.8]
+                            for text in texts], dtype=numpy.float32)
+
+
+def _profile(profile_id, company, experiences):
+    return UnifiedProfile(profile_id=profile_id, contact_info=UnifiedContactInfo(), full_name=profile_id,
+                          work_experience=[UnifiedWorkExperience(job_title=f"Dev {i}", company_name=company)
+                                           for i in range(experiences)])
+
+
+def test_rank_widens_the_search_past_a_profile_with_many_vectors(tmp_path):
+    store = ProfileStore(str(tmp_path / "profiles.db"))
+    with store.transaction() as conn:
+        # "crowded" owns more than limit * VECTORS_PER_RESULT of the best vectors.
+        store.save_unified(conn, _profile("crowded", "Alpha", 4 * VECTORS_PER_RESULT), changed=True)
+        store.save_unified(conn, _profile("other", "Beta", 1), changed=True)
+    index = ProfileSearchIndex(store=store, embedder=FakeEmbedder())
+
+    ranked, total = index._rank(FakeEmbedder().encode(["query"]), None, limit=2)
+
+    assert [profile_id for profile_id, _ in ranked] == ["crowded", "other"]
+    assert total == 2
@@ -0,0 +1,66 @@
+# test_sections.py
+import json
+
+from cv_extractor.extractors.llm_data_extractor import LlmDataExtractor
+from cv_extractor.extractors.section_splitter import has_section, split_sections
+from llm_backends.base_backend import BaseLlmBackend
+
+CV = """Ada Lovelace
+ada@example.com
+Work Experience:
+Engineer, Analytical Engines (1842-1843)
+Wrote the first published algorithm for the engine.
+COMPÉTENCES
+Python, Mathematics
+Projects
+Note G: Bernoulli numbers on the Analytical Engine
+Experience
+Translator, Scientific Memoirs"""
+
+MODELS = {"work_experience": "model-experience", "projects": "model-projects", "skills": "model-skills"}
+
+
+class SectionBackend(BaseLlmBackend):
+    """Answers each field's prompt; the projects prompt fails."""
+    name = "sections"
+
+    def __init__(self):
+        self.prompts = {}
+
+    def generate(self, prompt, model, system=None, json_output=False):
+        self.prompts[model] = prompt
+        if model == "model-projects":
+            raise RuntimeError("quota exceeded")
+        if model == "model-experience":
+            return json.dumps({"work_experience": [{"job_title": "Engineer", "company": "Analytical Engines",
+                                                    "inferred_skills": ["Algorithms", "python"]}]})
+        return json.dumps({"skills": [{"name": "Python"}, {"name": "python"}, {"name": "Mathematics"}]})
+
+
+def test_headings_split_the_cv_into_sections():
+    sections = split_sections(CV)
+
+    assert sections["header"] == "Ada Lovelace\nada@example.com"
+    assert sections["experience"].splitlines() == [
+        "Engineer, Analytical Engines (1842-1843)", "Wrote the first published algorithm for the engine.",
+        "Translator, Scientific Memoirs"]
+    assert sections["skills"] == "Python, Mathematics"
+    assert has_section(sections, "experience") and not has_section(sections, "skills")
+
+
+def test_headings_listed_together_discard_the_segmentation():
+    assert split_sections("Experience\nSkills\nProjects\nEngineer at Acme") == {}
+
+
+def test_each_field_gets_its_own_prompt_and_a_failure_stays_local():
+    backend = SectionBackend()
+    extractor = LlmDataExtractor(mode="sections", section_models=MODELS, backend=backend)
+
+    result = extractor.extract(CV, [])
+
+    assert set(backend.prompts) == set(MODELS.values())
+    assert "Translator, Scientific Memoirs" in backend.prompts["model-experience"]
+    assert "Note G" not in backend.prompts["model-experience"]
+    assert "projects" not in result
+    assert [exp["company"] for exp in result["work_experience"]] == ["Analytical Engines"]
+    assert [skill["name"] for skill in result["skills"]] == ["Python", "Mathematics", "Algorithms"]
@@ -0,0 +1,48 @@
+# test_skill_index.py
+from unification_service import unifier as unifier_module
+from unification_service.skill_index import SkillIndex, normalize
+from unification_service.store import ProfileStore
+from unification_service.unifier import ProfileUnifier
+
+SKILL_DB = {
+    "KS1": {"skill_name": "Python (Programming Language)", "high_surfce_forms": {"full": "python"},
+            "low_surface_forms": []},
+    "KS2": {"skill_name": "Machine Learning", "high_surfce_forms": {"full": "machine learning", "abv": "ML"},
+            "low_surface_forms": ["machinelearning"]},
+    "KS3": {"skill_name": "Kubernetes", "high_surfce_forms": {"full": "kubernetes", "abv": "k8s"},
+            "low_surface_forms": []},
+}
+
+
+def test_normalize_keeps_language_punctuation():
+    assert normalize("  C++ / C#, Node.JS. ") == "c++ c# node.js"
+
+
+def test_aliases_versions_and_qualifiers_map_to_one_skill():
+    index = SkillIndex(SKILL_DB)
+
+    matches = index.canonicalize(["python", "Python3", "Python (Programming Language)", "ml", "machine-learning"])
+
+    assert [match.name for match in matches] == ["Python", "Python", "Python", "Machine Learning", "Machine Learning"]
+    assert {match.score for match in matches} == {1.0}
+
+
+def test_misspellings_are_matched_approximately_above_the_threshold():
+    index = SkillIndex(SKILL_DB, batch_size=1)
+
+    kubernets, cobol, k8 = index.canonicalize(["Kubernets", "COBOL", "k8"])
+
+    assert kubernets.skill_id == "KS3" and index.threshold <= kubernets.score < 1.0
+    assert cobol is None
+    # Too short to be matched approximately.
+    assert k8 is None
+
+
+def test_unifier_keeps_one_entry_per_canonical_skill(tmp_path, monkeypatch):
+    index = SkillIndex(SKILL_DB)
+    monkeypatch.setattr(unifier_module, "get_skill_index", lambda: index)
+    unifier = ProfileUnifier(store=ProfileStore(str(tmp_path / "profiles.db")), dedup=False)
+
+    skills = unifier._canonical_skills(["python", "Python3", "Docker", "docker", "ML"])
+
+    assert skills == ["Docker", "Machine Learning", "Python"]
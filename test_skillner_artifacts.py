@@ -0,0 +1,51 @@
+# test_skillner_artifacts.py
+import numpy
+import pytest
+import spacy
+import srsly
+
+from cv_extractor.extractors import skillner_artifacts
+
+
+@pytest.fixture(scope="module")
+def artifacts(tmp_path_factory):
+    """A blank English pipeline with two vectors, compiled once for the module."""
+    root = tmp_path_factory.mktemp("skillner")
+    nlp = spacy.blank("en")
+    for word in ("python", "docker"):
+        nlp.vocab.set_vector(word, numpy.ones(4, dtype=numpy.float32))
+    model = str(root / "model")
+    nlp.to_disk(model)
+    output = str(root / "artifacts")
+    manifest = skillner_artifacts.build(output, model)
+    return output, model, manifest
+
+
+def test_build_then_load_gives_a_working_extractor(artifacts):
+    output, model, manifest = artifacts
+
+    nlp, extractor = skillner_artifacts.load_compiled(output, model)
+
+    assert manifest["model"] == model and manifest["format"] == skillner_artifacts.FORMAT_VERSION
+    assert isinstance(nlp.vocab.vectors.data, numpy.memmap)
+    assert nlp.vocab.get_vector("python").tolist() == [1.0] * 4
+    found = extractor.annotate("Experienced in Python and Docker")["results"]
+    assert {match["doc_node_value"] for match in found["ngram_scored"]} >= {"python", "docker"}
+
+
+def test_missing_artifacts_are_not_loaded(tmp_path):
+    assert skillner_artifacts.load_compiled(str(tmp_path), "en_core_web_lg") is None
+
+
+@pytest.mark.parametrize("key, value", [("format", 0), ("spacy", "2.0.0"), ("skills", 1)])
+def test_stale_artifacts_are_not_loaded(artifacts, tmp_path, key, value):
+    _, model, manifest = artifacts
+    srsly.write_json(str(tmp_path / "manifest.json"), {**manifest, key: value})
+
+    assert skillner_artifacts.load_compiled(str(tmp_path), model) is None
+
+
+def test_artifacts_of_another_model_are_not_loaded(artifacts):
+    output, model, _ = artifacts
+
+    assert skillner_artifacts.load_compiled(output, model + "-other") is None
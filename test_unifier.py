@@ -0,0 +1,59 @@
+# test_unifier.py
+import pytest
+
+from cv_extractor.models.cv_models import ExtractedCV, Skill
+from github_extractor.models import GitHubProfile
+from linkedin_extractor.models import LinkedInPosition, LinkedInProfile
+from unification_service.store import ProfileStore
+from unification_service.unifier import ProfileUnifier
+
+LINKEDIN = LinkedInProfile(fullName="Ada Lovelace", positions=[
+    LinkedInPosition(title="Engineer", companyName="Analytical Engines")])
+CV = ExtractedCV(full_text="Ada Lovelace, Python", skills=[Skill(name="Python", evidence=[])])
+GITHUB = GitHubProfile(user_id="1", username="ada", repos=[{"repo_name": "engine"}])
+
+
+@pytest.fixture
+def unifier(tmp_path):
+    return ProfileUnifier(store=ProfileStore(str(tmp_path / "profiles.db")), canonicalize_skills=False, dedup=False)
+
+
+def test_sources_are_merged_incrementally(unifier):
+    first = unifier.merge("ada", LINKEDIN)
+    second = unifier.merge("ada", CV)
+
+    assert first.changed and second.changed
+    assert second.profile.full_name == "Ada Lovelace"
+    assert second.profile.skills == ["Python"]
+    assert [exp.company_name for exp in second.profile.work_experience] == ["Analytical Engines"]
+    assert {key: entry["revision"] for key, entry in second.versions.items()} == {"linkedin": 1, "cv": 1}
+
+
+def test_an_unchanged_source_is_skipped(unifier):
+    unifier.merge("ada", LINKEDIN)
+
+    again = unifier.merge("ada", LINKEDIN)
+
+    assert not again.changed
+    assert again.versions["linkedin"]["revision"] == 1
+
+
+def test_a_version_conflict_retries_the_merge(unifier, monkeypatch):
+    unifier.merge("ada", LINKEDIN)
+    other = ProfileUnifier(store=unifier.store, canonicalize_skills=False, dedup=False)
+    assemble = unifier._assemble
+    calls = []
+
+    def assemble_while_another_process_merges(profile_id, contributions):
+        calls.append(sorted(contributions))
+        if len(calls) == 1:
+            other.merge("ada", GITHUB)
+        return assemble(profile_id, contributions)
+
+    monkeypatch.setattr(unifier, "_assemble", assemble_while_another_process_merges)
+
+    result = unifier.merge("ada", CV)
+
+    assert calls == [["cv", "linkedin"], ["cv", "github", "linkedin"]]
+    assert set(result.versions) == {"linkedin", "cv", "github"}
+    assert [project.project_name for project in unifier.store.get_unified("ada").projects] == ["engine"]
@@ -0,0 +1,56 @@
+# test_uploads.py
+import io
+import os
+
+import pytest
+
+from cv_extractor.parsers.docx_parser import DocxParser
+from cv_extractor.parsers.factory import FORMAT_DOCX, FORMAT_PDF, get_parser, sniff_format
+from cv_extractor.parsers.pdf_parser import PdfParser
+from cv_extractor.uploads import UploadTooLargeError, persist_upload, read_upload
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+
+def _fixture(name):
+    with open(os.path.join(FIXTURES, name), "rb") as f:
+        return f.read()
+
+
+def test_the_format_is_sniffed_from_the_content_not_the_name(tmp_path):
+    pdf, docx = _fixture("Gaurav_Kumar.pdf"), _fixture("Gaurav_Kumar.docx")
+    renamed = tmp_path / "cv.docx"
+    renamed.write_bytes(pdf)
+
+    assert sniff_format(pdf) == FORMAT_PDF
+    assert sniff_format(str(renamed)) == FORMAT_PDF
+    assert isinstance(get_parser(docx), DocxParser)
+    assert isinstance(get_parser(io.BytesIO(pdf)), PdfParser)
+    assert sniff_format(b"PK\x03\x04 not a word document") is None
+    with pytest.raises(ValueError):
+        get_parser(b"plain text")
+
+
+def test_a_sniffed_file_object_is_parsed_from_where_it_was():
+    stream = io.BytesIO(_fixture("Gaurav_Kumar.docx"))
+
+    parser = get_parser(stream)
+
+    assert stream.tell() == 0
+    assert parser.get_text(stream) == DocxParser().get_text(_fixture("Gaurav_Kumar.docx"))
+
+
+def test_read_upload_stops_past_the_limit():
+    assert read_upload(io.BytesIO(b"x" * 1000), max_bytes=1000) == b"x" * 1000
+    with pytest.raises(UploadTooLargeError, match="File too large"):
+        read_upload(io.BytesIO(b"x" * 1001), max_bytes=1000)
+
+
+def test_identical_uploads_share_one_persisted_file(tmp_path):
+    pdf = _fixture("Gaurav_Kumar.pdf")
+
+    first = persist_upload(pdf, directory=str(tmp_path))
+
+    assert persist_upload(pdf, directory=str(tmp_path)) == first
+    assert first.endswith(".pdf")
+    assert os.listdir(tmp_path) == [os.path.basename(first)]
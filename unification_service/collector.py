@@ -0,0 +1,68 @@
+# unification_service/collector.py
+import contextvars
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from observability.tracing import span
+
+from .config import PROCESS_DEADLINE_SECONDS, PROCESS_MAX_WORKERS
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ThreadPoolExecutor(max_workers=PROCESS_MAX_WORKERS, thread_name_prefix="source")
+    return _pool
+
+
+def _run_source(name: str, fn: Callable[[], Any]) -> Any:
+    with span(f"source.{name}"):
+        return fn()
+
+
+def collect_sources(tasks: Dict[str, Callable[[], Any]],
+                    deadline: float = PROCESS_DEADLINE_SECONDS) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Runs one extractor call per source concurrently and waits for all of
+    them, or until `deadline` seconds have passed.
+
+    Returns `(results, errors)`: `results` maps each source that finished to
+    its data, `errors` maps the others to a message (the exception, or a
+    timeout). Calls still running at the deadline are left to finish in the
+    background; their result is discarded.
+    """
+    started = time.monotonic()
+    # Each call runs in a copy of the caller's context, so its spans land in
+    # the request's trace.
+    futures = {_get_pool().submit(contextvars.copy_context().run, _run_source, name, fn): name
+               for name, fn in tasks.items()}
+    results, errors = {}, {}
+
+    pending = set(futures)
+    while pending:
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            name = futures[future]
+            try:
+                results[name] = future.result()
+                print(f"[Collector] '{name}' done after {time.monotonic() - started:.2f}s")
+            except Exception as e:
+                errors[name] = str(e)
+                print(f"[Collector] '{name}' failed: {e}")
+
+    for future in pending:
+        name = futures[future]
+        errors[name] = f"timed out after {deadline:g}s"
+        print(f"[Collector] '{name}' still running at the deadline; unifying without it")
+
+    return results, errors
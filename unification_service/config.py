@@ -0,0 +1,49 @@
+# unification_service/config.py
+import os
+from dotenv import load_dotenv
+
+# Load environment variables from a .env file
+load_dotenv()
+
+# Seconds a multi-source /process request waits for its extractors before
+# unifying whatever has finished (partial result).
+PROCESS_DEADLINE_SECONDS = float(os.getenv("PROCESS_DEADLINE_SECONDS", "90"))
+
+# Threads shared by all multi-source requests of a process (one per
+# extractor call in flight).
+PROCESS_MAX_WORKERS = int(os.getenv("PROCESS_MAX_WORKERS", "12"))
+
+# SQLite file holding unified profiles and each source's contribution.
+PROFILE_DB_PATH = os.getenv("PROFILE_DB_PATH", os.path.join("instance", "profiles.db"))
+# A merge assembles the profile without holding the database write lock,
+# then saves it only if no other merge changed the profile's sources in
+# the meantime; otherwise it starts over, up to this many times.
+MERGE_MAX_ATTEMPTS = int(os.getenv("MERGE_MAX_ATTEMPTS", "5"))
+
+# --- Skill canonicalization (see skill_index.py) ---
+# Set SKILL_CANONICALIZE=0 to keep skills as written, only de-duplicated
+# regardless of case (SKILL_DB is not loaded then).
+SKILL_CANONICALIZE = os.getenv("SKILL_CANONICALIZE", "1") == "1"
+# Raw skills without an exact alias in SKILL_DB are matched on character
+# trigrams; below this cosine similarity they are kept as written.
+SKILL_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.8"))
+# Raw skills compared per sparse product (bounds its memory).
+SKILL_MATCH_BATCH = int(os.getenv("SKILL_MATCH_BATCH", "512"))
+
+# --- Semantic de-duplication (see dedup.py) ---
+# Set DEDUP_ENABLED=0 to only merge experiences with the exact same
+# company and title (no embedding model is loaded then).
+DEDUP_ENABLED = os.getenv("DEDUP_ENABLED", "1") == "1"
+# Experiences or projects of different sources whose embeddings have at
+# least this cosine similarity are merged into one entry.
+DEDUP_SIMILARITY_THRESHOLD = float(os.getenv("DEDUP_SIMILARITY_THRESHOLD", "0.85"))
+
+# sentence-transformers model used for the embeddings.
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "64"))
+# SQLite file caching embeddings by model and text hash.
+EMBEDDING_CACHE_PATH = os.getenv("EMBEDDING_CACHE_PATH", os.path.join("instance", "embeddings.db"))
+
+# --- Profile search (see search.py) ---
+SEARCH_DEFAULT_LIMIT = int(os.getenv("SEARCH_DEFAULT_LIMIT", "20"))
+SEARCH_MAX_LIMIT = int(os.getenv("SEARCH_MAX_LIMIT", "100"))
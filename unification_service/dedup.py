@@ -0,0 +1,98 @@
+# unification_service/dedup.py
+from typing import Dict, List, Sequence
+
+import faiss
+import numpy
+
+from .config import DEDUP_SIMILARITY_THRESHOLD
+from .embeddings import Embedder
+
+
+def _experience_text(item: Dict) -> str:
+    # The description tells apart two roles at one company with close titles
+    # ("Developer" then "Senior Developer"); its start is enough for that.
+    return f"{item['job_title']} at {item['company_name']}: {(item.get('description') or '')[:300]}"
+
+
+def _project_text(item: Dict) -> str:
+    return f"{item['project_name']}: {(item.get('description') or '')[:300]}"
+
+
+def cluster(vectors: numpy.ndarray, sources: Sequence[str],
+            threshold: float = DEDUP_SIMILARITY_THRESHOLD) -> List[List[int]]:
+    """
+    Groups the rows of `vectors` (L2-normalized) whose cosine similarity is
+    at least `threshold`. Pairs are found with one FAISS range search and
+    linked from the most similar down; a cluster never holds two rows of
+    the same source, so a CV listing two similar projects keeps both.
+    Returns the clusters in order of their first row.
+    """
+    count = len(vectors)
+    parent = list(range(count))
+    members = [{source} for source in sources]
+    if count > 1:
+        index = faiss.IndexFlatIP(vectors.shape[1])
+        index.add(vectors)
+        limits, scores, neighbours = index.range_search(vectors, threshold)
+        pairs = []
+        for row in range(count):
+            for position in range(limits[row], limits[row + 1]):
+                other = int(neighbours[position])
+                if row < other and sources[row] != sources[other]:
+                    pairs.append((float(scores[position]), row, other))
+
+        def root(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for _, a, b in sorted(pairs, reverse=True):
+            a, b = root(a), root(b)
+            if a != b and not members[a] & members[b]:
+                a, b = min(a, b), max(a, b)
+                parent[b] = a
+                members[a] |= members[b]
+
+        parent = [root(i) for i in range(count)]
+
+    clusters: Dict[int, List[int]] = {}
+    for row in range(count):
+        clusters.setdefault(parent[row], []).append(row)
+    return list(clusters.values())
+
+
+def _merge(items: List[Dict]) -> Dict:
+    """
+    One entry for a cluster: the first item (most trusted source), with the
+    longest description of the cluster and, for projects, every source.
+    """
+    merged = dict(items[0])
+    merged["description"] = max((item.get("description") or "" for item in items), key=len) or None
+    if "source" in merged:
+        merged["source"] = ", ".join(dict.fromkeys(item["source"] for item in items))
+    return merged
+
+
+def _deduplicate(items: List[Dict], vectors: numpy.ndarray, sources: Sequence[str],
+                 threshold: float) -> List[Dict]:
+    return [_merge([items[row] for row in rows]) for rows in cluster(vectors, sources, threshold)]
+
+
+def deduplicate(experiences: List[Dict], experience_sources: Sequence[str],
+                projects: List[Dict], embedder: Embedder,
+                threshold: float = DEDUP_SIMILARITY_THRESHOLD) -> Dict[str, List[Dict]]:
+    """
+    Merges near-duplicate experiences and projects coming from different
+    sources (e.g. the GitHub repository "skillsense" and the CV project
+    "SkillSense platform"). Items are expected in source priority order.
+    Both lists are embedded in a single batch.
+    """
+    texts = [_experience_text(item) for item in experiences] + [_project_text(item) for item in projects]
+    vectors = embedder.encode(texts)
+    return {
+        "work_experience": _deduplicate(experiences, vectors[:len(experiences)], experience_sources, threshold),
+        "projects": _deduplicate(projects, vectors[len(experiences):],
+                                 [item["source"] for item in projects], threshold),
+    }
+
@@ -0,0 +1,126 @@
+# unification_service/embeddings.py
+import hashlib
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence
+
+import numpy
+
+from storage.sqlite import SQLiteDatabase
+
+from .config import EMBEDDING_BATCH_SIZE, EMBEDDING_CACHE_PATH, EMBEDDING_MODEL
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings stored in a SQLite file, keyed by model and SHA-256 of the
+    text, so re-unifying a profile only encodes the texts that changed.
+    """
+
+    def __init__(self, path: str = EMBEDDING_CACHE_PATH):
+        self.path = path
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model      TEXT NOT NULL,
+                text_hash  TEXT NOT NULL,
+                vector     BLOB NOT NULL,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (model, text_hash)
+            )
+            """,
+        ])
+
+    def get_many(self, model: str, hashes: Iterable[str]) -> Dict[str, numpy.ndarray]:
+        hashes = list(set(hashes))
+        found = {}
+        with self.db.connect() as conn:
+            # SQLite limits the number of parameters per statement.
+            for start in range(0, len(hashes), 500):
+                chunk = hashes[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings WHERE model = ? "
+                    f"AND text_hash IN ({','.join('?' * len(chunk))})",
+                    (model, *chunk),
+                ).fetchall()
+                found.update((key, numpy.frombuffer(vector, dtype=numpy.float32)) for key, vector in rows)
+        return found
+
+    def put_many(self, model: str, vectors: Dict[str, numpy.ndarray]) -> None:
+        now = time.time()
+        with self.db.connect() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_hash, vector, created_at) VALUES (?, ?, ?, ?)",
+                [(model, key, vector.astype(numpy.float32).tobytes(), now) for key, vector in vectors.items()],
+            )
+
+
+class Embedder:
+    """
+    Encodes texts with a sentence-transformers model into L2-normalized
+    float32 vectors (an inner product is then a cosine similarity). Every
+    call is one batched encode of the texts missing from the cache.
+    """
+
+    def __init__(self, model_name: str = EMBEDDING_MODEL, cache: Optional[EmbeddingCache] = None,
+                 batch_size: int = EMBEDDING_BATCH_SIZE):
+        # Imported here: torch takes seconds to import.
+        from sentence_transformers import SentenceTransformer
+
+        started = time.perf_counter()
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        self.dimension = self.model.get_sentence_embedding_dimension()
+        self.cache = cache or EmbeddingCache()
+        self.batch_size = batch_size
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        print(f"[Embedder] Loaded {model_name} ({self.dimension} dimensions) "
+              f"in {time.perf_counter() - started:.1f}s")
+
+    def encode(self, texts: Sequence[str]) -> numpy.ndarray:
+        """One row per text, in order."""
+        hashes = [text_hash(text) for text in texts]
+        vectors = self.cache.get_many(self.model_name, hashes)
+        missing = {key: text for key, text in zip(hashes, texts) if key not in vectors}
+        if missing:
+            encoded = self.model.encode(list(missing.values()), batch_size=self.batch_size,
+                                        normalize_embeddings=True, convert_to_numpy=True)
+            computed = dict(zip(missing, encoded.astype(numpy.float32)))
+            self.cache.put_many(self.model_name, computed)
+            vectors.update(computed)
+        with self._lock:
+            self._hits += len(texts) - len(missing)
+            self._misses += len(missing)
+        if not texts:
+            return numpy.zeros((0, self.dimension), dtype=numpy.float32)
+        return numpy.vstack([vectors[key] for key in hashes])
+
+    def stats(self) -> Dict[str, int]:
+        """Texts served from the cache and encoded, for this process."""
+        with self._lock:
+            return {"hits": self._hits, "misses": self._misses}
+
+
+_embedder: Optional[Embedder] = None
+_embedder_lock = threading.Lock()
+
+
+def get_embedder() -> Embedder:
+    """The process-wide Embedder, loaded on first use."""
+    global _embedder
+    if _embedder is None:
+        with _embedder_lock:
+            if _embedder is None:
+                _embedder = Embedder()
+    return _embedder
+
+
+def embedder_stats() -> Optional[Dict[str, int]]:
+    """Cache statistics of the shared Embedder, or None when it is not loaded yet."""
+    return _embedder.stats() if _embedder is not None else None
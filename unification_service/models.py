@@ -20,7 +20,7 @@ class UnifiedWorkExperience(BaseModel):
 class UnifiedProject(BaseModel):
     project_name: str
     description: Optional[str] = None
-    source: str  # e.g., "CV", "GitHub", "LinkedIn"
+    source: str  # e.g., "CV", "GitHub", "LinkedIn"; "CV, GitHub" once merged
 
 
 class UnifiedProfile(BaseModel):
@@ -0,0 +1,261 @@
+# unification_service/search.py
+import heapq
+import threading
+import time
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import faiss
+import numpy
+
+from .config import SEARCH_DEFAULT_LIMIT
+from .embeddings import Embedder, get_embedder
+from .models import UnifiedProfile
+from .skill_index import get_skill_index, normalize
+from .store import ProfileStore, get_profile_store
+
+# Profiles are re-read from a little before the newest one indexed: another
+# process may commit a profile stamped slightly earlier than one already seen.
+REFRESH_OVERLAP_SECONDS = 5.0
+# Profiles embedded per batch while indexing.
+INDEX_BATCH = 256
+# Vectors first fetched per requested result (a profile has several); doubled
+# by _rank until enough distinct profiles are found.
+VECTORS_PER_RESULT = 8
+
+
+class SearchHit(NamedTuple):
+    profile_id: str
+    full_name: Optional[str]
+    location: Optional[str]
+    # Best cosine similarity to the query text (None without one).
+    score: Optional[float]
+    matched_skills: List[str]
+
+
+class _Entry(NamedTuple):
+    full_name: Optional[str]
+    location: Optional[str]
+    skills: List[str]
+    # normalize() of each skill, the keys of the skill postings.
+    skill_keys: List[str]
+    locations: Set[str]
+    vector_ids: List[int]
+    updated_at: float
+
+
+def location_terms(location: Optional[str]) -> Set[str]:
+    """Accent-free lowercase words of a location: "Casablanca, Maroc" -> {"casablanca", "maroc"}."""
+    text = unicodedata.normalize("NFKD", location or "")
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return set(normalize(text).replace(".", " ").split())
+
+
+def _texts(profile: UnifiedProfile) -> List[str]:
+    """What is embedded for a profile: its summary and each experience."""
+    texts = [profile.summary] if profile.summary else []
+    for exp in profile.work_experience:
+        texts.append(f"{exp.job_title} at {exp.company_name}: {(exp.description or '')[:300]}")
+    return texts
+
+
+class ProfileSearchIndex:
+    """
+    In-memory search over the profiles of the ProfileStore: inverted
+    indexes from canonical skill and from location word to profile ids for
+    the boolean filters, and a FAISS inner-product index over the
+    embeddings of each profile's summary and experiences for semantic
+    ranking.
+
+    The index follows the store incrementally: `refresh` re-indexes only
+    the profiles unified or enhanced since the previous call. It runs
+    before every search and after every merge of this process, so profiles
+    written by other processes are found too.
+    """
+
+    def __init__(self, store: Optional[ProfileStore] = None, embedder: Optional[Embedder] = None):
+        started = time.perf_counter()
+        self.store = store or get_profile_store()
+        self.embedder = embedder or get_embedder()
+        # Guards the structures below; held only briefly (no embedding).
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._skills: Dict[str, Set[str]] = {}
+        self._locations: Dict[str, Set[str]] = {}
+        self._owners: Dict[int, str] = {}
+        self._vectors = faiss.IndexIDMap2(faiss.IndexFlatIP(self.embedder.dimension))
+        self._next_vector_id = 0
+        self._watermark = 0.0
+        count = self.refresh()
+        print(f"[SearchIndex] Indexed {count} profiles in {time.perf_counter() - started:.1f}s")
+
+    def refresh(self) -> int:
+        """Indexes the profiles changed since the last refresh; returns how many."""
+        with self._refresh_lock:
+            since = self._watermark - REFRESH_OVERLAP_SECONDS if self._watermark else 0.0
+            changed = [profile_id for profile_id, updated_at in self.store.updated_since(since)
+                       if profile_id not in self._entries or self._entries[profile_id].updated_at < updated_at]
+            for start in range(0, len(changed), INDEX_BATCH):
+                self._index(list(self.store.get_latest(changed[start:start + INDEX_BATCH]).values()))
+            return len(changed)
+
+    def _index(self, batch: List[Tuple[UnifiedProfile, float]]) -> int:
+        texts, owners = [], []
+        for profile, _ in batch:
+            for text in _texts(profile):
+                texts.append(text)
+                owners.append(profile.profile_id)
+        vectors = self.embedder.encode(texts)
+
+        with self._lock:
+            stale = [vector_id for profile, _ in batch for vector_id in self._remove(profile.profile_id)]
+            if stale:
+                self._vectors.remove_ids(numpy.array(stale, dtype=numpy.int64))
+            ids = numpy.arange(self._next_vector_id, self._next_vector_id + len(texts), dtype=numpy.int64)
+            self._next_vector_id += len(texts)
+            if len(texts):
+                self._vectors.add_with_ids(vectors, ids)
+
+            vector_ids: Dict[str, List[int]] = {}
+            for vector_id, owner in zip(ids.tolist(), owners):
+                self._owners[vector_id] = owner
+                vector_ids.setdefault(owner, []).append(vector_id)
+            for profile, updated_at in batch:
+                entry = _Entry(profile.full_name, profile.location, profile.skills,
+                               [normalize(skill) for skill in profile.skills], location_terms(profile.location),
+                               vector_ids.get(profile.profile_id, []), updated_at)
+                self._entries[profile.profile_id] = entry
+                for key in entry.skill_keys:
+                    self._skills.setdefault(key, set()).add(profile.profile_id)
+                for term in entry.locations:
+                    self._locations.setdefault(term, set()).add(profile.profile_id)
+                self._watermark = max(self._watermark, updated_at)
+        return len(batch)
+
+    def _remove(self, profile_id: str) -> List[int]:
+        """Drops a profile from the inverted indexes; returns its vector ids."""
+        entry = self._entries.pop(profile_id, None)
+        if entry is None:
+            return []
+        for postings, keys in ((self._skills, entry.skill_keys), (self._locations, entry.locations)):
+            for key in keys:
+                ids = postings.get(key)
+                if ids is not None:
+                    ids.discard(profile_id)
+                    if not ids:
+                        del postings[key]
+        for vector_id in entry.vector_ids:
+            self._owners.pop(vector_id, None)
+        return entry.vector_ids
+
+    @staticmethod
+    def _skill_keys(names: Iterable[str]) -> Set[str]:
+        """Query skills in the canonical form of the indexed profiles ("golang" -> "go")."""
+        names = [name for name in names if name.strip()]
+        matches = get_skill_index().canonicalize(names)
+        return {normalize(match.name if match else name) for name, match in zip(names, matches)}
+
+    def search(self, skills: Iterable[str] = (), any_skills: Iterable[str] = (), location: Optional[str] = None,
+               query: Optional[str] = None, limit: int = SEARCH_DEFAULT_LIMIT) -> Tuple[List[SearchHit], int]:
+        """
+        Profiles having every skill of `skills`, at least one of
+        `any_skills` and every word of `location`. With a `query` they are
+        ranked by semantic similarity to it; otherwise by the number of
+        `any_skills` they have, then most recently updated first.
+        Returns at most `limit` hits and the number of matching profiles
+        (of profiles with embedded text, when ranking by `query`).
+        """
+        self.refresh()
+        required, optional = self._skill_keys(skills), self._skill_keys(any_skills)
+        terms = location_terms(location)
+        query_vector = self.embedder.encode([query]) if query else None
+
+        with self._lock:
+            postings = [self._skills.get(key, set()) for key in required]
+            postings += [self._locations.get(term, set()) for term in terms]
+            if optional:
+                postings.append(set().union(*(self._skills.get(key, set()) for key in optional)))
+            candidates = None
+            # Smallest posting list first: the intersection only shrinks.
+            for ids in sorted(postings, key=len):
+                candidates = set(ids) if candidates is None else candidates & ids
+                if not candidates:
+                    break
+
+            if query_vector is not None:
+                ranked, total = self._rank(query_vector, candidates, limit)
+            else:
+                candidates = candidates if candidates is not None else set(self._entries)
+                matched = {pid: len(optional.intersection(self._entries[pid].skill_keys))
+                           for pid in candidates}
+                ranked = [(pid, None) for pid in heapq.nlargest(
+                    limit, candidates, key=lambda pid: (matched[pid], self._entries[pid].updated_at))]
+                total = len(candidates)
+
+            wanted = required | optional
+            hits = []
+            for profile_id, score in ranked:
+                entry = self._entries[profile_id]
+                hits.append(SearchHit(profile_id, entry.full_name, entry.location,
+                                      None if score is None else round(score, 4),
+                                      [skill for skill, key in zip(entry.skills, entry.skill_keys)
+                                       if key in wanted]))
+        return hits, total
+
+    def _rank(self, query_vector: numpy.ndarray, candidates: Optional[Set[str]],
+              limit: int) -> Tuple[List[Tuple[str, float]], int]:
+        """
+        Best profiles by their most similar vector, restricted to `candidates`
+        if given. The search asks for `limit * VECTORS_PER_RESULT` vectors and
+        doubles that until `limit` distinct profiles are found or every
+        vector has been scanned, as one profile may own many vectors.
+        """
+        params = None
+        if candidates is None:
+            available, total = self._vectors.ntotal, sum(1 for e in self._entries.values() if e.vector_ids)
+        else:
+            ids = [vector_id for pid in candidates for vector_id in self._entries[pid].vector_ids]
+            available, total = len(ids), sum(1 for pid in candidates if self._entries[pid].vector_ids)
+            if ids:
+                params = faiss.SearchParameters(sel=faiss.IDSelectorBatch(numpy.array(ids, dtype=numpy.int64)))
+        if not available:
+            return [], 0
+
+        k = min(available, limit * VECTORS_PER_RESULT)
+        while True:
+            scores, ids = self._vectors.search(query_vector, k, params=params)
+            best: Dict[str, float] = {}
+            # Results come best first, so a profile's first vector is its best one.
+            for score, vector_id in zip(scores[0].tolist(), ids[0].tolist()):
+                if vector_id >= 0 and self._owners[vector_id] not in best:
+                    best[self._owners[vector_id]] = score
+                    if len(best) == limit:
+                        break
+            if len(best) >= limit or k >= available:
+                return list(best.items()), total
+            k = min(available, k * 2)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"profiles": len(self._entries), "vectors": self._vectors.ntotal,
+                    "skills": len(self._skills), "locations": len(self._locations)}
+
+
+_index: Optional[ProfileSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_search_index() -> ProfileSearchIndex:
+    """The process-wide ProfileSearchIndex, built from the store on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ProfileSearchIndex()
+    return _index
+
+
+def loaded_search_index() -> Optional[ProfileSearchIndex]:
+    """The shared index if something already built it, else None."""
+    return _index
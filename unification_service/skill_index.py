@@ -0,0 +1,129 @@
+# unification_service/skill_index.py
+import re
+import threading
+import time
+import unicodedata
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+import numpy
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+from .config import SKILL_MATCH_BATCH, SKILL_MATCH_THRESHOLD
+
+# Trailing qualifier of SKILL_DB names: "Python (Programming Language)".
+_QUALIFIER = re.compile(r"\s*\([^)]*\)\s*$")
+# Trailing version of a word of 3+ letters: "python3", "angular 12", "vue.js v3".
+_VERSION = re.compile(r"^(.*[a-z+#]{3,})\s*v?\d+(?:\.\d+)*$")
+
+
+class SkillMatch(NamedTuple):
+    skill_id: str
+    name: str
+    # 1.0 for an alias match, the trigram cosine similarity otherwise.
+    score: float
+
+
+def normalize(name: str) -> str:
+    """Lowercase, punctuation other than "+#." turned into spaces, spaces collapsed."""
+    text = unicodedata.normalize("NFKC", name).lower()
+    text = re.sub(r"[^\w+#.]+", " ", text)
+    return re.sub(r"\s+", " ", text).strip().rstrip(".")
+
+
+def _variants(name: str) -> List[str]:
+    """The forms of a raw skill looked up in the alias table, in order."""
+    text = normalize(_QUALIFIER.sub("", name)) or normalize(name)
+    variants = [normalize(name), text]
+    version = _VERSION.match(text)
+    if version:
+        variants.append(version.group(1).strip())
+    return variants
+
+
+class SkillIndex:
+    """
+    Maps raw skill strings ("Python3", "python", "Python (Programming
+    Language)", ...) to SKILL_DB skills.
+
+    A raw skill first goes through an alias table holding every SKILL_DB
+    name and surface form. The remaining ones are matched as a batch: their
+    character trigram TF-IDF vectors are multiplied with the alias matrix
+    in one sparse product and the best alias above SKILL_MATCH_THRESHOLD
+    wins.
+    """
+
+    def __init__(self, skill_db: Dict[str, Dict], threshold: float = SKILL_MATCH_THRESHOLD,
+                 batch_size: int = SKILL_MATCH_BATCH):
+        started = time.perf_counter()
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.names = {skill_id: _QUALIFIER.sub("", entry["skill_name"]) or entry["skill_name"]
+                      for skill_id, entry in skill_db.items()}
+
+        # Alias -> skill id. Names win over full surface forms, which win
+        # over low surface forms and abbreviations when two skills share one.
+        self.aliases: Dict[str, str] = {}
+        for forms in (
+            lambda e: [e["skill_name"], _QUALIFIER.sub("", e["skill_name"])],
+            lambda e: [e.get("high_surfce_forms", {}).get("full", "")],
+            lambda e: e.get("low_surface_forms", []),
+            lambda e: [e.get("high_surfce_forms", {}).get("abv", "")],
+        ):
+            for skill_id, entry in skill_db.items():
+                for form in forms(entry):
+                    alias = normalize(form)
+                    if alias:
+                        self.aliases.setdefault(alias, skill_id)
+
+        # Abbreviations are too short to be matched approximately.
+        abbreviations = {normalize(e.get("high_surfce_forms", {}).get("abv", "")) for e in skill_db.values()}
+        fuzzy = [alias for alias in self.aliases if alias not in abbreviations and len(alias) >= 3]
+        self._fuzzy_ids = numpy.array([self.aliases[alias] for alias in fuzzy], dtype=object)
+        self._vectorizer = TfidfVectorizer(analyzer="char_wb", ngram_range=(3, 3), dtype=numpy.float32)
+        # Rows are L2-normalized, so a product of rows is a cosine similarity.
+        self._matrix = self._vectorizer.fit_transform(fuzzy).T.tocsr()
+        print(f"[SkillIndex] {len(self.names)} skills, {len(self.aliases)} aliases "
+              f"({len(fuzzy)} matched approximately) in {time.perf_counter() - started:.1f}s")
+
+    def canonicalize(self, raw_skills: Sequence[str]) -> List[Optional[SkillMatch]]:
+        """
+        The SKILL_DB skill of each raw skill, in order, or None when none
+        is close enough.
+        """
+        matches: List[Optional[SkillMatch]] = [None] * len(raw_skills)
+        pending = []
+        for position, raw in enumerate(raw_skills):
+            skill_id = next((self.aliases[v] for v in _variants(raw) if v in self.aliases), None)
+            if skill_id is not None:
+                matches[position] = SkillMatch(skill_id, self.names[skill_id], 1.0)
+            elif len(normalize(raw)) >= 3:
+                pending.append(position)
+
+        for start in range(0, len(pending), self.batch_size):
+            positions = pending[start:start + self.batch_size]
+            queries = self._vectorizer.transform([_variants(raw_skills[p])[1] for p in positions])
+            similarities = queries @ self._matrix
+            best = numpy.asarray(similarities.argmax(axis=1)).ravel()
+            scores = similarities[numpy.arange(len(positions)), best].A1
+            for position, alias, score in zip(positions, best, scores):
+                if score >= self.threshold:
+                    skill_id = self._fuzzy_ids[alias]
+                    matches[position] = SkillMatch(skill_id, self.names[skill_id], round(float(score), 3))
+        return matches
+
+
+_index: Optional[SkillIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_skill_index() -> SkillIndex:
+    """The process-wide SkillIndex, built from SKILL_DB on first use."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                # Imported here: the cv_extractor package pulls in the
+                # extraction pipeline.
+                from cv_extractor.extractors.skill_db import load_skill_db
+                _index = SkillIndex(load_skill_db())
+    return _index
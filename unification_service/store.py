@@ -0,0 +1,157 @@
+# unification_service/store.py
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from storage.sqlite import SQLiteDatabase
+
+from .config import PROFILE_DB_PATH
+from .models import UnifiedProfile
+
+
+class ProfileStore:
+    """
+    SQLite-backed persistence for unified profiles.
+
+    For each profile it keeps the contribution of every source (skills,
+    experiences, projects, ... already mapped to the unified shape) with a
+    version hash, the unified profile assembled from them, and the last
+    enhanced profile.
+    """
+
+    def __init__(self, path: str = PROFILE_DB_PATH):
+        self.path = path
+        self.db = SQLiteDatabase(self.path, [
+            """
+            CREATE TABLE IF NOT EXISTS profile_sources (
+                profile_id   TEXT NOT NULL,
+                source       TEXT NOT NULL,
+                version      TEXT NOT NULL,
+                revision     INTEGER NOT NULL,
+                contribution TEXT NOT NULL,
+                updated_at   REAL NOT NULL,
+                PRIMARY KEY (profile_id, source)
+            )
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                profile_id TEXT PRIMARY KEY,
+                unified    TEXT NOT NULL,
+                enhanced   TEXT,
+                updated_at REAL NOT NULL
+            )
+            """,
+            "CREATE INDEX IF NOT EXISTS profiles_updated_at ON profiles (updated_at)",
+        ])
+
+    def transaction(self):
+        """
+        A connection inside a write transaction (a context manager), so a
+        read-merge-write of one profile cannot interleave with another
+        process doing the same.
+        """
+        return self.db.transaction()
+
+    def snapshot(self, profile_id: str) -> Tuple[Dict[str, Tuple[str, int, Dict[str, Any]]], Optional[UnifiedProfile]]:
+        """
+        The sources (see load_sources) and unified profile of `profile_id`,
+        read consistently without taking the write lock.
+        """
+        with self.db.connect() as conn:
+            conn.execute("BEGIN")
+            try:
+                return self.load_sources(conn, profile_id), self.load_unified(conn, profile_id)
+            finally:
+                conn.execute("COMMIT")
+
+    def source_versions(self, conn: sqlite3.Connection, profile_id: str) -> Dict[str, Tuple[str, int]]:
+        """Maps each source of a profile to (version, revision)."""
+        rows = conn.execute(
+            "SELECT source, version, revision FROM profile_sources WHERE profile_id = ?", (profile_id,)
+        ).fetchall()
+        return {source: (version, revision) for source, version, revision in rows}
+
+    def load_sources(self, conn: sqlite3.Connection, profile_id: str) -> Dict[str, Tuple[str, int, Dict[str, Any]]]:
+        """Maps each source of a profile to (version, revision, contribution)."""
+        rows = conn.execute(
+            "SELECT source, version, revision, contribution FROM profile_sources WHERE profile_id = ?",
+            (profile_id,),
+        ).fetchall()
+        return {source: (version, revision, json.loads(data)) for source, version, revision, data in rows}
+
+    def save_source(self, conn: sqlite3.Connection, profile_id: str, source: str,
+                    version: str, revision: int, contribution: Dict[str, Any]) -> None:
+        conn.execute(
+            "INSERT OR REPLACE INTO profile_sources "
+            "(profile_id, source, version, revision, contribution, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+            (profile_id, source, version, revision, json.dumps(contribution), time.time()),
+        )
+
+    def load_unified(self, conn: sqlite3.Connection, profile_id: str) -> Optional[UnifiedProfile]:
+        row = conn.execute("SELECT unified FROM profiles WHERE profile_id = ?", (profile_id,)).fetchone()
+        return UnifiedProfile.model_validate_json(row[0]) if row else None
+
+    def save_unified(self, conn: sqlite3.Connection, profile: UnifiedProfile, changed: bool) -> None:
+        """Stores the unified profile; a changed profile drops its stale enhancement."""
+        conn.execute(
+            "INSERT INTO profiles (profile_id, unified, updated_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(profile_id) DO UPDATE SET unified = excluded.unified, "
+            "updated_at = excluded.updated_at, enhanced = CASE WHEN ? THEN NULL ELSE enhanced END",
+            (profile.profile_id, profile.model_dump_json(), time.time(), int(changed)),
+        )
+
+    def get_unified(self, profile_id: str) -> Optional[UnifiedProfile]:
+        with self.db.connect() as conn:
+            return self.load_unified(conn, profile_id)
+
+    def get_enhanced(self, profile_id: str) -> Optional[UnifiedProfile]:
+        with self.db.connect() as conn:
+            row = conn.execute("SELECT enhanced FROM profiles WHERE profile_id = ?", (profile_id,)).fetchone()
+        return UnifiedProfile.model_validate_json(row[0]) if row and row[0] else None
+
+    def save_enhanced(self, profile: UnifiedProfile) -> None:
+        with self.db.connect() as conn:
+            conn.execute(
+                "UPDATE profiles SET enhanced = ?, updated_at = ? WHERE profile_id = ?",
+                (profile.model_dump_json(), time.time(), profile.profile_id),
+            )
+
+    def updated_since(self, since: float) -> List[Tuple[str, float]]:
+        """(profile_id, updated_at) of the profiles unified or enhanced after `since`, oldest first."""
+        with self.db.connect() as conn:
+            return conn.execute(
+                "SELECT profile_id, updated_at FROM profiles WHERE updated_at > ? ORDER BY updated_at",
+                (since,),
+            ).fetchall()
+
+    def get_latest(self, profile_ids: List[str]) -> Dict[str, Tuple[UnifiedProfile, float]]:
+        """Maps each found profile id to (profile, updated_at); the enhanced version when there is one."""
+        found = {}
+        with self.db.connect() as conn:
+            # SQLite limits the number of parameters per statement.
+            for start in range(0, len(profile_ids), 500):
+                chunk = profile_ids[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT profile_id, COALESCE(enhanced, unified), updated_at FROM profiles "
+                    f"WHERE profile_id IN ({','.join('?' * len(chunk))})",
+                    chunk,
+                ).fetchall()
+                found.update((pid, (UnifiedProfile.model_validate_json(data), updated_at))
+                             for pid, data, updated_at in rows)
+        return found
+
+
+_store: Optional[ProfileStore] = None
+_store_lock = threading.Lock()
+
+
+def get_profile_store() -> ProfileStore:
+    """The process-wide ProfileStore, created on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ProfileStore()
+    return _store
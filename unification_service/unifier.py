@@ -1,9 +1,47 @@
 # unification_service/unifier.py
+import hashlib
+import json
+from .config import DEDUP_ENABLED, MERGE_MAX_ATTEMPTS, SKILL_CANONICALIZE
+from .dedup import deduplicate
+from .embeddings import get_embedder
 from .models import UnifiedProfile, UnifiedWorkExperience, UnifiedProject, UnifiedContactInfo
+from .search import loaded_search_index
+from .skill_index import get_skill_index, normalize
+from .store import ProfileStore, get_profile_store
+from observability.tracing import span
 from cv_extractor.models.cv_models import ExtractedCV
 from linkedin_extractor.models import LinkedInProfile
-from github_extractor.models import GitHubProfile
-from typing import Union, List
+from github_extractor.models import GitHubProfile, GitHubRepository
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Union, List
+
+Source = Union[ExtractedCV, LinkedInProfile, GitHubProfile]
+
+# Order in which sources are trusted for single-value fields (first non-empty
+# value wins) and in which their lists are merged.
+SOURCE_PRIORITY = ("linkedin", "cv", "github")
+
+
+class MergeResult(NamedTuple):
+    profile: UnifiedProfile
+    # False when the merge left the profile's content unchanged (e.g. a
+    # source re-submitted with identical data).
+    changed: bool
+    versions: Dict[str, Dict[str, Any]]
+
+
+def _source_key(source: Source) -> Optional[str]:
+    if isinstance(source, LinkedInProfile):
+        return "linkedin"
+    if isinstance(source, ExtractedCV):
+        return "cv"
+    if isinstance(source, GitHubProfile):
+        return "github"
+    return None
+
+
+def _version(contribution: Dict[str, Any]) -> str:
+    payload = json.dumps(contribution, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
 
 
 class ProfileUnifier:
@@ -11,75 +49,217 @@ class ProfileUnifier:
     A service to merge data from various sources into a single, unified profile.
     """
 
-    def unify(self, profile_id: str,
-              *sources: List[Union[ExtractedCV, LinkedInProfile, GitHubProfile]]) -> UnifiedProfile:
+    def __init__(self, store: Optional[ProfileStore] = None, canonicalize_skills: bool = SKILL_CANONICALIZE,
+                 dedup: bool = DEDUP_ENABLED):
+        self._store = store
+        self.canonicalize_skills = canonicalize_skills
+        self.dedup = dedup
+
+    @property
+    def store(self) -> ProfileStore:
+        if self._store is None:
+            self._store = get_profile_store()
+        return self._store
+
+    def _contribution(self, source: Source,
+                      github_repos: Optional[Iterable[GitHubRepository]] = None) -> Dict[str, Any]:
         """
-        Takes multiple data source objects and merges them into a UnifiedProfile.
+        Maps one source to its share of the unified profile: single-value
+        fields, contact info, skills, experiences, projects and raw data.
+        """
+        fields = {"full_name": None, "summary": None, "location": None}
+        contact = {}
+        # Skills are kept as written; they are canonicalized when the
+        # profile is assembled (see _canonical_skills).
+        skills, work_experience, projects = {}, [], []
+
+        if isinstance(source, LinkedInProfile):
+            raw = source.model_dump()
+            fields.update(full_name=source.fullName, summary=source.summary, location=source.location)
+            contact['linkedin_url'] = source.profileUrl
+            for skill in source.skills:
+                if skill.name: skills.setdefault(skill.name.strip().lower(), skill.name.strip())
+            for pos in source.positions:
+                work_experience.append(
+                    {"company_name": pos.companyName, "job_title": pos.title, "description": pos.description})
+            for proj in source.projects:
+                projects.append(
+                    {"project_name": proj.title, "description": proj.description, "source": "LinkedIn"})
+
+        elif isinstance(source, ExtractedCV):
+            raw = source.model_dump()
+            fields['summary'] = getattr(source, 'summary', None)
+            for skill in source.skills:
+                skills.setdefault(skill.name.strip().lower(), skill.name.strip())
+            for exp in source.work_experience:
+                work_experience.append(
+                    {"company_name": exp.company, "job_title": exp.job_title, "description": exp.description})
+            for proj in source.projects:
+                projects.append(
+                    {"project_name": proj.project_name, "description": proj.description, "source": "CV"})
+
+        else:
+            raw = source.model_dump(exclude={'repos'} if github_repos is not None else None)
+            fields.update(full_name=source.name, summary=source.bio, location=source.location)
+            contact.update(github_url=f"https://github.com/{source.username}",
+                           website=source.website, email=source.email)
+            # `github_repos` may be a lazy iterator (see GitHubApiClient.get_profile_stream);
+            # pages are fetched as it is consumed, and a failed page raises here.
+            for repo in (github_repos if github_repos is not None else source.repos):
+                projects.append(
+                    {"project_name": repo.repo_name, "description": repo.repo_description, "source": "GitHub"})
+
+        return {
+            "fields": fields,
+            "contact": contact,
+            "skills": sorted(skills.values(), key=str.lower),
+            "work_experience": work_experience,
+            "projects": projects,
+            "raw": raw,
+        }
+
+    def _canonical_skills(self, skills: List[str]) -> List[str]:
         """
-        all_skills = set()
+        The skills mapped to their SKILL_DB names in one batch, one entry per
+        skill ("python", "Python3" and "Python (Programming Language)" all
+        become "Python"). Skills unknown to SKILL_DB (all of them when
+        `canonicalize_skills` is off) are kept as written, de-duplicated
+        regardless of case and punctuation.
+        """
+        with span("canonicalize_skills", skills=len(skills)) as attributes:
+            canonical = {}
+            matches = (get_skill_index().canonicalize(skills) if self.canonicalize_skills
+                       else [None] * len(skills))
+            for raw, match in zip(skills, matches):
+                if match is not None:
+                    canonical.setdefault(match.skill_id, match.name)
+                else:
+                    canonical.setdefault(normalize(raw), raw)
+            attributes["matched"] = sum(match is not None for match in matches)
+        return sorted(set(canonical.values()), key=str.lower)
+
+    def _assemble(self, profile_id: str, contributions: Dict[str, Dict[str, Any]]) -> UnifiedProfile:
+        """Builds the UnifiedProfile from per-source contributions."""
+        ordered = [(key, contributions[key]) for key in SOURCE_PRIORITY if key in contributions]
+
+        fields = {"full_name": None, "summary": None, "location": None}
+        contact_info = {"email": None, "linkedin_url": None, "github_url": None, "website": None}
+        all_skills = []
         all_work_experience = []
         all_projects = []
-        source_data = {}
 
-        # --- Prioritized fields ---
-        # We prioritize sources for single-value fields (e.g., name from LinkedIn > CV)
-        full_name, summary, location = None, None, None
-        contact_info = {"email": None, "linkedin_url": None, "github_url": None, "website": None}
+        for key, contribution in ordered:
+            for name, value in contribution["fields"].items():
+                fields[name] = fields[name] or value
+            for name, value in contribution["contact"].items():
+                contact_info[name] = contact_info[name] or value
+            all_skills.extend(contribution["skills"])
+            all_work_experience.extend((exp, key) for exp in contribution["work_experience"])
+            all_projects.extend(contribution["projects"])
 
-        for source in sources:
-            if isinstance(source, LinkedInProfile):
-                source_data['linkedin'] = source.model_dump()
-                full_name = source.fullName or full_name
-                summary = source.summary or summary
-                location = source.location or location
-                contact_info['linkedin_url'] = source.profileUrl
-
-                for skill in source.skills:
-                    if skill.name: all_skills.add(skill.name.lower())
-                for pos in source.positions:
-                    all_work_experience.append(
-                        {"company_name": pos.companyName, "job_title": pos.title, "description": pos.description})
-                for proj in source.projects:
-                    all_projects.append(
-                        {"project_name": proj.title, "description": proj.description, "source": "LinkedIn"})
-
-            elif isinstance(source, ExtractedCV):
-                source_data['cv'] = source.model_dump()
-                summary = summary or source.summary  # Use CV summary if LinkedIn's is missing
-                for skill in source.skills:
-                    all_skills.add(skill.name.lower())
-                for exp in source.work_experience:
-                    all_work_experience.append(
-                        {"company_name": exp.company, "job_title": exp.job_title, "description": exp.description})
-                for proj in source.projects:
-                    all_projects.append(
-                        {"project_name": proj.project_name, "description": proj.description, "source": "CV"})
-
-            elif isinstance(source, GitHubProfile):
-                source_data['github'] = source.model_dump()
-                full_name = full_name or source.name
-                summary = summary or source.bio
-                location = location or source.location
-                contact_info['github_url'] = f"https://github.com/{source.username}"
-                contact_info['website'] = source.website
-                contact_info['email'] = source.email
-                for repo in source.repos:
-                    all_projects.append(
-                        {"project_name": repo.repo_name, "description": repo.repo_description, "source": "GitHub"})
-
-        # --- De-duplication Logic (Simple version for PoC) ---
-        unique_work_experience = {(exp['company_name'], exp['job_title']): exp for exp in all_work_experience}.values()
+        # --- De-duplication Logic ---
+        # Same company and title first, then near-duplicates across sources.
+        unique_work_experience = list(
+            {(exp['company_name'], exp['job_title']): (exp, key) for exp, key in all_work_experience}.values())
+        work_experience = [exp for exp, _ in unique_work_experience]
+        if self.dedup and (len(work_experience) > 1 or len(all_projects) > 1):
+            with span("dedup", work_experience=len(work_experience), projects=len(all_projects)) as attributes:
+                deduplicated = deduplicate(work_experience, [key for _, key in unique_work_experience],
+                                           all_projects, get_embedder())
+                work_experience, all_projects = deduplicated["work_experience"], deduplicated["projects"]
+                attributes.update(kept_work_experience=len(work_experience), kept_projects=len(all_projects))
 
         # --- Assemble the UnifiedProfile ---
-        unified_profile = UnifiedProfile(
+        return UnifiedProfile(
             profile_id=profile_id,
-            full_name=full_name,
-            summary=summary,
-            location=location,
             contact_info=UnifiedContactInfo(**contact_info),
-            skills=sorted(list(all_skills)),
-            work_experience=[UnifiedWorkExperience(**exp) for exp in unique_work_experience],
+            skills=self._canonical_skills(all_skills),
+            work_experience=[UnifiedWorkExperience(**exp) for exp in work_experience],
             projects=[UnifiedProject(**proj) for proj in all_projects],
-            source_data=source_data
+            source_data={key: contribution["raw"] for key, contribution in ordered},
+            **fields,
         )
-        return unified_profile
\ No newline at end of file
+
+    def unify(self, profile_id: str,
+              *sources: List[Source],
+              github_repos: Optional[Iterable[GitHubRepository]] = None) -> UnifiedProfile:
+        """
+        Takes multiple data source objects and merges them into a UnifiedProfile.
+
+        `github_repos` may be a lazy iterator of repositories (see
+        GitHubApiClient.get_profile_stream), used instead of the
+        GitHubProfile's own list.
+        """
+        with span("unify"):
+            contributions = {}
+            for source in sources:
+                key = _source_key(source)
+                if key:
+                    contributions[key] = self._contribution(source, github_repos)
+            return self._assemble(profile_id, contributions)
+
+    def merge(self, profile_id: str, *sources: List[Source],
+              github_repos: Optional[Iterable[GitHubRepository]] = None) -> MergeResult:
+        """
+        Merges new or updated sources into the stored profile `profile_id`
+        (created if it does not exist yet).
+
+        Only the contributions of the given sources are recomputed; the other
+        sources' contributions are read back from the store, so nothing is
+        re-extracted. A source whose contribution hash matches the stored
+        version is skipped, and `changed` is False when the resulting
+        profile content is identical to the stored one.
+
+        The profile is assembled (embeddings, skill index...) without
+        holding the database write lock. It is saved only if the stored
+        sources are still the ones it was assembled from; otherwise the
+        merge starts over from the new state.
+        """
+        with span("unify", profile_id=profile_id) as attributes:
+            incoming = {}
+            for source in sources:
+                key = _source_key(source)
+                if key:
+                    incoming[key] = self._contribution(source, github_repos)
+            incoming_versions = {key: _version(contribution) for key, contribution in incoming.items()}
+
+            for attempt in range(1, MERGE_MAX_ATTEMPTS + 1):
+                stored, previous = self.store.snapshot(profile_id)
+                seen = {key: entry[:2] for key, entry in stored.items()}
+
+                updates = {}
+                for key, contribution in incoming.items():
+                    stored_version, revision, _ = stored.get(key, (None, 0, None))
+                    if incoming_versions[key] != stored_version:
+                        updates[key] = (incoming_versions[key], revision + 1, contribution)
+                stored.update(updates)
+
+                if not updates and previous is not None:
+                    profile, changed = previous, False
+                    break
+
+                profile = self._assemble(profile_id, {key: entry[2] for key, entry in stored.items()})
+                changed = previous is None or (
+                    profile.model_dump(exclude={'source_data'}) != previous.model_dump(exclude={'source_data'})
+                )
+                with self.store.transaction() as conn:
+                    if self.store.source_versions(conn, profile_id) == seen:
+                        for key, (version, revision, contribution) in updates.items():
+                            self.store.save_source(conn, profile_id, key, version, revision, contribution)
+                        self.store.save_unified(conn, profile, changed)
+                        break
+                print(f"[Unifier] {profile_id} was merged concurrently, retrying "
+                      f"({attempt}/{MERGE_MAX_ATTEMPTS})")
+            else:
+                raise RuntimeError(f"Profile {profile_id} kept changing during the merge, giving up")
+            attributes.update(changed=changed, attempts=attempt)
+
+        # Keep this process's search index current (others catch up on
+        # their next search).
+        index = loaded_search_index()
+        if changed and index is not None:
+            index.refresh()
+
+        versions = {key: {"version": entry[0], "revision": entry[1]} for key, entry in stored.items()}
+        print(f"[Unifier] Merged {sorted(incoming)} into {profile_id} (changed={changed})")
+        return MergeResult(profile, changed, versions)